@@ -0,0 +1,112 @@
+"""
+Compares fixed and adaptive upload concurrency against a local fake backend with a shaped uplink.
+
+Scenarios:
+    congested: 16 MB/s uplink whose goodput drops once more than 4 uploads share it.
+    fat_pipe:  Each connection is capped at 2 MB/s, like a long-haul TCP window, and the link carries 200 MB/s.
+
+Results on a 4-core Linux host, 256 KiB files, MB/s:
+
+                           200 files              1000 files
+                      fixed-4  fixed-64  adaptive-64   fixed-4  fixed-64  adaptive-64
+    congested           14.8      1.1       12.0         15.2       -        11.7
+    fat_pipe             6.5     44-60      28-35          -      50-54      46-48
+
+adaptive-64 stays near the knee of the congested link and reaches the limit of 64 on the fat pipe. On the fat pipe,
+it doubles from 2 to 64 over the first 5 windows, which is most of a run of 200 files; over 1000 files it gets about
+90% of fixed-64.
+
+Example:
+    python -m benchmarks.adaptive_concurrency_benchmark --num_files=200 --file_size=262144 --output=adaptive.json
+"""
+
+import argparse
+import json
+import os
+import tempfile
+import time
+
+from podonos.core.api import APIClient
+from podonos.core.base import *
+from podonos.core.report import percentile, upload_wall_time
+from podonos.core.upload_manager import UploadManager
+from podonos.testing import FakeBackend, FakeBackendProfile
+
+SCENARIOS = {
+    "congested": FakeBackendProfile(upload_bytes_per_sec=16e6, congestion_knee=4, congestion_degradation=1.0),
+    "fat_pipe": FakeBackendProfile(upload_bytes_per_sec=200e6, connection_bytes_per_sec=2e6),
+}
+
+# (label, max_upload_workers, adaptive)
+MODES = [
+    ("fixed-4", 4, False),
+    ("fixed-20", 20, False),
+    ("fixed-64", 64, False),
+    ("adaptive-64", 64, True),
+]
+
+
+def run_once(base_url: str, paths, max_workers: int, adaptive: bool):
+    api_client = APIClient("benchmark", base_url)
+    evaluation_id = api_client.post("evaluations", {"name": "adaptive concurrency benchmark"}).json()["id"]
+    upload_manager = UploadManager(api_client=api_client, max_workers=max_workers, adaptive=adaptive)
+    start = time.monotonic()
+    for index, path in enumerate(paths):
+        upload_manager.add_file_to_queue(evaluation_id, f"bench/{index}", path)
+    upload_manager.wait_and_close()
+    elapsed = time.monotonic() - start
+
+    records = upload_manager.get_upload_records()
+    latencies = sorted(record.upload_sec for record in records.values())
+    total_bytes = sum(record.size for record in records.values())
+    result = {
+        "elapsed_sec": elapsed,
+        "files_uploaded": len(records),
+        "files_failed": len(upload_manager.get_upload_errors()),
+        "mb_per_sec": total_bytes / 1e6 / upload_wall_time(records) if records else 0.0,
+        "latency_p50_sec": percentile(latencies, 0.5),
+        "latency_p95_sec": percentile(latencies, 0.95),
+        "final_limit": upload_manager.metrics.snapshot().concurrency_limit,
+    }
+    if adaptive:
+        result["limit_history"] = upload_manager._limiter.history  # type: ignore
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark fixed vs adaptive upload concurrency.")
+    parser.add_argument("--num_files", type=int, default=200)
+    parser.add_argument("--file_size", type=int, default=256 * 1024)
+    parser.add_argument("--scenario", choices=list(SCENARIOS) + ["all"], default="all")
+    parser.add_argument("--output", default=None, help="Path to write the results in JSON.")
+    args = parser.parse_args()
+    log.setLevel("WARNING")
+
+    results = {}
+    with tempfile.TemporaryDirectory() as data_dir:
+        paths = []
+        for index in range(args.num_files):
+            path = os.path.join(data_dir, f"{index}.bin")
+            with open(path, "wb") as f:
+                f.write(os.urandom(args.file_size))
+            paths.append(path)
+
+        scenarios = SCENARIOS if args.scenario == "all" else {args.scenario: SCENARIOS[args.scenario]}
+        for scenario, profile in scenarios.items():
+            results[scenario] = {}
+            for label, max_workers, adaptive in MODES:
+                with FakeBackend(profile, retain=False) as backend:
+                    results[scenario][label] = run_once(backend.base_url, paths, max_workers, adaptive)
+                result = results[scenario][label]
+                print(
+                    f"{scenario:10s} {label:12s} {result['elapsed_sec']:7.2f}s {result['mb_per_sec']:7.2f} MB/s "
+                    f"p95 {result['latency_p95_sec'] or 0:6.3f}s limit {result['final_limit']:3d} failed {result['files_failed']}"
+                )
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"num_files": args.num_files, "file_size": args.file_size, "results": results}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
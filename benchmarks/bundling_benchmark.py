@@ -0,0 +1,93 @@
+"""
+Compares uploading many short clips one by one and in bundles, against a local fake backend with request latency.
+
+The clips are 0.5 seconds of 16 kHz mono 16-bit audio by default, like the prompts of a TTS evaluation. The backend
+cuts the files out of each bundle, as the server-side hook does, so that both modes store the same objects.
+
+Example:
+    python -m benchmarks.bundling_benchmark --num_files=2000 --latency=0.02 --output=bundling.json
+"""
+
+import argparse
+import json
+import os
+import tempfile
+import time
+
+from typing import Optional
+
+from podonos.core.api import APIClient
+from podonos.core.base import *
+from podonos.core.upload_manager import UploadManager
+from podonos.testing import FakeBackend, FakeBackendProfile
+
+# (label, bundle_max_bytes)
+MODES = [
+    ("per-file", None),
+    ("bundle-1MiB", 1024 * 1024),
+    ("bundle-4MiB", 4 * 1024 * 1024),
+    ("bundle-16MiB", 16 * 1024 * 1024),
+]
+
+
+def run_once(paths, max_workers: int, latency_sec: float, bandwidth: float, bundle_max_bytes: Optional[int]):
+    profile = FakeBackendProfile(latency_sec=latency_sec, upload_bytes_per_sec=bandwidth)
+    with FakeBackend(profile) as backend:
+        api_client = APIClient("benchmark", backend.base_url)
+        evaluation_id = api_client.post("evaluations", {"name": "bundling benchmark"}).json()["id"]
+        upload_manager = UploadManager(api_client=api_client, max_workers=max_workers, bundle_max_bytes=bundle_max_bytes)
+        start = time.monotonic()
+        for index, path in enumerate(paths):
+            upload_manager.add_file_to_queue(evaluation_id, f"bench/{index}.wav", path)
+        upload_manager.wait_and_close()
+        elapsed = time.monotonic() - start
+
+    snapshot = upload_manager.metrics.snapshot()
+    return {
+        "elapsed_sec": elapsed,
+        "files_per_sec": snapshot.files_uploaded / elapsed,
+        "files_uploaded": snapshot.files_uploaded,
+        "files_failed": len(upload_manager.get_upload_errors()),
+        "requests": len(upload_manager.get_bundles()) if bundle_max_bytes else snapshot.files_uploaded,
+        "bytes_sent": backend.bytes_uploaded,
+        # The files, whether uploaded alone or cut out of a bundle.
+        "objects_stored": sum(not name.endswith(".tar") for name in backend.objects),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark per-file vs bundled uploads of short clips.")
+    parser.add_argument("--num_files", type=int, default=2000)
+    parser.add_argument("--file_size", type=int, default=16000 + 44)
+    parser.add_argument("--workers", type=int, default=20)
+    parser.add_argument("--latency", type=float, default=0.02, help="Seconds of latency of each presign and upload request.")
+    parser.add_argument("--bandwidth", type=float, default=50e6, help="Bytes per second of the uplink.")
+    parser.add_argument("--output", default=None, help="Path to write the results in JSON.")
+    args = parser.parse_args()
+    log.setLevel("WARNING")
+
+    results = {}
+    with tempfile.TemporaryDirectory() as data_dir:
+        paths = []
+        for index in range(args.num_files):
+            path = os.path.join(data_dir, f"{index}.wav")
+            with open(path, "wb") as f:
+                f.write(os.urandom(args.file_size))
+            paths.append(path)
+
+        for label, bundle_max_bytes in MODES:
+            result = run_once(paths, args.workers, args.latency, args.bandwidth, bundle_max_bytes)
+            results[label] = result
+            print(
+                f"{label:13s} {result['elapsed_sec']:7.2f}s {result['files_per_sec']:8.1f} files/s "
+                f"requests {result['requests']:5d} sent {result['bytes_sent'] / 1e6:7.2f} MB "
+                f"stored {result['objects_stored']:5d} failed {result['files_failed']}"
+            )
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"args": vars(args), "results": results}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
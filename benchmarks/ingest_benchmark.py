@@ -0,0 +1,257 @@
+"""
+Benchmark suite of the ingest pipeline, against the fake backend of podonos.testing. No API key or network needed.
+
+Benchmarks:
+    probe:         Metadata probes per second by audio format, as add_file() runs them.
+    add_file:      add_file() calls per second and CPU per call, while the uploads run.
+    upload_sweep:  UploadManager files/sec and MB/sec over max_upload_workers, to a fake backend server in another
+                   process with the latency and bandwidth of a profile.
+    close:         Latency of close() and of each of its phases, and the build time and size of session.json,
+                   against the number of files.
+    rss:           Peak RSS of a process adding 10k, 100k and 1M files and closing the evaluator, each in its own
+                   process. The fake backend retains nothing, so the memory is the SDK's. Not on Windows, which
+                   lacks the resource module.
+
+Except for upload_sweep, the backend answers in-process through a loopback transport, so the SDK's own cost is
+measured. The results are written in JSON with the SDK and Python versions and the host, one object per benchmark,
+to be compared across releases.
+
+Example:
+    python -m benchmarks.ingest_benchmark --output=ingest.json
+    python -m benchmarks.ingest_benchmark --quick --benchmarks=probe,upload_sweep
+"""
+
+import argparse
+import datetime
+import json
+import multiprocessing
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+
+from typing import Any, Dict, List
+
+import soundfile as sf
+
+import podonos
+
+from podonos import File
+from podonos.core.api import APIClient
+from podonos.core.audio import AudioMeta
+from podonos.core.base import *
+from podonos.core.report import percentile
+from podonos.core.transport import LoopbackTransport
+from podonos.core.upload_manager import UploadManager
+from podonos.testing import PROFILES, FakeBackend, free_port, serve_forever, wait_for_port
+
+BENCHMARKS = ["probe", "add_file", "upload_sweep", "close", "rss"]
+
+_TESTS_DIR = os.path.join(os.path.dirname(__file__), os.pardir, "tests")
+PROBE_FILES = {
+    "wav": os.path.join(_TESTS_DIR, "speech_two_ch1.wav"),
+    "flac": os.path.join(_TESTS_DIR, "speech_two_ch1.flac"),
+    "mp3": os.path.join(_TESTS_DIR, "speech_ch1.mp3"),
+}
+
+
+def make_clip(directory: str, seconds: float = 0.1, samplerate: int = 16000) -> str:
+    """A short mono 16-bit WAV, so that the runs measure the per-file cost rather than the bytes."""
+    path = os.path.join(directory, "clip.wav")
+    sf.write(path, [0.0] * int(seconds * samplerate), samplerate, subtype="PCM_16")
+    return path
+
+
+def loopback_client(backend: FakeBackend):
+    return podonos.init(api_key="fake-key", api_url="http://fake", transport=LoopbackTransport(backend.handle))
+
+
+def bench_probe(duration_sec: float) -> Dict[str, Any]:
+    results = {}
+    for fmt, path in PROBE_FILES.items():
+        count = 0
+        start = time.perf_counter()
+        while time.perf_counter() - start < duration_sec:
+            AudioMeta(path)
+            count += 1
+        results[fmt] = {"probes_per_sec": count / (time.perf_counter() - start)}
+    return results
+
+
+def bench_add_file(clip: str, num_files: int) -> Dict[str, Any]:
+    backend = FakeBackend(retain=False)
+    evaluator = loopback_client(backend).create_evaluator(name="add_file benchmark")
+    start = time.perf_counter()
+    cpu_start = time.process_time()
+    for _ in range(num_files):
+        evaluator.add_file(File(path=clip, model_tag="model"))
+    elapsed = time.perf_counter() - start
+    cpu_sec = time.process_time() - cpu_start
+    evaluator.close()
+    return {"files": num_files, "add_file_per_sec": num_files / elapsed, "cpu_ms_per_add_file": 1000.0 * cpu_sec / num_files}
+
+
+def bench_upload_sweep(data_dir: str, workers: List[int], num_files: int, file_size: int, profile: str) -> Dict[str, Any]:
+    paths = []
+    for index in range(num_files):
+        path = os.path.join(data_dir, f"sweep-{index}.bin")
+        with open(path, "wb") as f:
+            f.write(os.urandom(file_size))
+        paths.append(path)
+
+    port = free_port()
+    server = multiprocessing.get_context("spawn").Process(target=serve_forever, args=(port, PROFILES[profile]), daemon=True)
+    server.start()
+    wait_for_port(port)
+    base_url = f"http://127.0.0.1:{port}"
+    results = {}
+    try:
+        evaluation_id = APIClient("fake-key", base_url).post("evaluations", {"name": "upload_sweep benchmark"}).json()["id"]
+        for max_workers in workers:
+            # A client per run, so that its connection pool is sized to the workers.
+            upload_manager = UploadManager(api_client=APIClient("fake-key", base_url), max_workers=max_workers)
+            start = time.perf_counter()
+            for index, path in enumerate(paths):
+                upload_manager.add_file_to_queue(evaluation_id, f"{evaluation_id}/{max_workers}/{index}.wav", path)
+            upload_manager.wait_and_close()
+            elapsed = time.perf_counter() - start
+            latencies = sorted(record.upload_sec for record in upload_manager.get_upload_records().values())
+            results[str(max_workers)] = {
+                "files_per_sec": num_files / elapsed,
+                "mb_per_sec": num_files * file_size / 1e6 / elapsed,
+                "latency_p50_sec": percentile(latencies, 0.5),
+                "latency_p95_sec": percentile(latencies, 0.95),
+                "files_failed": len(upload_manager.get_upload_errors()),
+            }
+    finally:
+        server.terminate()
+        server.join()
+    return {"profile": profile, "files": num_files, "file_size": file_size, "workers": results}
+
+
+def bench_close(clip: str, counts: List[int], session_json_parts: int = 1) -> Dict[str, Any]:
+    results = {}
+    for num_files in counts:
+        backend = FakeBackend(retain=False)
+        evaluator = loopback_client(backend).create_evaluator(name="close benchmark", session_json_parts=session_json_parts)
+        evaluation_id = evaluator.get_evaluation_id()
+        for _ in range(num_files):
+            evaluator.add_file(File(path=clip, model_tag="model", tags=["benchmark"], script="Hello there."))
+        start = time.perf_counter()
+        report = evaluator.close()
+        phases = report["close_phases_sec"]
+        results[str(num_files)] = {
+            "close_sec": time.perf_counter() - start,
+            "close_phases_sec": phases,
+            "session_json_build_sec": phases.get("build_session_json"),
+            "session_json_bytes": backend.session_json_sizes[evaluation_id],
+        }
+    return results
+
+
+def rss_run(clip: str, num_files: int) -> Dict[str, Any]:
+    """Body of one rss process."""
+    backend = FakeBackend(retain=False)
+    evaluator = loopback_client(backend).create_evaluator(name="rss benchmark")
+    start = time.perf_counter()
+    for _ in range(num_files):
+        evaluator.add_file(File(path=clip, model_tag="model"))
+    evaluator.close()
+    # Unix only.
+    import resource
+
+    # Bytes on macOS, and kilobytes elsewhere.
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    peak_rss_bytes = peak_rss if sys.platform == "darwin" else peak_rss * 1024
+    return {"files": num_files, "elapsed_sec": time.perf_counter() - start, "peak_rss_mb": peak_rss_bytes / 1024.0**2}
+
+
+def bench_rss(clip: str, counts: List[int]) -> Dict[str, Any]:
+    results = {}
+    for num_files in counts:
+        completed = subprocess.run(
+            [sys.executable, "-m", "benchmarks.ingest_benchmark", "--rss_run", str(num_files), "--clip", clip],
+            check=True,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            text=True,
+        )
+        results[str(num_files)] = json.loads(completed.stdout.strip().splitlines()[-1])
+    return results
+
+
+def _counts(value: str) -> List[int]:
+    return [int(count) for count in value.split(",")]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark suite of the ingest pipeline against a fake backend.")
+    parser.add_argument("--benchmarks", default=",".join(BENCHMARKS), help=f"Comma-separated subset of {BENCHMARKS}.")
+    parser.add_argument("--quick", action="store_true", help="Small sizes, for a smoke test.")
+    parser.add_argument("--probe_sec", type=float, default=2.0, help="Seconds of probing per format.")
+    parser.add_argument("--add_file_files", type=int, default=5000)
+    parser.add_argument("--sweep_workers", type=_counts, default=_counts("1,2,4,8,16,32,64"))
+    parser.add_argument("--sweep_files", type=int, default=400)
+    parser.add_argument("--sweep_file_size", type=int, default=256 * 1024)
+    parser.add_argument("--sweep_profile", choices=list(PROFILES), default="broadband")
+    parser.add_argument("--close_files", type=_counts, default=_counts("100,1000,10000"))
+    parser.add_argument("--close_session_json_parts", type=int, default=1, help="Parts of session.json. See podonos.core.session_parts.")
+    parser.add_argument("--rss_files", type=_counts, default=_counts("10000,100000,1000000"))
+    parser.add_argument("--output", default=None, help="Path to write the results in JSON.")
+    parser.add_argument("--rss_run", type=int, default=None, help=argparse.SUPPRESS)
+    parser.add_argument("--clip", default=None, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    log.setLevel("WARNING")
+
+    if args.rss_run is not None:
+        print(json.dumps(rss_run(args.clip, args.rss_run)))
+        return
+    if args.quick:
+        args.probe_sec, args.add_file_files = 0.5, 500
+        args.sweep_workers, args.sweep_files, args.sweep_file_size = [1, 8], 50, 64 * 1024
+        args.close_files, args.rss_files = [100, 1000], [1000, 10000]
+
+    selected = args.benchmarks.split(",")
+    for name in selected:
+        if name not in BENCHMARKS:
+            raise ValueError(f'Unknown benchmark "{name}". Use some of {BENCHMARKS}')
+
+    results: Dict[str, Any] = {}
+    with tempfile.TemporaryDirectory() as data_dir:
+        clip = make_clip(data_dir)
+        for name in selected:
+            start = time.perf_counter()
+            if name == "probe":
+                results[name] = bench_probe(args.probe_sec)
+            elif name == "add_file":
+                results[name] = bench_add_file(clip, args.add_file_files)
+            elif name == "upload_sweep":
+                results[name] = bench_upload_sweep(data_dir, args.sweep_workers, args.sweep_files, args.sweep_file_size, args.sweep_profile)
+            elif name == "close":
+                results[name] = bench_close(clip, args.close_files, args.close_session_json_parts)
+            elif name == "rss":
+                if sys.platform == "win32":
+                    print("rss is skipped on Windows")
+                    continue
+                results[name] = bench_rss(clip, args.rss_files)
+            print(f"{name} ({time.perf_counter() - start:.1f}s): {json.dumps(results[name])}")
+
+    document = {
+        "suite": "ingest",
+        "podonos_version": podonos.__version__,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "created_at": datetime.datetime.now().astimezone().isoformat(timespec="seconds"),
+        "args": {key: value for key, value in vars(args).items() if key not in ("rss_run", "clip")},
+        "results": results,
+    }
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(document, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+"""
+Compares thread-only uploads with uploads sharded across worker processes, against local HTTPS fake backends.
+
+The fake backends run in their own processes, so that they don't compete with the uploader for its GIL.
+A self-signed certificate for 127.0.0.1 is generated with the openssl command and trusted via REQUESTS_CA_BUNDLE.
+The gain of the processes needs free cores: on a host with N cores, use at most about N/2 upload processes.
+
+Example:
+    python -m benchmarks.process_sharding_benchmark --num_files=400 --file_size=4194304 --processes=0,2,4 --output=sharding.json
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import subprocess
+import tempfile
+import time
+
+from podonos.core.api import APIClient
+from podonos.core.base import *
+from podonos.core.report import upload_wall_time
+from podonos.core.upload_engine import UploadEngine
+from podonos.core.upload_manager import UploadManager
+from podonos.testing import free_port, serve_forever, wait_for_port
+
+
+def make_certificate(directory: str):
+    certfile = os.path.join(directory, "cert.pem")
+    keyfile = os.path.join(directory, "key.pem")
+    subprocess.run(
+        ["openssl", "req", "-x509", "-newkey", "rsa:2048", "-nodes", "-days", "1", "-subj", "/CN=127.0.0.1",
+         "-addext", "subjectAltName=IP:127.0.0.1", "-keyout", keyfile, "-out", certfile],
+        check=True,
+        capture_output=True,
+    )
+    return certfile, keyfile
+
+
+def run_once(api_url: str, paths, workers: int, processes: int):
+    api_client = APIClient("benchmark", api_url)
+    evaluation_id = api_client.post("evaluations", {"name": "process sharding benchmark"}).json()["id"]
+    engine = UploadEngine(api_client, max_workers=workers, num_processes=processes)
+    upload_manager = UploadManager(api_client=api_client, max_workers=workers, engine=engine)
+    start = time.monotonic()
+    for index, path in enumerate(paths):
+        upload_manager.add_file_to_queue(evaluation_id, f"bench/{index}", path)
+    upload_manager.wait_and_close()
+    elapsed = time.monotonic() - start
+    engine.close()
+
+    records = upload_manager.get_upload_records()
+    total_bytes = sum(record.size for record in records.values())
+    wall = upload_wall_time(records)
+    return {
+        "elapsed_sec": elapsed,
+        "files_uploaded": len(records),
+        "files_failed": len(upload_manager.get_upload_errors()),
+        "mb_per_sec": total_bytes / 1e6 / wall if wall > 0 else 0.0,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark thread-only vs process-sharded uploads over HTTPS.")
+    parser.add_argument("--num_files", type=int, default=200)
+    parser.add_argument("--file_size", type=int, default=1024 * 1024)
+    parser.add_argument("--workers", type=int, default=16)
+    parser.add_argument("--processes", default="0,2,4", help="Comma-separated numbers of upload processes. 0 is thread-only.")
+    parser.add_argument("--server_processes", type=int, default=4)
+    parser.add_argument("--output", default=None, help="Path to write the results in JSON.")
+    args = parser.parse_args()
+    log.setLevel("WARNING")
+
+    results = {}
+    with tempfile.TemporaryDirectory() as work_dir:
+        certfile, keyfile = make_certificate(work_dir)
+        # Inherited by the spawned upload processes.
+        os.environ["REQUESTS_CA_BUNDLE"] = certfile
+
+        ports = [free_port() for _ in range(args.server_processes)]
+        upload_base_urls = [f"https://127.0.0.1:{port}" for port in ports]
+        context = multiprocessing.get_context("spawn")
+        servers = [
+            context.Process(target=serve_forever, args=(port, None, certfile, keyfile, upload_base_urls), daemon=True) for port in ports
+        ]
+        for server in servers:
+            server.start()
+        for port in ports:
+            wait_for_port(port)
+
+        paths = []
+        for index in range(args.num_files):
+            path = os.path.join(work_dir, f"{index}.bin")
+            with open(path, "wb") as f:
+                f.write(os.urandom(args.file_size))
+            paths.append(path)
+
+        try:
+            for processes in [int(value) for value in args.processes.split(",")]:
+                label = "threads" if processes == 0 else f"processes-{processes}"
+                results[label] = run_once(upload_base_urls[0], paths, args.workers, processes)
+                result = results[label]
+                print(f"{label:14s} {result['elapsed_sec']:7.2f}s {result['mb_per_sec']:8.2f} MB/s failed {result['files_failed']}")
+        finally:
+            for server in servers:
+                server.terminate()
+
+    if args.output:
+        output = {"cpu_count": os.cpu_count(), "args": vars(args), "results": results}
+        with open(args.output, "w") as f:
+            json.dump(output, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+"""
+Simulates the upload scheduling policies and reports the makespan, i.e. the time until the last file is uploaded.
+
+Every file takes a fixed per-request overhead plus its size over the per-worker bandwidth. All files are queued
+before the workers start, as when add_file() runs faster than the uploads.
+
+Scenarios:
+    lognormal: Heavy-tailed sizes, like a mix of short utterances and long recordings.
+    long_tail: Many short clips, with a few 40-minute recordings added last.
+    pairs:     Pairs of files from add_files() with unrelated sizes. Also reports how far apart the halves finish.
+
+Example:
+    python -m benchmarks.scheduling_benchmark --num_files=2000 --workers=20 --output=scheduling.json
+"""
+
+import argparse
+import heapq
+import json
+import random
+
+from typing import Dict, List, Optional
+
+from podonos.core.report import percentile
+from podonos.core.scheduling import create_upload_queue, get_scheduling_policies
+from podonos.core.upload_manager import UploadItem
+
+# 16-bit 48 kHz stereo WAV.
+_BYTES_PER_SEC_OF_AUDIO = 48000 * 2 * 2
+
+
+def make_items(scenario: str, num_files: int, rng: random.Random) -> List[UploadItem]:
+    items = []
+    if scenario == "lognormal":
+        for index in range(num_files):
+            size = int(_BYTES_PER_SEC_OF_AUDIO * rng.lognormvariate(1.5, 1.5))
+            items.append(UploadItem("bench", f"{index}", f"{index}.wav", size))
+    elif scenario == "long_tail":
+        num_long = max(1, num_files // 500)
+        for index in range(num_files - num_long):
+            size = int(_BYTES_PER_SEC_OF_AUDIO * rng.uniform(2, 10))
+            items.append(UploadItem("bench", f"{index}", f"{index}.wav", size))
+        for index in range(num_files - num_long, num_files):
+            items.append(UploadItem("bench", f"{index}", f"{index}.wav", _BYTES_PER_SEC_OF_AUDIO * 40 * 60))
+    elif scenario == "pairs":
+        for index in range(num_files // 2):
+            for member in range(2):
+                size = int(_BYTES_PER_SEC_OF_AUDIO * rng.lognormvariate(1.5, 1.0))
+                items.append(UploadItem("bench", f"{index}-{member}", f"{index}-{member}.wav", size, group=f"{index}", group_size=2))
+    else:
+        raise ValueError(f"Unknown scenario {scenario}")
+    return items
+
+
+def simulate(policy: str, items: List[UploadItem], workers: int, bandwidth: float, overhead: float) -> Dict[str, Optional[float]]:
+    upload_queue = create_upload_queue(policy)
+    for item in items:
+        upload_queue.put(item)
+    upload_queue.flush()
+
+    free_at = [0.0] * workers
+    heapq.heapify(free_at)
+    finished: Dict[str, float] = {}
+    groups: Dict[str, List[float]] = {}
+    while not upload_queue.empty():
+        start = heapq.heappop(free_at)
+        item = upload_queue.get_nowait()
+        finish = start + overhead + item.size / bandwidth
+        heapq.heappush(free_at, finish)
+        finished[item.remote_object_name] = finish
+        if item.group is not None:
+            groups.setdefault(item.group, []).append(finish)
+
+    spreads = sorted(max(finishes) - min(finishes) for finishes in groups.values())
+    return {
+        "makespan_sec": max(finished.values()),
+        "lower_bound_sec": max(
+            sum(overhead + item.size / bandwidth for item in items) / workers,
+            max(overhead + item.size / bandwidth for item in items),
+        ),
+        "group_spread_p50_sec": percentile(spreads, 0.5),
+        "group_spread_p95_sec": percentile(spreads, 0.95),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Simulate upload scheduling policies.")
+    parser.add_argument("--num_files", type=int, default=2000)
+    parser.add_argument("--workers", type=int, default=20)
+    parser.add_argument("--bandwidth", type=float, default=2e6, help="Bytes per second of one worker.")
+    parser.add_argument("--overhead", type=float, default=0.1, help="Seconds per file for the presign and the request.")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default=None, help="Path to write the results in JSON.")
+    args = parser.parse_args()
+
+    results = {}
+    for scenario in ["lognormal", "long_tail", "pairs"]:
+        items = make_items(scenario, args.num_files, random.Random(args.seed))
+        results[scenario] = {}
+        for policy in get_scheduling_policies():
+            result = simulate(policy, items, args.workers, args.bandwidth, args.overhead)
+            results[scenario][policy] = result
+            spread = result["group_spread_p95_sec"]
+            print(
+                f"{scenario:10s} {policy:14s} makespan {result['makespan_sec']:8.1f}s "
+                f"(lower bound {result['lower_bound_sec']:8.1f}s)"
+                + (f" group spread p95 {spread:6.1f}s" if spread is not None else "")
+            )
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"args": vars(args), "results": results}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,159 @@
+"""
+Measures the throughput and the peak RSS of uploading one large file to a local fake backend.
+
+Strategies:
+    file_object:  requests.put() with the open file as the body, as the SDK did before. urllib3 reads it in 16 KiB
+                  copies.
+    stream:       put_file_presigned_url() through requests, with the body streamed from a mmap.
+    sendfile:     put_file_presigned_url() to a plain HTTP URL, with the body sent by sendfile(2).
+
+Each strategy runs in a fresh process, so that its peak RSS is its own. The fake backend runs in another process.
+The file is read once before the runs, so that every strategy reads it from the page cache. On loopback, the
+server shares the cores with the uploader, so the CPU time of the uploading process is reported too.
+With --https, the server uses a self-signed certificate and sendfile doesn't apply. Windows lacks the resource module,
+so the peak RSS is not measured there.
+
+Example:
+    python -m benchmarks.streaming_upload_benchmark --file_size=2147483648 --output=streaming.json
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+from typing import Optional
+
+import requests
+
+from podonos.core.api import APIClient
+from podonos.core.base import *
+from podonos.testing import free_port, serve_forever, wait_for_port
+from benchmarks.process_sharding_benchmark import make_certificate
+
+STRATEGIES = ["file_object", "stream", "sendfile"]
+
+
+def _max_rss_bytes() -> Optional[int]:
+    if sys.platform == "win32":
+        return None
+    # Unix only.
+    import resource
+
+    # Bytes on macOS, and kilobytes elsewhere.
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return max_rss if sys.platform == "darwin" else max_rss * 1024
+
+
+def _mb(nbytes: Optional[int]) -> Optional[float]:
+    return nbytes / 1e6 if nbytes is not None else None
+
+
+def run_strategy(strategy: str, url: str, path: str) -> dict:
+    """Uploads the file once in this process."""
+    baseline_rss = _max_rss_bytes()
+    cpu_start = time.process_time()
+    start = time.monotonic()
+    if strategy == "file_object":
+        with open(path, "rb") as f:
+            response = requests.put(url, data=f)
+    else:
+        api_client = APIClient("benchmark", url)
+        api_client._use_sendfile = strategy == "sendfile"
+        response = api_client.put_file_presigned_url(url, path)
+    elapsed = time.monotonic() - start
+    cpu_sec = time.process_time() - cpu_start
+    response.raise_for_status()
+
+    size = os.path.getsize(path)
+    return {
+        "elapsed_sec": elapsed,
+        "mb_per_sec": size / 1e6 / elapsed,
+        # CPU time of the uploading process, user and system.
+        "cpu_sec": cpu_sec,
+        # None on Windows.
+        "baseline_rss_mb": _mb(baseline_rss),
+        "peak_rss_mb": _mb(_max_rss_bytes()),
+    }
+
+
+def write_file(path: str, size: int) -> None:
+    block = os.urandom(16 * 1024 * 1024)
+    with open(path, "wb") as f:
+        remaining = size
+        while remaining > 0:
+            remaining -= f.write(block[:remaining])
+
+
+def warm_page_cache(path: str) -> None:
+    with open(path, "rb") as f:
+        while f.read(16 * 1024 * 1024):
+            pass
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the throughput and RSS of large file uploads.")
+    parser.add_argument("--file_size", type=int, default=2 * 1024**3)
+    parser.add_argument("--strategies", default=",".join(STRATEGIES), help=f"Comma-separated strategies of {STRATEGIES}.")
+    parser.add_argument("--https", action="store_true", help="Upload over TLS.")
+    parser.add_argument("--output", default=None, help="Path to write the results in JSON.")
+    # Internal. Runs one strategy and prints its result.
+    parser.add_argument("--run", default=None, help=argparse.SUPPRESS)
+    parser.add_argument("--url", default=None, help=argparse.SUPPRESS)
+    parser.add_argument("--path", default=None, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    log.setLevel("WARNING")
+
+    if args.run:
+        print(json.dumps(run_strategy(args.run, args.url, args.path)))
+        return
+
+    results = {}
+    with tempfile.TemporaryDirectory() as work_dir:
+        env = dict(os.environ)
+        certfile = keyfile = None
+        if args.https:
+            certfile, keyfile = make_certificate(work_dir)
+            env["REQUESTS_CA_BUNDLE"] = certfile
+        port = free_port()
+        base_url = f"{'https' if args.https else 'http'}://127.0.0.1:{port}"
+        server = multiprocessing.get_context("spawn").Process(target=serve_forever, args=(port, None, certfile, keyfile), daemon=True)
+        server.start()
+        wait_for_port(port)
+
+        path = os.path.join(work_dir, "large.bin")
+        write_file(path, args.file_size)
+        warm_page_cache(path)
+        try:
+            for strategy in args.strategies.split(","):
+                if strategy not in STRATEGIES:
+                    raise ValueError(f'Unknown strategy "{strategy}". Use one of {STRATEGIES}')
+                command = [sys.executable, "-m", "benchmarks.streaming_upload_benchmark", "--run", strategy]
+                completed = subprocess.run(
+                    command + ["--url", f"{base_url}/upload/benchmark/large.bin", "--path", path],
+                    check=True,
+                    capture_output=True,
+                    text=True,
+                    env=env,
+                )
+                result = json.loads(completed.stdout.strip().splitlines()[-1])
+                results[strategy] = result
+                print(
+                    f"{strategy:12s} {result['elapsed_sec']:7.2f}s {result['mb_per_sec']:8.2f} MB/s "
+                    f"CPU {result['cpu_sec']:6.2f}s peak RSS {result['peak_rss_mb'] or 0:8.1f} MB"
+                )
+        finally:
+            server.terminate()
+
+    if args.output:
+        output = {"cpu_count": os.cpu_count(), "args": vars(args), "results": results}
+        with open(args.output, "w") as f:
+            json.dump(output, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""
+Measures the bytes saved and the CPU spent by the pre-upload transform.
+
+The clips are the speech sample of the tests, tiled and upsampled to 48 kHz stereo 32-bit float WAV, like the output
+of a TTS model saved without care for the size. Each transform runs over every clip on a process pool, as in the SDK.
+
+Example:
+    python -m benchmarks.transform_benchmark --num_files=50 --seconds=5 --output=transform.json
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import tempfile
+import time
+
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import soundfile as sf
+
+from podonos.core.base import *
+from podonos.core.transform import UploadTransform, resample, transform_audio
+
+_SPEECH = os.path.join(os.path.dirname(__file__), os.pardir, "tests", "speech_two_ch1.wav")
+
+TRANSFORMS = {
+    "flac": UploadTransform(),
+    "flac_mono": UploadTransform(mono=True),
+    "flac_mono_24k": UploadTransform(mono=True, sample_rate=24000),
+    "flac_mono_16k": UploadTransform(mono=True, sample_rate=16000),
+}
+
+
+def make_clips(directory: str, num_files: int, seconds: float):
+    speech, rate = sf.read(_SPEECH, always_2d=True)
+    speech = np.tile(speech, (int(np.ceil(seconds * rate / speech.shape[0])), 1))[: int(seconds * rate)]
+    speech = resample(speech, rate, 48000)
+    rng = np.random.default_rng(0)
+    paths = []
+    for index in range(num_files):
+        # Slightly different channels and a noise floor, as in a real recording.
+        left = speech[:, 0] * rng.uniform(0.5, 0.9)
+        right = left * 0.95 + rng.normal(0, 1e-4, size=left.shape)
+        path = os.path.join(directory, f"{index}.wav")
+        sf.write(path, np.stack([left, right], axis=1).astype(np.float32), 48000, subtype="FLOAT")
+        paths.append(path)
+    return paths
+
+
+def run_once(paths, transform: UploadTransform, processes: int):
+    start = time.monotonic()
+    with ProcessPoolExecutor(max_workers=processes, mp_context=multiprocessing.get_context("spawn")) as executor:
+        results = list(executor.map(transform_audio, paths, [transform] * len(paths)))
+    elapsed = time.monotonic() - start
+    original_bytes = sum(result.original_size for result in results)
+    transmitted_bytes = sum(result.size for result in results)
+    audio_sec = sum(result.duration_in_ms for result in results) / 1000.0
+    cpu_sec = sum(result.cpu_sec for result in results)
+    return {
+        "original_bytes": original_bytes,
+        "transmitted_bytes": transmitted_bytes,
+        "saved_ratio": 1.0 - transmitted_bytes / original_bytes,
+        "cpu_sec": cpu_sec,
+        "cpu_sec_per_audio_minute": cpu_sec / audio_sec * 60.0,
+        # Includes starting the pool.
+        "wall_sec": elapsed,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the bytes saved and the CPU cost of the pre-upload transform.")
+    parser.add_argument("--num_files", type=int, default=50)
+    parser.add_argument("--seconds", type=float, default=5.0, help="Length of each clip.")
+    parser.add_argument("--processes", type=int, default=os.cpu_count())
+    parser.add_argument("--transforms", default=",".join(TRANSFORMS), help=f"Comma-separated transforms of {list(TRANSFORMS)}.")
+    parser.add_argument("--output", default=None, help="Path to write the results in JSON.")
+    args = parser.parse_args()
+    log.setLevel("WARNING")
+
+    results = {}
+    with tempfile.TemporaryDirectory() as work_dir:
+        paths = make_clips(work_dir, args.num_files, args.seconds)
+        for name in args.transforms.split(","):
+            results[name] = run_once(paths, TRANSFORMS[name], args.processes)
+            result = results[name]
+            print(
+                f"{name:14s} {result['original_bytes'] / 1e6:8.1f} MB -> {result['transmitted_bytes'] / 1e6:7.1f} MB "
+                f"saved {result['saved_ratio'] * 100:5.1f}% CPU {result['cpu_sec']:6.2f}s "
+                f"({result['cpu_sec_per_audio_minute']:.2f}s per audio minute) wall {result['wall_sec']:6.2f}s"
+            )
+
+    if args.output:
+        output = {"cpu_count": os.cpu_count(), "args": vars(args), "results": results}
+        with open(args.output, "w") as f:
+            json.dump(output, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""
+Compares the HTTP transports of APIClient on the upload pipeline, by the files per second and the CPU per file.
+
+The requests and pooled transports upload to a local fake backend in another process. The loopback transport
+answers in-process, so its CPU per file is the overhead of the SDK alone, and the difference to the others is the
+cost of the HTTP stack.
+The file bodies go through the transports, not sendfile(2), so that every request is measured.
+
+Example:
+    python -m benchmarks.transport_benchmark --num_files=2000 --file_size=16384 --output=transport.json
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import tempfile
+import time
+
+from podonos.core.api import APIClient
+from podonos.core.base import *
+from podonos.core.transport import LoopbackTransport, PooledTransport, RequestsTransport, Transport
+from podonos.core.upload_manager import UploadManager
+from podonos.testing import free_port, serve_forever, wait_for_port
+
+TRANSPORTS = {
+    "requests": RequestsTransport,
+    "pooled": PooledTransport,
+    "loopback": LoopbackTransport,
+}
+
+
+def run_once(base_url: str, transport: Transport, evaluation_id: str, paths, max_workers: int):
+    api_client = APIClient("benchmark", base_url, transport=transport)
+    api_client._use_sendfile = False
+    upload_manager = UploadManager(api_client=api_client, max_workers=max_workers)
+    start = time.monotonic()
+    cpu_start = time.process_time()
+    for index, path in enumerate(paths):
+        upload_manager.add_file_to_queue(evaluation_id, f"bench/{index}", path)
+    upload_manager.wait_and_close()
+    elapsed = time.monotonic() - start
+    cpu_sec = time.process_time() - cpu_start
+    transport.close()
+
+    uploaded = upload_manager.metrics.snapshot().files_uploaded
+    return {
+        "elapsed_sec": elapsed,
+        "files_per_sec": uploaded / elapsed,
+        "cpu_ms_per_file": 1000.0 * cpu_sec / max(uploaded, 1),
+        "files_uploaded": uploaded,
+        "files_failed": len(upload_manager.get_upload_errors()),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the HTTP transports on the upload pipeline.")
+    parser.add_argument("--num_files", type=int, default=2000)
+    parser.add_argument("--file_size", type=int, default=16 * 1024)
+    parser.add_argument("--workers", type=int, default=20)
+    parser.add_argument("--output", default=None, help="Path to write the results in JSON.")
+    args = parser.parse_args()
+    log.setLevel("WARNING")
+
+    results = {}
+    with tempfile.TemporaryDirectory() as data_dir:
+        paths = []
+        for index in range(args.num_files):
+            path = os.path.join(data_dir, f"{index}.wav")
+            with open(path, "wb") as f:
+                f.write(os.urandom(args.file_size))
+            paths.append(path)
+
+        port = free_port()
+        server = multiprocessing.get_context("spawn").Process(target=serve_forever, args=(port,), daemon=True)
+        server.start()
+        wait_for_port(port)
+        base_url = f"http://127.0.0.1:{port}"
+        try:
+            evaluation_id = APIClient("benchmark", base_url).post("evaluations", {"name": "transport benchmark"}).json()["id"]
+            for label, transport_class in TRANSPORTS.items():
+                # The loopback transport never reaches the server. Its presigned URLs point back to it.
+                url = base_url if label != "loopback" else "http://loopback"
+                result = run_once(url, transport_class(), evaluation_id, paths, args.workers)
+                results[label] = result
+                print(
+                    f"{label:9s} {result['elapsed_sec']:7.2f}s {result['files_per_sec']:8.1f} files/s "
+                    f"{result['cpu_ms_per_file']:6.3f} CPU ms/file failed {result['files_failed']}"
+                )
+        finally:
+            server.terminate()
+            server.join()
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"args": vars(args), "results": results}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,5 @@
 from .core.file import File
+from .core.shared_audio import SharedAudio, share_audio
 from .sdk import Podonos, Client
 
 __version__ = "0.3.0"
@@ -21,6 +21,13 @@ PODONOS_DOCS_API_KEY = "https://www.podonos.com/docs/apikey"
 # API key environment variable
 PODONOS_API_KEY = "PODONOS_API_KEY"
 
+# Profiling mode environment variable. Set to the output directory of the profiles.
+PODONOS_PROFILE = "PODONOS_PROFILE"
+
+# Directory of the on-disk caches of the SDK, and the seconds the initialization checks stay cached. See podonos.core.init_cache.
+PODONOS_CACHE_DIR = "PODONOS_CACHE_DIR"
+PODONOS_INIT_CACHE_TTL = "PODONOS_INIT_CACHE_TTL"
+
 # Podonos Workspace
 PODONOS_WORKSPACE = "https://workspace.podonos.com"
 
@@ -1,16 +1,74 @@
+import http.client
+import mmap
 import os
+import re
+import socket
+import threading
+import time
 import podonos
 import requests
 import mimetypes
 import importlib.metadata
 
+from concurrent.futures import ThreadPoolExecutor
 from requests import Response
-from typing import Dict, Any, Optional
+from typing import BinaryIO, Callable, Dict, Any, Iterator, Optional, Tuple
+from urllib.parse import urlsplit
 from packaging.version import Version
 
 from podonos.common.constant import *
 from podonos.common.exception import HTTPError
 from podonos.core.base import *
+from podonos.core.init_cache import InitCache
+from podonos.core.rate_limit import (
+    ENDPOINT_CLASS_API,
+    ENDPOINT_CLASS_PRESIGN,
+    ENDPOINT_CLASS_STORAGE,
+    HTTP_TOO_MANY_REQUESTS,
+    RateLimiter,
+    TokenBucket,
+    get_rate_limiter,
+    parse_retry_after,
+)
+from podonos.core.tracing import Span, TraceHook, Tracer
+from podonos.core.transport import RequestsTransport, Transport, build_response
+
+
+# Seconds to establish a connection, and to wait for the server between bytes. requests waits forever by default.
+DEFAULT_CONNECT_TIMEOUT_SEC = 10.0
+DEFAULT_READ_TIMEOUT_SEC = 60.0
+
+# Route name of the requests to presigned URLs on the object store.
+_PRESIGNED_ENDPOINT = "presigned-url"
+
+# Bytes of a file body per chunk. 1 MiB, rounded up to a multiple of the mmap granularity so that chunks are page aligned.
+_BODY_CHUNK_SIZE = -(-(1 << 20) // mmap.ALLOCATIONGRANULARITY) * mmap.ALLOCATIONGRANULARITY
+_MADV_WILLNEED: Optional[int] = getattr(mmap, "MADV_WILLNEED", None)
+_MADV_DONTNEED: Optional[int] = getattr(mmap, "MADV_DONTNEED", None)
+
+_EVALUATION_ID_IN_ROUTE = re.compile(r"^evaluations/[^/]+/")
+
+# Attribute set on every response of APIClient to the number of retries its request took. See retries_of().
+_RETRIES_ATTRIBUTE = "podonos_retries"
+
+
+def retries_of(response: Any) -> int:
+    """Number of retries after 429 responses that APIClient took to get this response. 0 for other responses."""
+    retries = getattr(response, _RETRIES_ATTRIBUTE, 0)
+    return retries if isinstance(retries, int) else 0
+
+
+def _normalize_route(endpoint: str) -> str:
+    """Replaces the evaluation id in the endpoint so that spans are grouped by route."""
+    return _EVALUATION_ID_IN_ROUTE.sub("evaluations/{id}/", endpoint)
+
+
+def _endpoint_class(endpoint: str) -> str:
+    if endpoint == _PRESIGNED_ENDPOINT:
+        return ENDPOINT_CLASS_STORAGE
+    if endpoint.endswith("presigned-url"):
+        return ENDPOINT_CLASS_PRESIGN
+    return ENDPOINT_CLASS_API
 
 
 class APIVersion:
@@ -36,15 +94,197 @@ class APIVersion:
         return self._latest
 
 
+class _UploadBody:
+    """Body of an upload, iterated in chunks by requests. With a byte bucket, each chunk waits for the upload bandwidth."""
+
+    _byte_bucket: Optional[TokenBucket] = None
+    # Seconds spent reading the body from the disk.
+    _read_time: float = 0.0
+
+    @property
+    def byte_bucket(self) -> Optional[TokenBucket]:
+        return self._byte_bucket
+
+    @property
+    def read_time(self) -> float:
+        return self._read_time
+
+    def _throttle(self, length: int) -> None:
+        if self._byte_bucket is not None:
+            self._byte_bucket.acquire(length)
+
+
+class _BytesBody(_UploadBody):
+    """Body of an upload already in memory. Sent in chunks, without copies, only so that the byte bucket can pace it."""
+
+    _data: memoryview
+
+    def __init__(self, data: bytes, byte_bucket: Optional[TokenBucket] = None) -> None:
+        self._data = memoryview(data)
+        self._byte_bucket = byte_bucket
+        self._read_time = 0.0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __iter__(self) -> Iterator[memoryview]:
+        for offset in range(0, len(self._data), _BODY_CHUNK_SIZE):
+            chunk = self._data[offset : offset + _BODY_CHUNK_SIZE]
+            self._throttle(len(chunk))
+            yield chunk
+
+
+class _FileBody(_UploadBody):
+    """Body of a file upload, streamed from the disk without copying it through Python.
+
+    Content-Length comes from fstat of the open file. The body is iterated as page-aligned slices of a read-only
+    mmap, which the socket sends as they are, and each slice is dropped from the resident set once sent, so the RSS
+    stays flat for files of any size. Files that can't be mapped are read in chunks into one reused buffer.
+    Every iteration starts from the beginning, for a retry after 429.
+
+    Use as a context manager, so that the file is closed right after the request, even if it fails.
+    """
+
+    _file: BinaryIO
+    _size: int
+    _mmap: Optional[mmap.mmap] = None
+
+    def __init__(self, path: str, byte_bucket: Optional[TokenBucket] = None) -> None:
+        self._file = open(path, "rb")
+        try:
+            self._size = os.fstat(self._file.fileno()).st_size
+            self._mmap = _map_file(self._file, self._size)
+        except BaseException:
+            self._file.close()
+            raise
+        self._byte_bucket = byte_bucket
+        self._read_time = 0.0
+
+    def __enter__(self) -> "_FileBody":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    @property
+    def file(self) -> BinaryIO:
+        return self._file
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __iter__(self) -> Iterator[memoryview]:
+        if self._mmap is not None:
+            return self._iter_mapped(self._mmap)
+        return self._iter_read()
+
+    def close(self) -> None:
+        if self._mmap is not None:
+            try:
+                self._mmap.close()
+            except BufferError:
+                # A chunk is still referenced, e.g. by the traceback of a failed send. The map goes with it.
+                log.debug("File body is still referenced, leaving the map to the garbage collector")
+            self._mmap = None
+        self._file.close()
+
+    def _iter_mapped(self, mapped: mmap.mmap) -> Iterator[memoryview]:
+        view = memoryview(mapped)
+        try:
+            for offset in range(0, self._size, _BODY_CHUNK_SIZE):
+                length = min(_BODY_CHUNK_SIZE, self._size - offset)
+                start = time.perf_counter()
+                # Starts reading the next chunk from the disk while this one is sent.
+                _madvise(mapped, _MADV_WILLNEED, offset + length, min(_BODY_CHUNK_SIZE, self._size - offset - length))
+                self._read_time += time.perf_counter() - start
+                self._throttle(length)
+                chunk = view[offset : offset + length]
+                try:
+                    yield chunk
+                finally:
+                    chunk.release()
+                # Sent. The pages stay in the page cache but no longer count toward the RSS.
+                _madvise(mapped, _MADV_DONTNEED, offset, length)
+        finally:
+            view.release()
+
+    def _iter_read(self) -> Iterator[memoryview]:
+        buffer = bytearray(_BODY_CHUNK_SIZE)
+        view = memoryview(buffer)
+        self._file.seek(0)
+        while True:
+            start = time.perf_counter()
+            length = self._file.readinto(buffer)  # type: ignore[attr-defined]
+            self._read_time += time.perf_counter() - start
+            if not length:
+                return
+            self._throttle(length)
+            # The buffer is reused, which is safe as the chunk is sent before the next one is read.
+            yield view[:length]
+
+
+def _map_file(file: BinaryIO, size: int) -> Optional[mmap.mmap]:
+    if size == 0:
+        # An empty file can't be mapped, and has nothing to send anyway.
+        return None
+    try:
+        return mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError) as e:
+        log.debug(f"Can't map the file, reading it instead: {e}")
+        return None
+
+
+def _madvise(mapped: mmap.mmap, advice: Optional[int], offset: int, length: int) -> None:
+    # madvise isn't available on every platform, and is only a hint.
+    if advice is None or length <= 0 or not hasattr(mapped, "madvise"):
+        return
+    try:
+        mapped.madvise(advice, offset, length)
+    except OSError:
+        pass
+
+
 class APIClient:
     _api_key: str
     _api_url: str
     _headers: Dict[str, str] = {}
+    _tracer: Tracer
+    _rate_limiter: RateLimiter
+    # (connect timeout, read timeout) in seconds of every request.
+    _timeout: Tuple[float, float] = (DEFAULT_CONNECT_TIMEOUT_SEC, DEFAULT_READ_TIMEOUT_SEC)
+    # Sends the requests. See podonos.core.transport.
+    _transport: Transport
+    # Sends file bodies to plain HTTP URLs with sendfile(2), straight from the page cache to the socket.
+    _use_sendfile: bool = True
+    # Lazy initialization: the checks run before the first request, once, under the lock.
+    _verification_pending: bool = False
+    _verification_lock: threading.Lock
+    _init_cache: Optional[InitCache] = None
+    # Marks the threads running the checks, whose own requests must not wait for them.
+    _local: threading.local
 
-    def __init__(self, api_key: str, api_url: str):
+    def __init__(
+        self,
+        api_key: str,
+        api_url: str,
+        trace_hook: Optional[TraceHook] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        timeout: Tuple[float, float] = (DEFAULT_CONNECT_TIMEOUT_SEC, DEFAULT_READ_TIMEOUT_SEC),
+        transport: Optional[Transport] = None,
+    ):
+        log.check_gt(timeout[0], 0)
+        log.check_gt(timeout[1], 0)
         self._api_key = api_key
         self._api_url = api_url
         self._headers = {"X-API-KEY": self._api_key}
+        self._tracer = Tracer(trace_hook)
+        # The process-wide limiter unless given one, so that all evaluators share the same limits.
+        self._rate_limiter = rate_limiter or get_rate_limiter()
+        self._timeout = timeout
+        # The requests module, which opens a connection per request, until a pool is enabled.
+        self._transport = transport if transport is not None else RequestsTransport()
+        self._verification_lock = threading.Lock()
+        self._local = threading.local()
 
     @property
     def api_key(self) -> str:
@@ -54,14 +294,53 @@ class APIClient:
     def api_url(self) -> str:
         return self._api_url
 
-    def initialize(self) -> bool:
-        self._check_minimum_version()
+    @property
+    def tracer(self) -> Tracer:
+        return self._tracer
+
+    @property
+    def timeout(self) -> Tuple[float, float]:
+        return self._timeout
 
-        response = self.get("customers/verify/api-key")
-        if response.text != "true":
-            raise ValueError(TerminalColor.FAIL + f"Invalid API key: {self._api_key}" + TerminalColor.ENDC)
+    @property
+    def rate_limiter(self) -> RateLimiter:
+        return self._rate_limiter
+
+    @property
+    def transport(self) -> Transport:
+        return self._transport
+
+    def initialize(self, cache: Optional[InitCache] = None, lazy: bool = False) -> bool:
+        """Checks the SDK version and verifies the API key, both at once.
+
+        Args:
+            cache: Skips the checks if they succeeded within its TTL, and records their success. Optional.
+            lazy: Defers the checks until the first request, which raises their errors. Default: False
+
+        Raises:
+            ValueError: if the SDK version is below the minimum or the API key is invalid.
+        """
+        self._init_cache = cache
+        if cache is not None and cache.get(self._api_key, self._api_url, self._get_podonos_version()):
+            log.debug("Initialization checks are cached")
+            return True
+        if lazy:
+            self._verification_pending = True
+            return True
+        self._verify()
         return True
 
+    def enable_connection_pool(self, pool_size: int) -> None:
+        """Sends the following requests over a pool of keep-alive connections, up to pool_size per host.
+        No-op if the transport already keeps a pool, except for growing it.
+        """
+        log.check_gt(pool_size, 0)
+        transport = self._transport.pooled(pool_size)
+        if transport is self._transport:
+            return
+        self._transport = transport
+        log.debug(f"Connection pool is enabled with {pool_size} connections per host")
+
     def add_headers(self, key: str, value: str) -> None:
         log.check_notnone(key)
         log.check_ne(key, "")
@@ -77,8 +356,8 @@ class APIClient:
         log.check_notnone(endpoint)
         log.check_ne(endpoint, "")
         request_header = self._headers if headers is None else headers
-        response = requests.get(f"{self._api_url}/{endpoint}", headers=request_header, params=params)
-        return response
+        url = f"{self._api_url}/{endpoint}"
+        return self._send("GET", endpoint, url, lambda: self._transport.get(url, headers=request_header, params=params, timeout=self._timeout))
 
     def post(
         self,
@@ -89,8 +368,8 @@ class APIClient:
         log.check_notnone(endpoint)
         log.check_ne(endpoint, "")
         request_header = self._headers if headers is None else headers
-        response = requests.post(f"{self._api_url}/{endpoint}", headers=request_header, json=data)
-        return response
+        url = f"{self._api_url}/{endpoint}"
+        return self._send("POST", endpoint, url, lambda: self._transport.post(url, headers=request_header, json=data, timeout=self._timeout))
 
     def put(
         self,
@@ -101,8 +380,8 @@ class APIClient:
         log.check_notnone(endpoint)
         log.check_ne(endpoint, "")
         request_header = self._headers if headers is None else headers
-        response = requests.put(f"{self._api_url}/{endpoint}", headers=request_header, json=data)
-        return response
+        url = f"{self._api_url}/{endpoint}"
+        return self._send("PUT", endpoint, url, lambda: self._transport.put(url, headers=request_header, json=data, timeout=self._timeout))
 
     def put_file_presigned_url(self, url: str, path: str) -> Response:
         log.check_notnone(url)
@@ -113,11 +392,19 @@ class APIClient:
         log.check(os.access(path, os.R_OK), f"{path} isn't readable")
 
         try:
-            response = requests.put(
-                url,
-                data=open(path, "rb"),
-                headers={"Content-Type": self._get_content_type_by_filename(path)},
-            )
+            headers = {"Content-Type": self._get_content_type_by_filename(path)}
+            with _FileBody(path, self._rate_limiter.byte_bucket) as body:
+                # sendfile needs the raw socket, so neither TLS nor a byte limit that paces the chunks.
+                use_sendfile = (
+                    self._use_sendfile and self._transport.supports_sendfile and body.byte_bucket is None and urlsplit(url).scheme == "http"
+                )
+
+                def send() -> Response:
+                    if use_sendfile:
+                        return self._put_with_sendfile(url, body, headers)
+                    return self._transport.put(url, data=body, headers=headers, timeout=self._timeout)
+
+                response = self._send("PUT", _PRESIGNED_ENDPOINT, url, send, request_bytes=len(body), reader=body)
             return response
         except requests.exceptions.RequestException as e:
             log.error(f"HTTP error in uploading a file to presigned URL: {e}")
@@ -126,6 +413,24 @@ class APIClient:
                 status_code=e.response.status_code if e.response else None,
             )
 
+    def put_data_presigned_url(self, url: str, data: bytes, content_type: str) -> Response:
+        """Uploads a body held in memory, e.g. an encoded audio, to the presigned URL."""
+        log.check_notnone(url)
+        log.check_ne(url, "")
+        log.check_notnone(data)
+
+        try:
+            headers = {"Content-Type": content_type}
+            body = _BytesBody(data, self._rate_limiter.byte_bucket)
+            send = lambda: self._transport.put(url, data=body, headers=headers, timeout=self._timeout)
+            return self._send("PUT", _PRESIGNED_ENDPOINT, url, send, request_bytes=len(body))
+        except requests.exceptions.RequestException as e:
+            log.error(f"HTTP error in uploading data to presigned URL: {e}")
+            raise HTTPError(
+                f"Failed to Upload {len(data)} bytes: {e}",
+                status_code=e.response.status_code if e.response else None,
+            )
+
     def put_json_presigned_url(self, url: str, data: Dict[str, Any], headers: Optional[Dict[str, str]] = None) -> Response:
         log.check_notnone(url)
         log.check_ne(url, "")
@@ -139,8 +444,7 @@ class APIClient:
                 log.debug(f"{key}: {value}")
 
         try:
-            response = requests.put(url, json=data, headers=headers)
-            return response
+            return self._send("PUT", _PRESIGNED_ENDPOINT, url, lambda: self._transport.put(url, json=data, headers=headers, timeout=self._timeout))
         except requests.exceptions.RequestException as e:
             log.error(f"HTTP error in uploading a json to presigned url: {e}")
             raise HTTPError(
@@ -148,6 +452,152 @@ class APIClient:
                 status_code=e.response.status_code if e.response else None,
             )
 
+    def _put_with_sendfile(self, url: str, body: _FileBody, headers: Dict[str, str]) -> Response:
+        """PUTs the file body with socket.sendfile() on a connection of its own.
+        Failures are raised as requests exceptions, like the ones of the requests transport.
+        """
+        parts = urlsplit(url)
+        target = parts.path or "/"
+        if parts.query:
+            target += "?" + parts.query
+        connect_timeout, read_timeout = self._timeout
+        connection = http.client.HTTPConnection(parts.hostname or "", parts.port, timeout=connect_timeout)
+        try:
+            start = time.perf_counter()
+            connection.connect()
+            assert connection.sock is not None
+            connection.sock.settimeout(read_timeout)
+            connection.putrequest("PUT", target, skip_accept_encoding=True)
+            for key, value in headers.items():
+                connection.putheader(key, value)
+            connection.putheader("Content-Length", str(len(body)))
+            connection.endheaders()
+            if len(body) > 0:
+                connection.sock.sendfile(body.file, 0, len(body))
+            raw = connection.getresponse()
+            elapsed = time.perf_counter() - start
+            return build_response(url, raw.status, dict(raw.getheaders()), raw.read(), elapsed, raw.reason)
+        except socket.timeout as e:
+            raise requests.exceptions.Timeout(e)
+        except (OSError, http.client.HTTPException) as e:
+            raise requests.exceptions.ConnectionError(e)
+        finally:
+            connection.close()
+
+    def _verify(self) -> None:
+        """Runs the version check in a helper thread while verifying the API key, then caches the success."""
+        self._local.verifying = True
+        try:
+            with ThreadPoolExecutor(max_workers=1, thread_name_prefix="podonos-init") as executor:
+                version_check = executor.submit(self._verifying, self._check_minimum_version)
+                try:
+                    response = self.get("customers/verify/api-key")
+                finally:
+                    # A version error comes first, as the upgrade would also be needed with a valid key.
+                    version_check.result()
+        finally:
+            self._local.verifying = False
+        if response.text != "true":
+            raise ValueError(TerminalColor.FAIL + f"Invalid API key: {self._api_key}" + TerminalColor.ENDC)
+        if self._init_cache is not None:
+            self._init_cache.put(self._api_key, self._api_url, self._get_podonos_version())
+
+    def _verifying(self, check: Callable[[], Any]) -> Any:
+        self._local.verifying = True
+        try:
+            return check()
+        finally:
+            self._local.verifying = False
+
+    def _verify_pending(self) -> None:
+        """Runs the deferred checks if no request has run them yet. Failed checks run again on the next request."""
+        with self._verification_lock:
+            if not self._verification_pending:
+                return
+            self._verify()
+            self._verification_pending = False
+
+    def _send(
+        self,
+        method: str,
+        endpoint: str,
+        url: str,
+        send: Callable[[], Response],
+        request_bytes: Optional[int] = None,
+        reader: Optional[_UploadBody] = None,
+    ) -> Response:
+        """Sends one HTTP request within the rate limits. Emits a span with the endpoint, byte counts, status
+        and timing phases if a trace hook is installed.
+        """
+        if self._verification_pending and not getattr(self._local, "verifying", False):
+            self._verify_pending()
+        if not self._tracer.enabled:
+            response, retries, _ = self._send_rate_limited(endpoint, send)
+            setattr(response, _RETRIES_ATTRIBUTE, retries)
+            return response
+
+        with self._tracer.span(f"HTTP {method}", **{"http.method": method, "http.route": _normalize_route(endpoint)}) as span:
+            host = urlsplit(url).hostname or ""
+            span.set_attribute("http.host", host)
+
+            start = time.perf_counter()
+            response, retries, waited = self._send_rate_limited(endpoint, send)
+            total = time.perf_counter() - start
+            span.set_attribute("retry_count", retries)
+            setattr(response, _RETRIES_ATTRIBUTE, retries)
+            if waited > 0:
+                span.add_phase("rate_limit_wait", waited)
+            self._record_response(span, response, total, request_bytes, reader)
+            return response
+
+    def _send_rate_limited(self, endpoint: str, send: Callable[[], Response]) -> Tuple[Response, int, float]:
+        """Calls send() once its endpoint class has a permit, and again after a 429 response up to the retry limit.
+
+        Returns:
+            The last response, the number of retries and the seconds spent waiting for permits.
+        """
+        endpoint_class = _endpoint_class(endpoint)
+        retries = 0
+        waited = 0.0
+        while True:
+            waited += self._rate_limiter.acquire(endpoint_class)
+            response = send()
+            if response.status_code != HTTP_TOO_MANY_REQUESTS:
+                self._rate_limiter.on_response(endpoint_class, response.status_code)
+                return response, retries, waited
+
+            retry_after = parse_retry_after(response.headers.get("Retry-After"))
+            self._rate_limiter.on_response(endpoint_class, response.status_code, retry_after)
+            if retries >= self._rate_limiter.max_retries:
+                return response, retries, waited
+            retries += 1
+
+    @staticmethod
+    def _record_response(
+        span: Span,
+        response: Response,
+        total: float,
+        request_bytes: Optional[int],
+        reader: Optional[_UploadBody],
+    ) -> None:
+        span.set_attribute("http.status_code", response.status_code)
+        if request_bytes is None:
+            body = response.request.body if response.request is not None else None
+            request_bytes = len(body) if isinstance(body, (bytes, str)) else 0
+        span.set_attribute("http.request_bytes", request_bytes)
+        span.set_attribute("http.response_bytes", len(response.content or b""))
+
+        # response.elapsed covers sending the request until the response headers are parsed.
+        elapsed = response.elapsed.total_seconds()
+        send_and_wait = elapsed
+        if reader is not None:
+            # Reading the body from the disk happens while sending, so split it out of the wait.
+            span.add_phase("disk_read", reader.read_time)
+            send_and_wait = max(elapsed - reader.read_time, 0.0)
+        span.add_phase("send_and_wait", send_and_wait)
+        span.add_phase("read_response", max(total - elapsed, 0.0))
+        span.add_phase("total", total)
+
     @staticmethod
     def _get_content_type_by_filename(path: str) -> str:
         log.check_notnone(path)
@@ -157,6 +607,8 @@ class APIClient:
             return "audio/wav"
         elif ext == ".mp3":
             return "audio/mpeg"
+        elif ext == ".flac":
+            return "audio/flac"
         elif ext == ".json":
             return "application/json"
         return "application/octet-stream"
@@ -1,21 +1,103 @@
+import io
 import os
 import soundfile as sf
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Tuple, Optional, Dict, Any, List
+from typing import Any, BinaryIO, Callable, Dict, List, Optional, Tuple, Union
 
 from podonos.common.enum import QuestionFileType
 from podonos.core.base import *
+from podonos.core.profiler import profile_phase
 from podonos.errors.error import InvalidFileError
 
 
+# Content type by the soundfile format of an encoded audio.
+_CONTENT_TYPES = {"WAV": "audio/wav", "WAVEX": "audio/wav", "FLAC": "audio/flac", "MP3": "audio/mpeg", "OGG": "audio/ogg"}
+# Subtype of the WAV encoding of an array by its dtype. The other dtypes are written as float.
+_WAV_SUBTYPES = {"int16": "PCM_16", "int32": "PCM_32", "float64": "DOUBLE"}
+
+
+@dataclass
+class AudioBuffer:
+    """Encoded audio held in memory, with its metadata. Uploaded as it is, without going through the disk."""
+
+    # Bytes-like object with the encoded audio.
+    data: Any
+    content_type: str
+    nchannels: int
+    framerate: int
+    duration_in_ms: int
+    # Frees the memory behind data, e.g. a shared memory segment. Called once the upload is done.
+    on_release: Optional[Callable[[], None]] = None
+
+    @property
+    def size(self) -> int:
+        return memoryview(self.data).nbytes
+
+    def release(self) -> None:
+        if self.on_release is not None:
+            on_release, self.on_release = self.on_release, None
+            on_release()
+
+    @staticmethod
+    def from_bytes(data: Any) -> "AudioBuffer":
+        """Reads the metadata of an encoded audio, e.g. the content of a wav, flac or mp3 file."""
+        info = sf.info(io.BytesIO(data))
+        return AudioBuffer(
+            data=data,
+            content_type=_CONTENT_TYPES.get(info.format, "application/octet-stream"),
+            nchannels=info.channels,
+            framerate=info.samplerate,
+            duration_in_ms=int(info.frames * 1000.0 / float(info.samplerate)),
+        )
+
+    @staticmethod
+    def from_array(samples: Any, samplerate: int) -> "AudioBuffer":
+        """Encodes a NumPy array of frames, or frames x channels, to wav. The metadata comes from the shape."""
+        log.check_gt(samplerate, 0)
+        log.check(samples.ndim in (1, 2), f"samples must be frames or frames x channels: {samples.shape}")
+        nframes = samples.shape[0]
+        nchannels = 1 if samples.ndim == 1 else samples.shape[1]
+        buffer = io.BytesIO()
+        sf.write(buffer, samples, samplerate, format="WAV", subtype=_WAV_SUBTYPES.get(samples.dtype.name, "FLOAT"))
+        return AudioBuffer(
+            # A view of the encoded bytes, not a copy.
+            data=buffer.getbuffer(),
+            content_type="audio/wav",
+            nchannels=nchannels,
+            framerate=samplerate,
+            duration_in_ms=int(nframes * 1000.0 / float(samplerate)),
+        )
+
+
+# What File accepts besides a path: encoded audio as bytes or a binary stream, or a (samples, samplerate) pair.
+AudioSource = Union[bytes, bytearray, memoryview, BinaryIO, Tuple[Any, int]]
+
+
+def load_audio_source(source: AudioSource) -> AudioBuffer:
+    if isinstance(source, tuple):
+        samples, samplerate = source
+        return AudioBuffer.from_array(samples, samplerate)
+    if isinstance(source, io.BytesIO):
+        # A copy, as a view would keep the caller from writing to the stream again.
+        return AudioBuffer.from_bytes(source.getvalue())
+    if hasattr(source, "read"):
+        return AudioBuffer.from_bytes(source.read())  # type: ignore[union-attr]
+    return AudioBuffer.from_bytes(source)
+
+
 class AudioMeta:
     _nchannels: int
     _framerate: int
     _duration_in_ms: int
 
-    def __init__(self, path: str) -> None:
+    def __init__(self, path: str, buffer: Optional[AudioBuffer] = None) -> None:
         log.check_notnone(path)
-        self._nchannels, self._framerate, self._duration_in_ms = self._set_audio_meta(path)
+        if buffer is not None:
+            self._nchannels, self._framerate, self._duration_in_ms = buffer.nchannels, buffer.framerate, buffer.duration_in_ms
+        else:
+            with profile_phase("probe_metadata"):
+                self._nchannels, self._framerate, self._duration_in_ms = self._set_audio_meta(path)
         log.check_gt(self._nchannels, 0)
         log.check_gt(self._framerate, 0)
         log.check_gt(self._duration_in_ms, 0)
@@ -100,6 +182,12 @@ class Audio:
     _group: Optional[str] = None
     _type: QuestionFileType = QuestionFileType.STIMULUS
     _order_in_group: int = 0
+    # Format and metadata of what was uploaded, if the upload transform re-encoded the file. See podonos.core.transform.
+    _transmitted: Optional[Dict[str, Any]] = None
+    # Bundle holding the file, and where in it, if the file was uploaded in a bundle. See podonos.core.bundling.
+    _bundle: Optional[Dict[str, Any]] = None
+    # Encoded audio to upload instead of the file at the path. The path is only a name then.
+    _buffer: Optional[AudioBuffer] = None
 
     def __init__(
         self,
@@ -113,11 +201,13 @@ class Audio:
         group: Optional[str],
         type: QuestionFileType,
         order_in_group: int,
+        buffer: Optional[AudioBuffer] = None,
     ) -> None:
         log.check_notnone(path)
         log.check_ne(path, "")
-        log.check(os.path.isfile(path), f"{path} doesn't exist")
-        log.check(os.access(path, os.R_OK), f"{path} isn't readable")
+        if buffer is None:
+            log.check(os.path.isfile(path), f"{path} doesn't exist")
+            log.check(os.access(path, os.R_OK), f"{path} isn't readable")
         log.check_notnone(model_tag)
         log.check(model_tag, "")
         log.check_notnone(name)
@@ -128,7 +218,8 @@ class Audio:
         self._name = name
         self._remote_object_name = remote_object_name
         self._script = script
-        self._metadata = AudioMeta(path)
+        self._buffer = buffer
+        self._metadata = AudioMeta(path, buffer)
         self._model_tag = model_tag
         self._is_ref = is_ref
         self._tags = tags
@@ -172,6 +263,10 @@ class Audio:
     def metadata(self) -> AudioMeta:
         return self._metadata
 
+    @property
+    def buffer(self) -> Optional[AudioBuffer]:
+        return self._buffer
+
     @property
     def type(self) -> QuestionFileType:
         return self._type
@@ -189,7 +284,16 @@ class Audio:
         self._upload_start_at = start_at
         self._upload_finish_at = finish_at
 
+    def set_transmitted(self, transmitted: Optional[Dict[str, Any]]) -> None:
+        self._transmitted = transmitted
+
+    def set_bundle(self, bundle: Optional[Dict[str, Any]]) -> None:
+        self._bundle = bundle
+
     def to_dict(self) -> Dict[str, Any]:
+        """nchannels, framerate and duration_in_ms are of the original file. transmitted is None unless the file
+        was transformed before the upload. bundle is None unless the file was uploaded in a bundle.
+        """
         return {
             "name": self._name,
             "remote_name": self._remote_object_name,
@@ -205,6 +309,8 @@ class Audio:
             "script": self._script,
             "group": self._group,
             "order_in_group": self._order_in_group,
+            "transmitted": self._transmitted,
+            "bundle": self._bundle,
         }
 
     def to_create_file_dict(self) -> Dict[str, Any]:
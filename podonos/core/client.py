@@ -1,3 +1,4 @@
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any, Dict, Optional, List
 
 from requests import HTTPError
@@ -6,11 +7,16 @@ from podonos.common.enum import EvalType
 from podonos.core.api import APIClient
 from podonos.core.base import *
 from podonos.core.config import EvalConfig, EvalConfigDefault
+from podonos.core.distributed import Shard, ShardToken
 from podonos.core.evaluation import Evaluation
 from podonos.core.evaluator import Evaluator
+from podonos.core.rate_limit import HTTP_TOO_MANY_REQUESTS
 from podonos.core.stimulus_stats import StimulusStats
+from podonos.core.transform import UploadTransform
+from podonos.core.upload_engine import UploadEngine
 from podonos.evaluators.double_stimuli_evaluator import DoubleStimuliEvaluator
 from podonos.evaluators.single_stimulus_evaluator import SingleStimulusEvaluator
+from podonos.errors.error import EvaluatorsCreationError
 
 
 class Client:
@@ -18,11 +24,27 @@ class Client:
 
     _api_client: APIClient
     _initialized: bool = False
+    # Upload workers shared by all the evaluators of this client. Lazy initialization on the first evaluator.
+    _upload_engine: Optional[UploadEngine] = None
+    _max_upload_workers: int = EvalConfigDefault.MAX_UPLOAD_WORKERS
+    _upload_processes: int = 0
+    # Whether the server has the bulk endpoint of evaluations. Unknown until the first create_evaluators().
+    _bulk_create_supported: bool = True
 
-    def __init__(self, api_client: APIClient):
+    def __init__(self, api_client: APIClient, max_upload_workers: int = EvalConfigDefault.MAX_UPLOAD_WORKERS, upload_processes: int = 0):
+        log.check_gt(max_upload_workers, 0)
+        log.check_ge(upload_processes, 0)
         self._api_client = api_client
+        self._max_upload_workers = max_upload_workers
+        self._upload_processes = upload_processes
+        self._upload_engine = None
         self._initialized = True
 
+    def _get_upload_engine(self) -> UploadEngine:
+        if self._upload_engine is None:
+            self._upload_engine = UploadEngine(self._api_client, self._max_upload_workers, self._upload_processes)
+        return self._upload_engine
+
     def create_evaluator(
         self,
         name: Optional[str] = None,
@@ -35,6 +57,14 @@ class Client:
         use_annotation: bool = EvalConfigDefault.USE_ANNOTATION,
         auto_start: bool = EvalConfigDefault.AUTO_START,
         max_upload_workers: int = EvalConfigDefault.MAX_UPLOAD_WORKERS,
+        adaptive_upload_workers: bool = EvalConfigDefault.ADAPTIVE_UPLOAD_WORKERS,
+        upload_scheduling: str = EvalConfigDefault.UPLOAD_SCHEDULING,
+        hedge_uploads: bool = EvalConfigDefault.HEDGE_UPLOADS,
+        upload_transform: Optional[UploadTransform] = None,
+        upload_bundle_bytes: Optional[int] = None,
+        key_layout: str = EvalConfigDefault.KEY_LAYOUT,
+        defer_evaluation_creation: bool = EvalConfigDefault.DEFER_EVALUATION_CREATION,
+        session_json_parts: int = EvalConfigDefault.SESSION_JSON_PARTS,
     ) -> Evaluator:
         """Creates a new evaluator with a unique evaluation session ID.
         For the language code, see https://docs.dyspatch.io/localization/supported_languages/
@@ -50,7 +80,28 @@ class Client:
                         Must be >= 12. Default: 12.
             use_annotation: Enable detailed annotation on script for detailed rating reasoning.
             auto_start: The evaluation start automatically if True. Otherwise, manually start in the workspace.
-            max_upload_workers: The maximum number of upload workers. Must be a positive integer. Default: 20
+            max_upload_workers: The maximum number of in-flight uploads of this evaluator. Must be a positive integer.
+                        The evaluators of a client share its upload workers, so the client's limit also applies. Default: 20
+            adaptive_upload_workers: Adjusts the number of in-flight uploads at runtime by the observed throughput,
+                        latency and error rate. max_upload_workers is the ceiling. Default: False
+            upload_scheduling: Order of uploading the files. One of {"fifo", "largest_first", "group_atomic"}.
+                        See podonos.core.scheduling. Default: fifo
+            hedge_uploads: Starts a second attempt of an upload running past the 95th percentile of similar-sized
+                        uploads, and keeps whichever finishes first. Default: False
+            upload_transform: Re-encodes each file to FLAC before the upload, optionally downmixed to mono and
+                        resampled, on a process pool. Needs NumPy, and a script guarded by if __name__ == "__main__".
+                        See podonos.core.transform. Default: None
+            upload_bundle_bytes: Packs the files into uncompressed tar bundles of up to this many bytes, and uploads
+                        the bundles instead of each file. Saves the per-object cost of many short clips. Files of half
+                        of it or more are uploaded alone. See podonos.core.bundling. Default: None
+            key_layout: Layout of the remote object names of the files. One of {"flat", "hash_prefix"}. hash_prefix
+                        spreads the uploads over the partitions of the object store. See podonos.core.key_layout.
+                        Default: flat
+            defer_evaluation_creation: Creates the evaluation in the background, so that this returns at once and
+                        add_file() starts probing files. The uploads wait for the evaluation id when they need it,
+                        and get_evaluation_id() and close() raise a failed creation. Default: False
+            session_json_parts: Uploads session.json as this many part files in parallel, plus a small index, for
+                        evaluations of very many files. See podonos.core.session_parts. Default: 1, in one piece
 
         Returns:
             Evaluator instance.
@@ -59,14 +110,7 @@ class Client:
             ValueError: if this function is called before calling init().
         """
 
-        if not self._initialized:
-            raise ValueError("This function is called before initialization.")
-
-        if not EvalType.is_eval_type(type):
-            raise ValueError("Not supported evaluation types. Use one of the "
-                             "{'NMOS', 'QMOS', 'P808', 'SMOS', 'PREF'}")
-
-        eval_config = EvalConfig(
+        eval_config = self._new_eval_config(
             name=name,
             desc=desc,
             type=type,
@@ -77,23 +121,169 @@ class Client:
             use_annotation=use_annotation,
             auto_start=auto_start,
             max_upload_workers=max_upload_workers,
+            adaptive_upload_workers=adaptive_upload_workers,
+            upload_scheduling=upload_scheduling,
+            hedge_uploads=hedge_uploads,
+            upload_transform=upload_transform,
+            upload_bundle_bytes=upload_bundle_bytes,
+            key_layout=key_layout,
+            defer_evaluation_creation=defer_evaluation_creation,
+            session_json_parts=session_json_parts,
         )
+        return self._new_evaluator(eval_config)
+
+    def create_evaluators(self, configs: List[Dict[str, Any]], max_concurrency: int = 8) -> List[Evaluator]:
+        """Creates many evaluators at once, e.g. one per model checkpoint and language.
+        The evaluations are created in one request to the bulk endpoint if the server has it, otherwise by concurrent
+        requests over the pooled connections. The evaluators share the upload workers of this client.
+
+        Args:
+            configs: Arguments of create_evaluator() for each evaluator, e.g. [{"name": "ckpt1", "lan": "en-us"}].
+            max_concurrency: The maximum number of creation requests in flight without the bulk endpoint. Default: 8
+
+        Returns:
+            Evaluators in the order of the configs.
+
+        Raises:
+            ValueError: if this function is called before calling init(), or a config is invalid.
+            HTTPError: if the evaluations fail to be created in bulk.
+            EvaluatorsCreationError: if some evaluations fail to be created one by one. It holds the evaluators
+                        created, so that they can be used or closed.
+        """
+        log.check_gt(max_concurrency, 0)
+        # Every config is validated before the first request.
+        eval_configs = [self._new_eval_config(**config) for config in configs]
+        if not eval_configs:
+            return []
+
+        evaluations = self._create_evaluations_in_bulk(eval_configs)
+        if evaluations is not None:
+            return [self._new_evaluator(eval_config, evaluation) for eval_config, evaluation in zip(eval_configs, evaluations)]
+
+        num_threads = min(max_concurrency, len(eval_configs))
+        # Created here, as the lazy initialization isn't thread-safe.
+        self._get_upload_engine()
+        self._api_client.enable_connection_pool(num_threads)
+        with ThreadPoolExecutor(max_workers=num_threads, thread_name_prefix="podonos-create") as executor:
+            futures = [executor.submit(self._new_evaluator, eval_config) for eval_config in eval_configs]
+        errors = {index: future.exception() for index, future in enumerate(futures) if future.exception() is not None}
+        if errors:
+            evaluators = [future.result() if index not in errors else None for index, future in enumerate(futures)]
+            created = [evaluator.get_evaluation_id() for evaluator in evaluators if evaluator is not None]
+            log.warning(f"Failed to create {len(errors)} of {len(futures)} evaluations. Created: {created}")
+            raise EvaluatorsCreationError(
+                f"Failed to create {len(errors)} of {len(futures)} evaluations: {next(iter(errors.values()))}",
+                evaluators=evaluators,
+                errors=errors,
+            )
+        return [future.result() for future in futures]
+
+    def join_evaluation(
+        self,
+        token: str,
+        shard_id: str,
+        manifest_path: str,
+        max_upload_workers: int = EvalConfigDefault.MAX_UPLOAD_WORKERS,
+        adaptive_upload_workers: bool = EvalConfigDefault.ADAPTIVE_UPLOAD_WORKERS,
+        upload_scheduling: str = EvalConfigDefault.UPLOAD_SCHEDULING,
+        hedge_uploads: bool = EvalConfigDefault.HEDGE_UPLOADS,
+        upload_transform: Optional[UploadTransform] = None,
+        upload_bundle_bytes: Optional[int] = None,
+    ) -> Evaluator:
+        """Joins the evaluation of a coordinator as one of the nodes adding its files.
+        The files are uploaded by this node. Its close() writes a manifest of them to manifest_path instead of
+        finalizing the evaluation, and the coordinator merges the manifests with add_shard_manifests() before its close().
+        See podonos.core.distributed.
+
+        Args:
+            token: The token of Evaluator.get_shard_token() of the coordinator.
+            shard_id: Unique id of this node among the nodes, e.g. the hostname or the rank.
+            manifest_path: Path to write the manifest to, readable by the coordinator.
+            max_upload_workers: See create_evaluator().
+            adaptive_upload_workers: See create_evaluator().
+            upload_scheduling: See create_evaluator().
+            hedge_uploads: See create_evaluator().
+            upload_transform: See create_evaluator().
+            upload_bundle_bytes: See create_evaluator().
+
+        Returns:
+            Evaluator instance of this node.
+
+        Raises:
+            ValueError: if this function is called before calling init(), or the token is invalid.
+        """
+        if not shard_id:
+            raise ValueError('"shard_id" must not be empty.')
+        shard_token = ShardToken.decode(token)
+        eval_config = self._new_eval_config(
+            **shard_token.config,
+            max_upload_workers=max_upload_workers,
+            adaptive_upload_workers=adaptive_upload_workers,
+            upload_scheduling=upload_scheduling,
+            hedge_uploads=hedge_uploads,
+            upload_transform=upload_transform,
+            upload_bundle_bytes=upload_bundle_bytes,
+        )
+        # The remote object names of every node share the prefix of the coordinator.
+        eval_config.eval_creation_timestamp = shard_token.eval_creation_timestamp
+        eval_config.eval_id = shard_token.eval_creation_timestamp
+        return self._new_evaluator(eval_config, Evaluation.from_dict(shard_token.evaluation), Shard(shard_id, manifest_path))
+
+    def _new_eval_config(self, **kwargs: Any) -> EvalConfig:
+        if not self._initialized:
+            raise ValueError("This function is called before initialization.")
+
+        if not EvalType.is_eval_type(kwargs.get("type", EvalConfigDefault.TYPE.value)):
+            raise ValueError("Not supported evaluation types. Use one of the "
+                             "{'NMOS', 'QMOS', 'P808', 'SMOS', 'PREF'}")
+        return EvalConfig(**kwargs)
+
+    def _new_evaluator(self, eval_config: EvalConfig, evaluation: Optional[Evaluation] = None, shard: Optional[Shard] = None) -> Evaluator:
+        """Creates the evaluator of the config. It creates its evaluation unless given one."""
         evaluator = None
-        if type in [EvalType.SMOS.value, EvalType.PREF.value]:
+        if eval_config.eval_type in [EvalType.SMOS, EvalType.PREF]:
             evaluator = DoubleStimuliEvaluator(
                 supported_evaluation_types=[EvalType.SMOS, EvalType.PREF],
                 api_client=self._api_client,
                 eval_config=eval_config,
+                upload_engine=self._get_upload_engine(),
+                evaluation=evaluation,
+                shard=shard,
             )
         else:
             evaluator = SingleStimulusEvaluator(
                 supported_evaluation_types=[EvalType.NMOS, EvalType.QMOS, EvalType.P808],
                 api_client=self._api_client,
                 eval_config=eval_config,
+                upload_engine=self._get_upload_engine(),
+                evaluation=evaluation,
+                shard=shard,
             )
         log.check(isinstance(evaluator, Evaluator))
         return evaluator
 
+    def _create_evaluations_in_bulk(self, eval_configs: List[EvalConfig]) -> Optional[List[Evaluation]]:
+        """Creates the evaluations in one request. None if the server has no bulk endpoint."""
+        if not self._bulk_create_supported:
+            return None
+        try:
+            response = self._api_client.post("evaluations/bulk", {"evaluations": [config.to_create_request_dto() for config in eval_configs]})
+            # A server without the route may answer with any client error, e.g. 422 when it takes "bulk" for an id.
+            # Creating them one by one then reports the error of each config, if any. Not tried again on this client.
+            if 400 <= response.status_code < 500 and response.status_code != HTTP_TOO_MANY_REQUESTS:
+                log.debug(f"No bulk endpoint of evaluations ({response.status_code}). Creates them one by one")
+                self._bulk_create_supported = False
+                return None
+            response.raise_for_status()
+            evaluations = [Evaluation.from_dict(evaluation) for evaluation in response.json()]
+        except Exception as e:
+            raise HTTPError(f"Failed to create the evaluations: {e}")
+        if len(evaluations) != len(eval_configs):
+            raise HTTPError(f"Created {len(evaluations)} evaluations for {len(eval_configs)} configs")
+        for evaluation in evaluations:
+            log.info(f"Evaluation is generated: {evaluation.id}")
+        return evaluations
+
     def get_evaluation_list(self) -> List[Dict[str, Any]]:
         """Gets a list of evaluations.
 
@@ -0,0 +1,197 @@
+import math
+import threading
+import time
+
+from typing import List, Optional
+
+from podonos.core.base import *
+
+# Gain of throughput over the best window that shows the uplink scales with the uploads.
+_SCALING_GAIN = 1.5
+
+
+class ConcurrencyLimiter:
+    """Caps the number of in-flight uploads. The upload workers acquire a permit before taking a file
+    from the queue, and release it with the outcome once the file is done.
+    """
+
+    _lock: threading.Lock
+    _condition: threading.Condition
+    _limit: int
+    _in_flight: int = 0
+
+    def __init__(self, limit: int) -> None:
+        log.check_gt(limit, 0)
+        self._lock = threading.Lock()
+        self._condition = threading.Condition(self._lock)
+        self._limit = limit
+        self._in_flight = 0
+
+    @property
+    def limit(self) -> int:
+        return self._limit
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    def acquire(self, timeout: Optional[float] = None) -> bool:
+        """Waits for a permit. Returns False on timeout."""
+        with self._condition:
+            if not self._condition.wait_for(lambda: self._in_flight < self._limit, timeout=timeout):
+                return False
+            self._in_flight += 1
+            return True
+
+    def cancel(self) -> None:
+        """Returns a permit that was not used, e.g. because the queue was empty."""
+        with self._condition:
+            self._in_flight -= 1
+            self._condition.notify()
+
+    def release(self, success: bool, latency: float, size: int) -> None:
+        """Returns a permit with the outcome of the upload.
+
+        Args:
+            success: True if the file was uploaded.
+            latency: Time from the presign start to the upload finish in seconds.
+            size: File size in bytes.
+        """
+        with self._condition:
+            self._in_flight -= 1
+            self._on_result(success, latency, size)
+            self._condition.notify_all()
+
+    def _on_result(self, success: bool, latency: float, size: int) -> None:
+        # Fixed limit. Called with the lock held.
+        pass
+
+
+class AIMDLimiter(ConcurrencyLimiter):
+    """Adaptive limit with additive increase and multiplicative decrease.
+
+    The limiter looks at windows of completed uploads, about one per permit. After each window it
+        - backs off by the decrease factor if the error rate exceeds max_error_rate,
+        - backs off if the time per byte grew beyond latency_tolerance times the best seen so far without a gain of
+          throughput, which means that the uplink is queueing rather than carrying more data,
+        - otherwise doubles the limit if the time per byte stayed flat, i.e. within flat_tolerance of the best, or if
+          the throughput grew by half, as the uplink has room for more uploads,
+        - and otherwise adds one permit.
+    Like TCP slow start, the limit doubles from the start. Unlike it, the limit doubles again on a link that doesn't
+    queue after a back-off, so that a fat pipe gets back to the ceiling within a few windows rather than a permit per
+    window. The window right after a back-off only adds one.
+    The limit stays within [min_limit, max_limit]. The configured max_upload_workers is the ceiling.
+    """
+
+    _min_limit: int
+    _max_limit: int
+    _decrease_factor: float
+    _latency_tolerance: float
+    _flat_tolerance: float
+    _max_error_rate: float
+    _throughput_tolerance: float
+    # Whether the last window backed off.
+    _decreased: bool = False
+    # Current window.
+    _window_start: float = 0.0
+    _window_bytes: int = 0
+    _window_latency: float = 0.0
+    _window_successes: int = 0
+    _window_failures: int = 0
+    # Best observations. The decay lets them follow a changing network.
+    _best_sec_per_byte: Optional[float] = None
+    _best_throughput: float = 0.0
+    _decay: float = 0.95
+    # Limits set after each window. For benchmarks and debugging.
+    _history: List[int]
+
+    def __init__(
+        self,
+        max_limit: int,
+        initial_limit: int = 2,
+        min_limit: int = 1,
+        decrease_factor: float = 0.7,
+        latency_tolerance: float = 2.0,
+        flat_tolerance: float = 1.25,
+        max_error_rate: float = 0.05,
+        throughput_tolerance: float = 0.05,
+    ) -> None:
+        log.check_ge(max_limit, min_limit)
+        log.check_gt(min_limit, 0)
+        log.check(0.0 < decrease_factor < 1.0, "decrease_factor must be in (0, 1)")
+        log.check_gt(latency_tolerance, 1.0)
+        log.check(1.0 <= flat_tolerance <= latency_tolerance, "flat_tolerance must be in [1, latency_tolerance]")
+        super().__init__(max(min_limit, min(initial_limit, max_limit)))
+        self._min_limit = min_limit
+        self._max_limit = max_limit
+        self._decrease_factor = decrease_factor
+        self._latency_tolerance = latency_tolerance
+        self._flat_tolerance = flat_tolerance
+        self._max_error_rate = max_error_rate
+        self._throughput_tolerance = throughput_tolerance
+        self._best_sec_per_byte = None
+        self._best_throughput = 0.0
+        self._decreased = False
+        self._history = [self._limit]
+        self._reset_window()
+
+    @property
+    def history(self) -> List[int]:
+        with self._lock:
+            return list(self._history)
+
+    def _reset_window(self) -> None:
+        self._window_start = time.monotonic()
+        self._window_bytes = 0
+        self._window_latency = 0.0
+        self._window_successes = 0
+        self._window_failures = 0
+
+    def _on_result(self, success: bool, latency: float, size: int) -> None:
+        if success:
+            self._window_successes += 1
+            self._window_bytes += size
+            self._window_latency += latency
+        else:
+            self._window_failures += 1
+
+        completed = self._window_successes + self._window_failures
+        if completed < max(self._limit, 2):
+            return
+
+        elapsed = max(time.monotonic() - self._window_start, 1e-6)
+        error_rate = self._window_failures / completed
+        throughput = self._window_bytes / elapsed
+        sec_per_byte = self._window_latency / self._window_bytes if self._window_bytes > 0 else None
+
+        # Time per byte against the best, 1 without a reference.
+        latency_ratio = 1.0
+        if sec_per_byte is not None and self._best_sec_per_byte is not None:
+            latency_ratio = sec_per_byte / self._best_sec_per_byte
+        gained = throughput > self._best_throughput * (1.0 + self._throughput_tolerance)
+        # The uplink carries more with more uploads, even if each takes longer, e.g. over capped connections.
+        scaling = throughput >= self._best_throughput * _SCALING_GAIN and latency_ratio <= self._latency_tolerance
+
+        decreased = self._decreased
+        self._decreased = False
+        if error_rate > self._max_error_rate:
+            self._decrease()
+        elif latency_ratio > self._latency_tolerance and not gained:
+            self._decrease()
+        elif (latency_ratio <= self._flat_tolerance or scaling) and not decreased:
+            self._limit = min(self._limit * 2, self._max_limit)
+        else:
+            self._limit = min(self._limit + 1, self._max_limit)
+
+        if sec_per_byte is not None:
+            if self._best_sec_per_byte is None or sec_per_byte < self._best_sec_per_byte:
+                self._best_sec_per_byte = sec_per_byte
+            else:
+                self._best_sec_per_byte /= self._decay
+        self._best_throughput = max(throughput, self._best_throughput * self._decay)
+        self._history.append(self._limit)
+        self._reset_window()
+
+    def _decrease(self) -> None:
+        self._decreased = True
+        self._limit = max(self._min_limit, int(math.floor(self._limit * self._decrease_factor)))
@@ -4,6 +4,9 @@ from typing import Any, Dict, Optional
 from podonos.core.base import *
 from podonos.common.constant import PODONOS_CONTACT_EMAIL
 from podonos.common.enum import EvalType, Language
+from podonos.core.key_layout import KEY_LAYOUT_FLAT, get_key_layouts
+from podonos.core.scheduling import SCHEDULING_FIFO, get_scheduling_policies
+from podonos.core.transform import UploadTransform
 
 
 class EvalConfigDefault:
@@ -15,6 +18,12 @@ class EvalConfigDefault:
     AUTO_START = False
     GRANULARITY = 1.0
     MAX_UPLOAD_WORKERS = 20
+    ADAPTIVE_UPLOAD_WORKERS = False
+    UPLOAD_SCHEDULING = SCHEDULING_FIFO
+    HEDGE_UPLOADS = False
+    KEY_LAYOUT = KEY_LAYOUT_FLAT
+    DEFER_EVALUATION_CREATION = False
+    SESSION_JSON_PARTS = 1
 
 
 class EvalConfig:
@@ -31,6 +40,14 @@ class EvalConfig:
     _eval_use_annotation: bool = False
     _eval_auto_start: bool = False
     _max_upload_workers: int = EvalConfigDefault.MAX_UPLOAD_WORKERS
+    _adaptive_upload_workers: bool = EvalConfigDefault.ADAPTIVE_UPLOAD_WORKERS
+    _upload_scheduling: str = EvalConfigDefault.UPLOAD_SCHEDULING
+    _hedge_uploads: bool = EvalConfigDefault.HEDGE_UPLOADS
+    _upload_transform: Optional[UploadTransform] = None
+    _upload_bundle_bytes: Optional[int] = None
+    _key_layout: str = EvalConfigDefault.KEY_LAYOUT
+    _defer_evaluation_creation: bool = EvalConfigDefault.DEFER_EVALUATION_CREATION
+    _session_json_parts: int = EvalConfigDefault.SESSION_JSON_PARTS
 
     def __init__(
         self,
@@ -44,6 +61,14 @@ class EvalConfig:
         use_annotation: bool = EvalConfigDefault.USE_ANNOTATION,
         auto_start: bool = EvalConfigDefault.AUTO_START,
         max_upload_workers: int = EvalConfigDefault.MAX_UPLOAD_WORKERS,
+        adaptive_upload_workers: bool = EvalConfigDefault.ADAPTIVE_UPLOAD_WORKERS,
+        upload_scheduling: str = EvalConfigDefault.UPLOAD_SCHEDULING,
+        hedge_uploads: bool = EvalConfigDefault.HEDGE_UPLOADS,
+        upload_transform: Optional[UploadTransform] = None,
+        upload_bundle_bytes: Optional[int] = None,
+        key_layout: str = EvalConfigDefault.KEY_LAYOUT,
+        defer_evaluation_creation: bool = EvalConfigDefault.DEFER_EVALUATION_CREATION,
+        session_json_parts: int = EvalConfigDefault.SESSION_JSON_PARTS,
     ) -> None:
         self._eval_name = self._valudate_eval_name(name)
         self._eval_description = desc
@@ -57,7 +82,15 @@ class EvalConfig:
         self._eval_id = self._eval_creation_timestamp
         self._eval_use_annotation = self._validate_eval_use_annotation(use_annotation, type)
         self._eval_auto_start = auto_start
-        self._max_upload_workers = max_upload_workers
+        self._max_upload_workers = self._validate_max_upload_workers(max_upload_workers)
+        self._adaptive_upload_workers = adaptive_upload_workers
+        self._upload_scheduling = self._validate_upload_scheduling(upload_scheduling)
+        self._hedge_uploads = hedge_uploads
+        self._upload_transform = upload_transform
+        self._upload_bundle_bytes = self._validate_upload_bundle_bytes(upload_bundle_bytes)
+        self._key_layout = self._validate_key_layout(key_layout)
+        self._defer_evaluation_creation = defer_evaluation_creation
+        self._session_json_parts = self._validate_session_json_parts(session_json_parts)
         self.log_eval_config()
 
     def log_eval_config(self) -> None:
@@ -71,6 +104,14 @@ class EvalConfig:
         log.debug(f"Evaluation use annotation: {self._eval_use_annotation}")
         log.debug(f"Evaluation auto start: {self._eval_auto_start}")
         log.debug(f"Max upload workers: {self._max_upload_workers}")
+        log.debug(f"Adaptive upload workers: {self._adaptive_upload_workers}")
+        log.debug(f"Upload scheduling: {self._upload_scheduling}")
+        log.debug(f"Hedge uploads: {self._hedge_uploads}")
+        log.debug(f"Upload transform: {self._upload_transform}")
+        log.debug(f"Upload bundle bytes: {self._upload_bundle_bytes}")
+        log.debug(f"Key layout: {self._key_layout}")
+        log.debug(f"Defer evaluation creation: {self._defer_evaluation_creation}")
+        log.debug(f"Session json parts: {self._session_json_parts}")
 
     @property
     def eval_id(self) -> str:
@@ -100,10 +141,46 @@ class EvalConfig:
     def max_upload_workers(self) -> int:
         return self._max_upload_workers
 
+    @property
+    def adaptive_upload_workers(self) -> bool:
+        return self._adaptive_upload_workers
+
+    @property
+    def upload_scheduling(self) -> str:
+        return self._upload_scheduling
+
+    @property
+    def hedge_uploads(self) -> bool:
+        return self._hedge_uploads
+
+    @property
+    def upload_transform(self) -> Optional[UploadTransform]:
+        return self._upload_transform
+
+    @property
+    def upload_bundle_bytes(self) -> Optional[int]:
+        return self._upload_bundle_bytes
+
+    @property
+    def key_layout(self) -> str:
+        return self._key_layout
+
+    @property
+    def defer_evaluation_creation(self) -> bool:
+        return self._defer_evaluation_creation
+
+    @property
+    def session_json_parts(self) -> int:
+        return self._session_json_parts
+
     @eval_id.setter
     def eval_id(self, eval_id: str) -> None:
         self._eval_id = eval_id
 
+    @eval_creation_timestamp.setter
+    def eval_creation_timestamp(self, eval_creation_timestamp: str) -> None:
+        self._eval_creation_timestamp = eval_creation_timestamp
+
     def _valudate_eval_name(self, eval_name: Optional[str]) -> str:
         if not eval_name:
             current = datetime.now()
@@ -161,6 +238,31 @@ class EvalConfig:
             raise ValueError(f'"granularity" must be one of 0.5 and 1.9')
         return granularity
 
+    def _validate_max_upload_workers(self, max_upload_workers: int) -> int:
+        if max_upload_workers < 1:
+            raise ValueError('"max_upload_workers" must be >= 1.')
+        return max_upload_workers
+
+    def _validate_upload_scheduling(self, upload_scheduling: str) -> str:
+        if upload_scheduling not in get_scheduling_policies():
+            raise ValueError(f'"upload_scheduling" must be one of {get_scheduling_policies()}.')
+        return upload_scheduling
+
+    def _validate_upload_bundle_bytes(self, upload_bundle_bytes: Optional[int]) -> Optional[int]:
+        if upload_bundle_bytes is not None and upload_bundle_bytes < 1:
+            raise ValueError('"upload_bundle_bytes" must be >= 1.')
+        return upload_bundle_bytes
+
+    def _validate_session_json_parts(self, session_json_parts: int) -> int:
+        if session_json_parts < 1:
+            raise ValueError('"session_json_parts" must be >= 1.')
+        return session_json_parts
+
+    def _validate_key_layout(self, key_layout: str) -> str:
+        if key_layout not in get_key_layouts():
+            raise ValueError(f'"key_layout" must be one of {get_key_layouts()}.')
+        return key_layout
+
     # TODO: allow floating point hours, e.g. 0.5.
     def _validate_eval_expected_due(self, due_hours: int) -> str:
         if due_hours < 12:
@@ -185,7 +287,7 @@ class EvalConfig:
         return eval_use_annotation
 
     def to_dict(self) -> Dict[str, Any]:
-        return {
+        config = {
             "eval_id": self._eval_id,
             "eval_name": self._eval_name,
             "eval_description": self._eval_description,
@@ -198,6 +300,24 @@ class EvalConfig:
             "eval_auto_start": self._eval_auto_start,
             "max_upload_workers": self._max_upload_workers,
         }
+        if self._key_layout != KEY_LAYOUT_FLAT:
+            # Only where the object names differ from the flat ones, which the server knows.
+            config["key_layout"] = self._key_layout
+        return config
+
+    def to_shard_config(self) -> Dict[str, Any]:
+        """Arguments of EvalConfig for the nodes contributing to this evaluation. See podonos.core.distributed."""
+        return {
+            "name": self._eval_name,
+            "desc": self._eval_description,
+            "type": self._eval_type.value,
+            "lan": self._eval_language.value,
+            "granularity": self._eval_granularity,
+            "num_eval": self._eval_num,
+            "use_annotation": self._eval_use_annotation,
+            "auto_start": self._eval_auto_start,
+            "key_layout": self._key_layout,
+        }
 
     def to_create_request_dto(self) -> Dict[str, Any]:
         return {
@@ -0,0 +1,108 @@
+"""
+Distributed ingestion: several nodes add the files of one evaluation.
+
+    # Coordinator
+    evaluator = client.create_evaluator(name="ckpt-42")
+    token = evaluator.get_shard_token()  # Handed to the nodes, e.g. as a job argument.
+
+    # Each node, with its own API key
+    shard = client.join_evaluation(token, shard_id="node-3", manifest_path="/shared/node-3.json")
+    shard.add_file(File(path="...", model_tag="ckpt-42"))
+    shard.close()  # Uploads the files, then writes the partial manifest.
+
+    # Coordinator, once every node is done
+    evaluator.add_shard_manifests(glob.glob("/shared/*.json"))
+    evaluator.close()  # Registers every file and uploads session.json, once.
+
+Each node uploads straight to the object store, so the ingest scales with the nodes. The close() of a node neither
+registers its files nor writes session.json. Its manifest carries their session.json entries and file records for
+the merge instead. The token holds the evaluation and its configuration, never an API key.
+"""
+
+import base64
+import binascii
+import json
+
+from dataclasses import dataclass, field
+from typing import Any, Dict, List
+
+SHARD_TOKEN_VERSION = 1
+SHARD_MANIFEST_VERSION = 1
+
+
+@dataclass
+class ShardToken:
+    """What a node needs to contribute to an evaluation. Passed around as the string of encode()."""
+
+    # Evaluation.to_dict() of the evaluation.
+    evaluation: Dict[str, Any]
+    # Arguments of EvalConfig. See EvalConfig.to_shard_config().
+    config: Dict[str, Any]
+    # Prefix of the remote object names of every node.
+    eval_creation_timestamp: str
+
+    def encode(self) -> str:
+        document = {
+            "version": SHARD_TOKEN_VERSION,
+            "evaluation": self.evaluation,
+            "config": self.config,
+            "eval_creation_timestamp": self.eval_creation_timestamp,
+        }
+        return base64.urlsafe_b64encode(json.dumps(document).encode("utf-8")).decode("ascii")
+
+    @staticmethod
+    def decode(token: str) -> "ShardToken":
+        try:
+            document = json.loads(base64.urlsafe_b64decode(token.encode("ascii")))
+            if document["version"] != SHARD_TOKEN_VERSION:
+                raise ValueError(f"Unsupported shard token version {document['version']}")
+            return ShardToken(document["evaluation"], document["config"], document["eval_creation_timestamp"])
+        except (binascii.Error, UnicodeError, ValueError, KeyError, TypeError) as e:
+            raise ValueError(f"Invalid shard token: {e}")
+
+
+@dataclass
+class Shard:
+    """The node side of an evaluator: its id among the nodes, and where its close() writes the manifest."""
+
+    shard_id: str
+    manifest_path: str
+
+
+@dataclass
+class ShardManifest:
+    """Files a node uploaded for an evaluation, merged into its session.json by the coordinator."""
+
+    evaluation_id: str
+    shard_id: str
+    # session.json entries, one list per add_file() or add_files() as in "files" of session.json.
+    audios: List[List[Dict[str, Any]]] = field(default_factory=list)
+    # Audio.to_create_file_dict() of every file, for the file registration.
+    files: List[Dict[str, Any]] = field(default_factory=list)
+    # Index of each bundle. See podonos.core.bundling.
+    bundles: List[Dict[str, Any]] = field(default_factory=list)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "version": SHARD_MANIFEST_VERSION,
+            "evaluation_id": self.evaluation_id,
+            "shard_id": self.shard_id,
+            "audios": self.audios,
+            "files": self.files,
+            "bundles": self.bundles,
+        }
+
+    @staticmethod
+    def from_dict(data: Dict[str, Any]) -> "ShardManifest":
+        if data.get("version") != SHARD_MANIFEST_VERSION:
+            raise ValueError(f"Unsupported shard manifest version {data.get('version')}")
+        return ShardManifest(data["evaluation_id"], data["shard_id"], data["audios"], data["files"], data["bundles"])
+
+    def save(self, path: str) -> None:
+        with open(path, "w") as f:
+            json.dump(self.to_dict(), f)
+
+    @staticmethod
+    def load(path: str) -> "ShardManifest":
+        with open(path, "r") as f:
+            return ShardManifest.from_dict(json.load(f))
@@ -1,7 +1,11 @@
 import os
 import requests
+import threading
+import time
 from abc import ABC, abstractmethod
-from typing import Tuple, Dict, List, Optional
+from concurrent.futures import Future
+from contextlib import contextmanager
+from typing import Any, Callable, Iterable, Tuple, Dict, List, Optional, Union
 
 from podonos.core.base import *
 from podonos.common.constant import *
@@ -9,11 +13,19 @@ from podonos.common.enum import EvalType, QuestionFileType
 from podonos.common.exception import HTTPError
 from podonos.common.util import generate_random_name
 from podonos.core.api import APIClient
-from podonos.core.audio import Audio
+from podonos.core.audio import Audio, AudioBuffer
 from podonos.core.config import EvalConfig
+from podonos.core.distributed import Shard, ShardManifest, ShardToken
 from podonos.core.evaluation import Evaluation
 from podonos.core.file import File
+from podonos.core.key_layout import get_key_layout
+from podonos.core.metrics import UploadMetrics, UploadMetricsSnapshot
+from podonos.core.profiler import get_profiler, profile_phase
 from podonos.core.query import Query
+from podonos.core.report import UploadRecord, build_upload_report, upload_wall_time
+from podonos.core.session_parts import SESSION_JSON_NAME, SESSION_PART_CONTENT_TYPE, split_session_json
+from podonos.core.tracing import new_trace_id, trace_context
+from podonos.core.upload_engine import UploadEngine
 from podonos.core.upload_manager import UploadManager
 
 
@@ -26,9 +38,29 @@ class Evaluator(ABC):
     _eval_config: Optional[EvalConfig] = None
     _supported_evaluation_types: List[EvalType]
     _evaluation: Optional[Evaluation] = None
+    # Id of the evaluation being created in the background. See EvalConfig.defer_evaluation_creation.
+    _evaluation_id_future: Optional["Future[str]"] = None
 
     # Upload manager. Lazy initialization when used for saving resources.
     _upload_manager: Optional[UploadManager] = None
+    # Upload workers shared with the other evaluators of the Client. If None, the upload manager runs its own.
+    _upload_engine: Optional[UploadEngine] = None
+    # Upload metrics. Outlives the upload manager so that users can poll it before the first file and after close.
+    _upload_metrics: Optional[UploadMetrics] = None
+    # Trace id shared by every span of this evaluation session.
+    _trace_id: Optional[str] = None
+    # Wall time of each close() phase in seconds.
+    _close_phases_sec: Dict[str, float] = {}
+    # Report of close() running in the background. Set once close_async() is called; no files are added after.
+    _close_future: Optional["Future[Dict[str, Any]]"] = None
+    # Upload records of the parts of session.json, if uploaded in parts. See EvalConfig.session_json_parts.
+    _session_part_records: Dict[str, UploadRecord] = {}
+
+    # Set on a node contributing to the evaluation of a coordinator. Its close() writes a manifest instead of
+    # finalizing the evaluation. See podonos.core.distributed.
+    _shard: Optional[Shard] = None
+    # Manifests of the nodes, merged into the evaluation by the close() of the coordinator.
+    _shard_manifests: List[ShardManifest] = []
 
     # Custom Query.
     _query: Optional[Query] = None
@@ -37,15 +69,37 @@ class Evaluator(ABC):
     _eval_audios: List[List[Audio]] = []
     _eval_audio_json = []
 
-    def __init__(self, api_client: APIClient, eval_config: Optional[EvalConfig] = None):
+    def __init__(
+        self,
+        api_client: APIClient,
+        eval_config: Optional[EvalConfig] = None,
+        upload_engine: Optional[UploadEngine] = None,
+        evaluation: Optional[Evaluation] = None,
+        shard: Optional[Shard] = None,
+    ):
         log.check(api_client, "api_client is not initialized.")
         self._api_client = api_client
+        self._upload_engine = upload_engine
         self._api_key = api_client.api_key
         self._eval_config = eval_config
         self._initialized = True
         self._eval_audios = []
         self._eval_audio_json = []
-        self._evaluation = self._create_evaluation()
+        self._upload_metrics = UploadMetrics()
+        self._close_phases_sec = {}
+        self._trace_id = new_trace_id()
+        self._shard = shard
+        self._shard_manifests = []
+        self._session_part_records = {}
+        if evaluation is not None:
+            # Created in a batch, or by the coordinator of a shard.
+            self._evaluation = evaluation
+            return
+        if eval_config is not None and eval_config.defer_evaluation_creation:
+            self._evaluation_id_future = self._create_evaluation_in_background()
+            return
+        with trace_context(self._trace_id):
+            self._evaluation = self._create_evaluation()
 
     def _init_eval_variables(self):
         """Initializes the variables for one evaluation session."""
@@ -54,6 +108,8 @@ class Evaluator(ABC):
         self._eval_config = None
         self._eval_audios = []
         self._eval_audio_json = []
+        self._shard_manifests = []
+        self._session_part_records = {}
 
     @abstractmethod
     def add_file(self, file: File) -> None:
@@ -68,21 +124,175 @@ class Evaluator(ABC):
         Returns the evaluation id for this evaluator
 
         Returns:
-            Evaluation id in string
+            Evaluation id in string. Waits for the evaluation if it is being created in the background.
+
+        Raises:
+            HTTPError: if the creation in the background failed.
         """
+        if self._evaluation is None and self._evaluation_id_future is not None:
+            self._evaluation_id_future.result()
         assert self._evaluation
         return self._evaluation.id
 
-    def close(self) -> Dict[str, str]:
+    def _get_upload_evaluation_id(self) -> Union[str, "Future[str]"]:
+        """The evaluation id for the upload queue, without waiting: a future while the evaluation is being created."""
+        if self._evaluation is None and self._evaluation_id_future is not None:
+            return self._evaluation_id_future
+        return self.get_evaluation_id()
+
+    def get_trace_id(self) -> str:
+        """
+        Returns the trace id shared by the spans of this evaluation session. See podonos.core.tracing.
+
+        Returns:
+            Trace id in 32 hex digits
+        """
+        assert self._trace_id
+        return self._trace_id
+
+    @property
+    def upload_metrics(self) -> UploadMetrics:
+        """Live upload metrics of this evaluator. Register it to a PrometheusExporter for dashboards."""
+        if self._upload_metrics is None:
+            raise ValueError("Evaluator is not initialized")
+        return self._upload_metrics
+
+    def get_upload_metrics(self) -> Dict[str, Any]:
+        """
+        Returns the current upload metrics: files and bytes per second, queue depth, in-flight count,
+        and the latency histograms of presigned URL requests and uploads. Safe to call at any time.
+
+        Returns:
+            Upload metrics in dict
+        """
+        return self.upload_metrics.snapshot().to_dict()
+
+    def add_upload_metrics_callback(self, callback: Callable[[Dict[str, Any]], None]) -> None:
+        """
+        Registers a callback that receives the upload metrics in dict whenever a file finishes uploading.
+        The callback runs on an upload worker thread, so it should return quickly.
+
+        Args:
+            callback: Function taking the upload metrics dict.
+        """
+        log.check(callable(callback), "callback must be callable")
+
+        def _on_update(snapshot: UploadMetricsSnapshot) -> None:
+            callback(snapshot.to_dict())
+
+        self.upload_metrics.add_callback(_on_update)
+
+    def get_shard_token(self) -> str:
+        """
+        Returns a token for other nodes to add files to this evaluation with Client.join_evaluation().
+        The token holds no API key. See podonos.core.distributed.
+
+        Returns:
+            Shard token in string
+        """
+        if not self._initialized or self._eval_config is None:
+            raise ValueError("No evaluation session is open.")
+        if self._shard is not None:
+            raise ValueError("A shard cannot hand out shard tokens. Use the token of the coordinator.")
+        self.get_evaluation_id()
+        assert self._evaluation
+        eval_config = self._eval_config
+        return ShardToken(self._evaluation.to_dict(), eval_config.to_shard_config(), eval_config.eval_creation_timestamp).encode()
+
+    def add_shard_manifests(self, manifests: Iterable[Union[str, ShardManifest]]) -> None:
+        """
+        Adds the files the nodes uploaded for this evaluation. close() registers them and writes them into
+        session.json along with the files of this evaluator.
+
+        Args:
+            manifests: Paths of the manifests written by the close() of the nodes, or the manifests.
+
+        Raises:
+            ValueError: if a manifest is of another evaluation, or merged already.
+        """
+        if not self._initialized or self._shard is not None:
+            raise ValueError("Only the open evaluator of the coordinator merges shard manifests.")
+        self._check_open_for_files()
+        evaluation_id = self.get_evaluation_id()
+        shard_ids = {manifest.shard_id for manifest in self._shard_manifests}
+        for manifest in manifests:
+            if isinstance(manifest, str):
+                manifest = ShardManifest.load(manifest)
+            if manifest.evaluation_id != evaluation_id:
+                raise ValueError(f"The manifest of shard {manifest.shard_id} is of evaluation {manifest.evaluation_id}, not {evaluation_id}")
+            if manifest.shard_id in shard_ids:
+                raise ValueError(f"The manifest of shard {manifest.shard_id} is merged already")
+            shard_ids.add(manifest.shard_id)
+            self._shard_manifests.append(manifest)
+            log.debug(f"Shard {manifest.shard_id} is merged with {len(manifest.files)} files")
+
+    def __enter__(self) -> "Evaluator":
+        return self
+
+    def __exit__(self, exc_type: Any, exc_value: Any, traceback: Any) -> None:
+        """Closes the evaluator unless it is closed or closing already.
+        On an exception, cancels the uploads instead, so that a partial evaluation is never submitted: the queued files
+        are dropped, and only the files being uploaded are waited for.
+        """
+        if not self._initialized or self._close_future is not None:
+            return
+        if exc_type is None:
+            self.close()
+            return
+        log.warning(f"The evaluation is not submitted because of {exc_type.__name__}. Cancelling the uploads")
+        if self._upload_manager is not None:
+            self._upload_manager.cancel()
+        self._init_eval_variables()
+
+    def close_async(self) -> "Future[Dict[str, Any]]":
+        """Closes the evaluator in the background, and returns at once. The uploads and the session.json PUT go on
+        while the caller produces the next evaluation, and several evaluators can be closed at the same time.
+        In asyncio, await asyncio.wrap_future(evaluator.close_async()).
+        No files can be added once this is called. Calling it again returns the same future.
+
+        Returns:
+            Future of the report of close(), or of its error.
+        """
+        if self._close_future is not None:
+            return self._close_future
+        if not self._initialized:
+            raise ValueError("No evaluation session is open.")
+
+        future: "Future[Dict[str, Any]]" = Future()
+        self._close_future = future
+
+        def close() -> None:
+            try:
+                future.set_result(self._close())
+            except Exception as e:
+                future.set_exception(e)
+
+        # Not a daemon, so that the interpreter waits for the evaluation to be submitted before exiting.
+        threading.Thread(target=close, name="podonos-close").start()
+        return future
+
+    def _check_open_for_files(self) -> None:
+        if self._close_future is not None:
+            raise ValueError("Try to add files once the evaluator is closing.")
+
+    def close(self) -> Dict[str, Any]:
         """Closes the file uploading and evaluation session.
-        This function holds until the file uploading finishes.
+        This function holds until the file uploading finishes, or the closing started by close_async().
 
         Returns:
-            JSON object containing the uploading status.
+            JSON object containing the uploading status and the performance report: total and unique bytes,
+            files/sec and MB/sec, p50/p95/p99 per-file upload latency, retries, duplicate files,
+            time spent in each close phase, and the slowest files.
 
         Raises:
             ValueError: if this function is called before calling init().
         """
+        if self._close_future is not None:
+            # Closing in the background already.
+            return self._close_future.result()
+        return self._close()
+
+    def _close(self) -> Dict[str, Any]:
         log.debug("Closing the evaluator")
         if not self._initialized or self._eval_config is None:
             raise ValueError("No evaluation session is open.")
@@ -91,22 +301,169 @@ class Evaluator(ABC):
             raise ValueError("Not supported evaluation type")
 
         if self._upload_manager is None:
-            raise ValueError("Upload Manager is not defined")
+            if not self._shard_manifests:
+                raise ValueError("Upload Manager is not defined")
+            # All the files are of the shards.
+            self._get_upload_manager()
+        assert self._upload_manager is not None
+
+        eval_config = self._eval_config
+        upload_manager = self._upload_manager
+        close_start = time.perf_counter()
+        try:
+            evaluation_id = self.get_evaluation_id()
+        except Exception:
+            # The evaluation failed to be created in the background. Its uploads fail too; let them finish first.
+            upload_manager.wait_and_close()
+            raise
+        with trace_context(self._trace_id), self._api_client.tracer.span("evaluator.close", evaluation_id=evaluation_id):
+            # Wait until file uploading finishes.
+            with self._close_phase("wait_uploads"):
+                log.debug("Wait until the upload manager shuts down all the upload workers")
+                assert upload_manager.wait_and_close()
+
+            upload_errors = upload_manager.get_upload_errors()
+            if upload_errors:
+                for remote_object_name, error in upload_errors.items():
+                    log.error(f"Failed to upload {remote_object_name}: {error}")
+                raise HTTPError(f"Failed to upload {len(upload_errors)} files")
+
+            if self._shard is not None:
+                with self._close_phase("build_session_json"):
+                    self._build_audio_json(upload_manager)
+                with self._close_phase("write_shard_manifest"):
+                    self._write_shard_manifest(self._shard, evaluation_id, upload_manager)
+            else:
+                self._finalize(eval_config, evaluation_id, upload_manager)
+
+        self._close_phases_sec["total"] = time.perf_counter() - close_start
+        upload_records = upload_manager.get_upload_records()
+        report = build_upload_report(
+            evaluation_id=self.get_evaluation_id(),
+            files=[(audio.name, audio.remote_object_name, audio.path) for audio_list in self._eval_audios for audio in audio_list],
+            records=upload_records,
+            upload_wall_sec=upload_wall_time(upload_records),
+            close_phases_sec=self._close_phases_sec,
+        )
 
-        # Wait until file uploading finishes.
-        log.debug("Wait until the upload manager shuts down all the upload workers")
-        assert self._upload_manager.wait_and_close()
+        profiler = get_profiler()
+        if profiler is not None:
+            profiler.dump(self.get_evaluation_id())
 
+        if eval_config.eval_auto_start:
+            log.info(f"{TerminalColor.OK}Upload finished. The evaluation will start immediately.{TerminalColor.ENDC}")
+        else:
+            log.info(f"{TerminalColor.OK}Upload finished. Please start the evaluation at {PODONOS_WORKSPACE}." f"{TerminalColor.ENDC}")
+
+        report_dict = report.to_dict()
+        if self._shard is not None:
+            report_dict["shard_id"] = self._shard.shard_id
+            report_dict["manifest_path"] = self._shard.manifest_path
+        elif self._shard_manifests:
+            report_dict["num_shards"] = len(self._shard_manifests)
+            report_dict["num_shard_files"] = sum(len(manifest.files) for manifest in self._shard_manifests)
+        if self._session_part_records:
+            part_records = list(self._session_part_records.values())
+            report_dict["session_json_parts"] = {
+                "num_parts": len(part_records),
+                "total_bytes": sum(record.size for record in part_records),
+                "retries": sum(record.retries for record in part_records),
+                "hedges": sum(record.hedges for record in part_records),
+                "upload_wall_sec": upload_wall_time(self._session_part_records),
+            }
+
+        # Initialize variables.
+        self._init_eval_variables()
+        return report_dict
+
+    def _finalize(self, eval_config: EvalConfig, evaluation_id: str, upload_manager: UploadManager) -> None:
+        """Registers the files of this evaluator and of the merged shards, and uploads session.json."""
         log.info("Uploading the final pieces...")
 
         # Create a template if custom query exists
-        self._create_template_with_question_and_evaluation()
+        with self._close_phase("create_template"):
+            self._create_template_with_question_and_evaluation()
 
         # Insert File data into database
-        self._create_files_of_evaluation([audio for audio_list in self._eval_audios for audio in audio_list])
+        with self._close_phase("register_files"):
+            files = [audio.to_create_file_dict() for audio_list in self._eval_audios for audio in audio_list]
+            for manifest in self._shard_manifests:
+                files.extend(manifest.files)
+            self._create_files_of_evaluation(files)
+
+        with self._close_phase("build_session_json"):
+            self._build_audio_json(upload_manager)
+            for manifest in self._shard_manifests:
+                self._eval_audio_json.extend(manifest.audios)
+
+            # Create a json.
+            session_json = eval_config.to_dict()
+            session_json["query"] = self._query.to_dict() if self._query else None
+            session_json["files"] = self._eval_audio_json
+            bundles = upload_manager.get_bundles() + [bundle for manifest in self._shard_manifests for bundle in manifest.bundles]
+            if bundles:
+                session_json["bundles"] = bundles
+            if self._shard_manifests:
+                session_json["shards"] = [manifest.shard_id for manifest in self._shard_manifests]
+            if eval_config.session_json_parts > 1:
+                # session.json becomes the index of the parts. See podonos.core.session_parts.
+                session_json, parts = split_session_json(session_json, eval_config.session_json_parts)
+
+        if eval_config.session_json_parts > 1:
+            with self._close_phase("upload_session_parts"):
+                self._upload_session_parts(eval_config, evaluation_id, parts)
+
+        with self._close_phase("upload_session_json"):
+            presigned_url = self._get_presigned_url_for_put_method(
+                evaluation_id,
+                SESSION_JSON_NAME,
+            )
 
+            try:
+                response = self._api_client.put_json_presigned_url(
+                    url=presigned_url, data=session_json, headers={"Content-type": "application/json"}
+                )
+                response.raise_for_status()
+            except requests.exceptions.HTTPError as e:
+                log.error(f"HTTP error in uploading a json: {e}")
+                raise HTTPError(
+                    f"Failed to upload session info json: {e}",
+                    status_code=e.response.status_code if e.response else None,
+                )
+
+    def _upload_session_parts(self, eval_config: EvalConfig, evaluation_id: str, parts: List[Tuple[str, bytes]]) -> None:
+        """Uploads the parts of session.json on the upload workers, in a session of their own as the one of the files
+        is closed. Before the index, always. Its metrics are its own, so that the upload metrics count the files only.
+        """
+        upload_manager = UploadManager(
+            api_client=self._api_client,
+            max_workers=eval_config.max_upload_workers,
+            metrics=UploadMetrics(),
+            adaptive=eval_config.adaptive_upload_workers,
+            hedging=eval_config.hedge_uploads,
+            engine=self._upload_engine,
+        )
+        for name, body in parts:
+            upload_manager.add_data_to_queue(evaluation_id, name, body, SESSION_PART_CONTENT_TYPE, trace_id=self._trace_id)
+        upload_manager.wait_and_close()
+
+        upload_errors = upload_manager.get_upload_errors()
+        if upload_errors:
+            for name, error in upload_errors.items():
+                log.error(f"Failed to upload {name}: {error}")
+            raise HTTPError(f"Failed to upload {len(upload_errors)} of {len(parts)} session parts")
+        self._session_part_records = upload_manager.get_upload_records()
+        log.debug(f"Uploaded {len(parts)} session parts")
+
+    def _build_audio_json(self, upload_manager: UploadManager) -> None:
+        """Fills the session.json entries of the files of this evaluator with their upload times."""
+        if not self._eval_audios:
+            # Only the files of the shards.
+            return
         # Get the upload time & finish time.
-        upload_start, upload_finish = self._upload_manager.get_upload_time()
+        upload_start, upload_finish = upload_manager.get_upload_time()
+        transmitted = upload_manager.get_transmitted()
+        bundle_members = upload_manager.get_bundle_members()
         for audio_list in self._eval_audios:
             audio_json_list = []
             for audio in audio_list:
@@ -114,37 +471,31 @@ class Evaluator(ABC):
                 upload_start_at = upload_start[remote_object_name]
                 upload_finish_at = upload_finish[remote_object_name]
                 audio.set_upload_at(upload_start_at, upload_finish_at)
+                audio.set_transmitted(transmitted.get(remote_object_name))
+                audio.set_bundle(bundle_members.get(remote_object_name))
                 audio_json_list.append(audio.to_dict())
             self._eval_audio_json.append(audio_json_list)
 
-        # Create a json.
-        session_json = self._eval_config.to_dict()
-        session_json["query"] = self._query.to_dict() if self._query else None
-        session_json["files"] = self._eval_audio_json
-
-        presigned_url = self._get_presigned_url_for_put_method(
-            self.get_evaluation_id(),
-            "session.json",
+    def _write_shard_manifest(self, shard: Shard, evaluation_id: str, upload_manager: UploadManager) -> None:
+        manifest = ShardManifest(
+            evaluation_id=evaluation_id,
+            shard_id=shard.shard_id,
+            audios=self._eval_audio_json,
+            files=[audio.to_create_file_dict() for audio_list in self._eval_audios for audio in audio_list],
+            bundles=upload_manager.get_bundles(),
         )
+        manifest.save(shard.manifest_path)
+        log.info(f"Shard {shard.shard_id} is written to {shard.manifest_path}. The coordinator merges it with add_shard_manifests()")
 
+    @contextmanager
+    def _close_phase(self, name: str):
+        """Context manager around one phase of close(). Traces, profiles and times the phase for the report."""
+        start = time.perf_counter()
         try:
-            response = self._api_client.put_json_presigned_url(url=presigned_url, data=session_json, headers={"Content-type": "application/json"})
-            response.raise_for_status()
-        except requests.exceptions.HTTPError as e:
-            log.error(f"HTTP error in uploading a json: {e}")
-            raise HTTPError(
-                f"Failed to upload session info json: {e}",
-                status_code=e.response.status_code if e.response else None,
-            )
-
-        if self._eval_config.eval_auto_start:
-            log.info(f"{TerminalColor.OK}Upload finished. The evaluation will start immediately.{TerminalColor.ENDC}")
-        else:
-            log.info(f"{TerminalColor.OK}Upload finished. Please start the evaluation at {PODONOS_WORKSPACE}." f"{TerminalColor.ENDC}")
-
-        # Initialize variables.
-        self._init_eval_variables()
-        return {"status": "ok"}
+            with self._api_client.tracer.span(f"evaluator.close.{name}"), profile_phase(f"close.{name}"):
+                yield
+        finally:
+            self._close_phases_sec[name] = time.perf_counter() - start
 
     def _get_eval_config(self) -> EvalConfig:
         if not self._eval_config:
@@ -172,19 +523,45 @@ class Evaluator(ABC):
         except Exception as e:
             raise HTTPError(f"Failed to create the evaluation: {e}")
 
+    def _create_evaluation_in_background(self) -> "Future[str]":
+        """Starts _create_evaluation() on a thread. The future gets the evaluation id, or the creation error."""
+        future: "Future[str]" = Future()
+        trace_id = self._trace_id
+
+        def create() -> None:
+            try:
+                with trace_context(trace_id):
+                    evaluation = self._create_evaluation()
+            except Exception as e:
+                log.error(f"Failed to create the evaluation in the background: {e}")
+                future.set_exception(e)
+                return
+            # Set before the future completes, so that its waiters see it.
+            self._evaluation = evaluation
+            future.set_result(evaluation.id)
+
+        threading.Thread(target=create, name="podonos-create-evaluation", daemon=True).start()
+        return future
+
     def _upload_one_file(
         self,
-        evaluation_id: str,
+        evaluation_id: Union[str, "Future[str]"],
         remote_object_name: str,
         path: str,
+        group: Optional[str] = None,
+        group_size: int = 1,
+        buffer: Optional[AudioBuffer] = None,
     ) -> None:
         """
         Start uploading one file to server.
 
         Args:
-            evaluation_id: New evaluation's id.
+            evaluation_id: New evaluation's id, or its future while being created in the background.
             remote_object_name: Path to the remote file name.
-            path: Path to the local file.
+            path: Path to the local file, or the name of an in-memory audio.
+            group: Group of the files evaluated together. Optional.
+            group_size: Number of the files in the group.
+            buffer: Encoded audio to upload instead of the local file. Optional.
         Returns:
             None
         """
@@ -200,17 +577,34 @@ class Evaluator(ABC):
         if not self._eval_config:
             raise ValueError("No evaluation session is open.")
 
+        self._get_upload_manager().add_file_to_queue(
+            evaluation_id,
+            remote_object_name,
+            path,
+            trace_id=self._trace_id,
+            group=group,
+            group_size=group_size,
+            transform=self._eval_config.upload_transform,
+            buffer=buffer,
+        )
+        return
+
+    def _get_upload_manager(self) -> UploadManager:
         # Lazy initialization of upload manager.
         if self._upload_manager is None:
+            assert self._eval_config
             log.debug(f"max_upload_workers: {self._eval_config.max_upload_workers}")
             self._upload_manager = UploadManager(
                 api_client=self._api_client,
                 max_workers=self._eval_config.max_upload_workers,
+                metrics=self._upload_metrics,
+                adaptive=self._eval_config.adaptive_upload_workers,
+                scheduling=self._eval_config.upload_scheduling,
+                hedging=self._eval_config.hedge_uploads,
+                engine=self._upload_engine,
+                bundle_max_bytes=self._eval_config.upload_bundle_bytes,
             )
-
-        if self._upload_manager:
-            self._upload_manager.add_file_to_queue(evaluation_id, remote_object_name, path)
-        return
+        return self._upload_manager
 
     def _get_presigned_url_for_put_method(
         self,
@@ -236,11 +630,11 @@ class Evaluator(ABC):
                 status_code=e.response.status_code if e.response else None,
             )
 
-    def _create_files_of_evaluation(self, audios: List[Audio]):
+    def _create_files_of_evaluation(self, files: List[Dict[str, Any]]):
         try:
             response = self._api_client.put(
                 f"evaluations/{self.get_evaluation_id()}/files",
-                {"files": [audio.to_create_file_dict() for audio in audios]},
+                {"files": files},
             )
             response.raise_for_status()
         except requests.exceptions.HTTPError as e:
@@ -281,7 +675,8 @@ class Evaluator(ABC):
     ) -> Audio:
         log.check_ne(file.path, "")
 
-        valid_path = self._validate_path(file.path)
+        # An in-memory audio has no file to check.
+        valid_path = self._validate_path(file.path) if file.buffer is None else file.path
         remote_object_name = self._get_remote_object_name()
         original_path, remote_path = self._process_original_path_and_remote_object_path_into_posix_style(valid_path, remote_object_name)
 
@@ -297,6 +692,7 @@ class Evaluator(ABC):
             group=group,
             type=type,
             order_in_group=order_in_group,
+            buffer=file.buffer,
         )
 
     @staticmethod
@@ -310,7 +706,8 @@ class Evaluator(ABC):
 
     def _get_remote_object_name(self) -> str:
         eval_config = self._get_eval_config()
-        remote_object_name = os.path.join(eval_config.eval_creation_timestamp, generate_random_name())
+        key_layout = get_key_layout(eval_config.key_layout)
+        remote_object_name = key_layout.make(eval_config.eval_creation_timestamp, generate_random_name())
         return remote_object_name
 
     @staticmethod
@@ -1,27 +1,44 @@
-from typing import List, Optional
+from typing import List, Optional, Union
 
+from podonos.common.util import generate_random_name
+from podonos.core.audio import AudioBuffer, AudioSource, load_audio_source
 from podonos.core.base import *
+from podonos.core.shared_audio import SharedAudio
 
 
 class File:
     _path: str
     _tags: List[str]
     _script: Optional[str]
+    # Encoded audio of an in-memory source. None for a file on the disk.
+    _buffer: Optional[AudioBuffer] = None
 
-    def __init__(self, path: str, model_tag: str, tags: List[str] = [], script: Optional[str] = None,
-                 is_ref: bool = False) -> None:
+    def __init__(self, path: Union[str, AudioSource, SharedAudio], model_tag: str, tags: List[str] = [], script: Optional[str] = None,
+                 is_ref: bool = False, name: Optional[str] = None) -> None:
         """
         Args:
-            path: Path to the file to evaluate. Required.
+            path: Path to the file to evaluate, or the audio itself: encoded bytes or a binary stream of a wav, flac
+                  or mp3, or a (NumPy array, sampling rate) pair. An array is frames or frames x channels, and is
+                  encoded to wav in memory. Also a SharedAudio from a worker process, see podonos.core.shared_audio.
+                  Required.
             model_tag: String that represents the model or group. Required.
             tags: A list of string for file. Optional.
             script: Script of the input audio in text. Optional.
             is_ref: True if this file is to be a reference for an evaluation type that requires a reference.
                     Optiona. Default is False.
+            name: Name of an in-memory audio, in place of the path. Optional. Default is a random name.
         """
         log.check_ne(path, "")
         log.check_ne(model_tag, "")
-        self._path = path
+        if isinstance(path, str):
+            self._path = path
+            self._buffer = None
+        elif isinstance(path, SharedAudio):
+            self._buffer = path.attach()
+            self._path = name or f"in-memory-{generate_random_name()}"
+        else:
+            self._buffer = load_audio_source(path)
+            self._path = name or f"in-memory-{generate_random_name()}"
         self._model_tag = model_tag
         self._tags = tags
         self._script = script
@@ -29,8 +46,13 @@ class File:
 
     @property
     def path(self) -> str:
+        """Path of the file, or the name of an in-memory audio."""
         return self._path
 
+    @property
+    def buffer(self) -> Optional[AudioBuffer]:
+        return self._buffer
+
     @property
     def model_tag(self) -> str:
         return self._model_tag
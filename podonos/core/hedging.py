@@ -0,0 +1,69 @@
+import threading
+
+from collections import deque
+from typing import Deque, Dict, Optional
+
+from podonos.core.base import *
+from podonos.core.report import percentile
+
+DEFAULT_HEDGE_PERCENTILE = 0.95
+DEFAULT_HEDGE_MIN_SAMPLES = 20
+DEFAULT_HEDGE_MIN_DELAY_SEC = 1.0
+DEFAULT_HEDGE_WINDOW = 256
+
+
+class HedgingPolicy:
+    """Decides when to hedge an upload, i.e. start a second attempt while the first one is still running.
+
+    Upload latencies are kept per size class, each a power of two of bytes, so that a long recording isn't
+    held to the deadline of short clips. The deadline of a file is the given percentile of the recent
+    latencies in its size class. Files of a class with fewer than min_samples latencies are not hedged.
+    """
+
+    _lock: threading.Lock
+    _percentile: float
+    _min_samples: int
+    _min_delay_sec: float
+    _window: int
+    # Recent upload latencies by size class.
+    _latencies: Dict[int, Deque[float]]
+
+    def __init__(
+        self,
+        percentile: float = DEFAULT_HEDGE_PERCENTILE,
+        min_samples: int = DEFAULT_HEDGE_MIN_SAMPLES,
+        min_delay_sec: float = DEFAULT_HEDGE_MIN_DELAY_SEC,
+        window: int = DEFAULT_HEDGE_WINDOW,
+    ) -> None:
+        log.check(0.0 < percentile < 1.0, "percentile must be in (0, 1)")
+        log.check_gt(min_samples, 0)
+        log.check_ge(min_delay_sec, 0)
+        log.check_ge(window, min_samples)
+        self._lock = threading.Lock()
+        self._percentile = percentile
+        self._min_samples = min_samples
+        self._min_delay_sec = min_delay_sec
+        self._window = window
+        self._latencies = {}
+
+    @staticmethod
+    def _size_class(size: int) -> int:
+        return max(size, 1).bit_length()
+
+    def observe(self, size: int, seconds: float) -> None:
+        with self._lock:
+            latencies = self._latencies.get(self._size_class(size))
+            if latencies is None:
+                latencies = self._latencies[self._size_class(size)] = deque(maxlen=self._window)
+            latencies.append(seconds)
+
+    def deadline(self, size: int) -> Optional[float]:
+        """Seconds after which an upload of this size is hedged. None if there isn't enough history."""
+        with self._lock:
+            latencies = self._latencies.get(self._size_class(size))
+            if latencies is None or len(latencies) < self._min_samples:
+                return None
+            samples = sorted(latencies)
+        deadline = percentile(samples, self._percentile)
+        assert deadline is not None
+        return max(deadline, self._min_delay_sec)
@@ -0,0 +1,79 @@
+"""
+On-disk cache of successful initialization checks: the SDK version check and the API key verification.
+
+Short-lived processes call init() on every start. With a cached entry they skip both round trips until it expires.
+An entry is keyed by a hash of the API key and the API URL, and by the SDK version. The key itself is never
+written, and an upgrade checks the version again. Only successes are cached, so a revoked key is caught once its
+entry expires.
+
+The directory is PODONOS_CACHE_DIR if set, otherwise podonos/ under XDG_CACHE_HOME or ~/.cache.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import time
+
+from typing import Optional
+
+from podonos.common.constant import *
+from podonos.core.base import *
+
+
+def default_cache_dir() -> str:
+    cache_dir = os.environ.get(PODONOS_CACHE_DIR)
+    if cache_dir:
+        return cache_dir
+    cache_home = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(cache_home, "podonos")
+
+
+class InitCache:
+    _directory: str
+    _ttl_sec: float
+
+    def __init__(self, ttl_sec: float, directory: Optional[str] = None) -> None:
+        """
+        Args:
+            ttl_sec: Seconds an entry stays valid after the checks succeeded.
+            directory: Directory of the entries. Default: default_cache_dir()
+        """
+        log.check_gt(ttl_sec, 0)
+        self._ttl_sec = ttl_sec
+        self._directory = directory or default_cache_dir()
+
+    @property
+    def directory(self) -> str:
+        return self._directory
+
+    @property
+    def ttl_sec(self) -> float:
+        return self._ttl_sec
+
+    def get(self, api_key: str, api_url: str, sdk_version: str) -> bool:
+        """True if the checks succeeded for these within the TTL. Unreadable entries count as missing."""
+        try:
+            with open(self._path(api_key, api_url, sdk_version), "r") as f:
+                entry = json.load(f)
+            verified_at = float(entry["verified_at"])
+        except (OSError, ValueError, KeyError, TypeError):
+            return False
+        return 0 <= time.time() - verified_at < self._ttl_sec
+
+    def put(self, api_key: str, api_url: str, sdk_version: str) -> None:
+        """Records that the checks succeeded now. Failing to write is logged and ignored."""
+        path = self._path(api_key, api_url, sdk_version)
+        try:
+            os.makedirs(self._directory, exist_ok=True)
+            # Written aside and renamed, so that concurrent processes never read a partial entry.
+            fd, temp_path = tempfile.mkstemp(dir=self._directory, prefix=".init-")
+            with os.fdopen(fd, "w") as f:
+                json.dump({"sdk_version": sdk_version, "verified_at": time.time()}, f)
+            os.replace(temp_path, path)
+        except OSError as e:
+            log.debug(f"Cannot write the init cache {path}: {e}")
+
+    def _path(self, api_key: str, api_url: str, sdk_version: str) -> str:
+        digest = hashlib.sha256(f"{api_url}\n{api_key}".encode("utf-8")).hexdigest()[:32]
+        return os.path.join(self._directory, f"init-{digest}-{sdk_version}.json")
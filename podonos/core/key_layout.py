@@ -0,0 +1,85 @@
+"""Layout of the remote object names of the uploaded files.
+
+    flat:         <eval_creation_timestamp>/<ms>-<uuid4>. Default. Every file of an evaluation shares one prefix, so
+                  the object store serves them from one partition, which throttles many parallel PUTs.
+    hash_prefix:  <shard>/<eval_creation_timestamp>/<ms>-<uuid4>, where the shard is the first hex digits of the
+                  SHA-256 of the flat name. The files spread over the partitions of the shards from the first upload.
+
+Remote object names are deterministic in the flat name, and reversible by original_remote_object_name(). The same
+names go to the presigned URLs, file registration and session.json.
+
+Other layouts may be added by register_key_layout().
+"""
+
+import hashlib
+import posixpath
+
+from typing import Dict, List
+
+from podonos.core.base import *
+
+KEY_LAYOUT_FLAT = "flat"
+KEY_LAYOUT_HASH_PREFIX = "hash_prefix"
+
+
+class KeyLayout:
+    """Flat layout. Subclasses override make() and original()."""
+
+    def make(self, prefix: str, name: str) -> str:
+        """Remote object name of the file called name under prefix, e.g. the evaluation creation timestamp."""
+        log.check_ne(prefix, "")
+        log.check_ne(name, "")
+        return posixpath.join(prefix, name)
+
+    def original(self, remote_object_name: str) -> str:
+        """Flat name of a remote object name made by this layout."""
+        return remote_object_name
+
+
+class HashPrefixKeyLayout(KeyLayout):
+    # 4 hex digits: 65536 shards, well over the partitions an object store splits a bucket into.
+    _shard_length: int
+
+    def __init__(self, shard_length: int = 4) -> None:
+        log.check_gt(shard_length, 0)
+        log.check_le(shard_length, 64)
+        self._shard_length = shard_length
+
+    def shard(self, flat_name: str) -> str:
+        return hashlib.sha256(flat_name.encode("utf-8")).hexdigest()[: self._shard_length]
+
+    def make(self, prefix: str, name: str) -> str:
+        flat_name = super().make(prefix, name)
+        return posixpath.join(self.shard(flat_name), flat_name)
+
+    def original(self, remote_object_name: str) -> str:
+        shard, _, flat_name = remote_object_name.partition("/")
+        if not flat_name or shard != self.shard(flat_name):
+            raise ValueError(f"{remote_object_name} is not a {KEY_LAYOUT_HASH_PREFIX} remote object name")
+        return flat_name
+
+
+_layouts: Dict[str, KeyLayout] = {
+    KEY_LAYOUT_FLAT: KeyLayout(),
+    KEY_LAYOUT_HASH_PREFIX: HashPrefixKeyLayout(),
+}
+
+
+def register_key_layout(name: str, layout: KeyLayout) -> None:
+    log.check_ne(name, "")
+    log.check(isinstance(layout, KeyLayout), "layout must be a KeyLayout")
+    _layouts[name] = layout
+
+
+def get_key_layouts() -> List[str]:
+    return list(_layouts)
+
+
+def get_key_layout(name: str) -> KeyLayout:
+    if name not in _layouts:
+        raise ValueError(f'Unknown key layout "{name}". Use one of {get_key_layouts()}')
+    return _layouts[name]
+
+
+def original_remote_object_name(layout: str, remote_object_name: str) -> str:
+    return get_key_layout(layout).original(remote_object_name)
@@ -0,0 +1,266 @@
+import bisect
+import threading
+import time
+
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+
+from podonos.core.base import *
+
+# Upper bounds of the latency histogram buckets in seconds. The last bucket is +Inf.
+DEFAULT_LATENCY_BUCKETS: Tuple[float, ...] = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0)
+
+# Length of the sliding window used for the live throughput in seconds.
+DEFAULT_RATE_WINDOW_SEC = 10.0
+
+
+class LatencyHistogram:
+    """Fixed-bucket latency histogram. Not thread-safe by itself; UploadMetrics guards it with its lock."""
+
+    _buckets: Tuple[float, ...]
+    _counts: List[int]
+    _sum: float = 0.0
+    _count: int = 0
+
+    def __init__(self, buckets: Tuple[float, ...] = DEFAULT_LATENCY_BUCKETS) -> None:
+        log.check_gt(len(buckets), 0)
+        self._buckets = tuple(sorted(buckets))
+        # One extra slot for +Inf.
+        self._counts = [0] * (len(self._buckets) + 1)
+        self._sum = 0.0
+        self._count = 0
+
+    @property
+    def buckets(self) -> Tuple[float, ...]:
+        return self._buckets
+
+    @property
+    def count(self) -> int:
+        return self._count
+
+    @property
+    def sum(self) -> float:
+        return self._sum
+
+    def observe(self, seconds: float) -> None:
+        self._counts[bisect.bisect_left(self._buckets, seconds)] += 1
+        self._sum += seconds
+        self._count += 1
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Estimates the q-quantile as the upper bound of the bucket holding it. None if nothing is observed."""
+        log.check(0.0 <= q <= 1.0, "q must be in [0, 1]")
+        if self._count == 0:
+            return None
+        rank = q * self._count
+        cumulative = 0
+        for index, count in enumerate(self._counts):
+            cumulative += count
+            if cumulative >= rank and count > 0:
+                return self._buckets[index] if index < len(self._buckets) else float("inf")
+        return float("inf")
+
+    def to_dict(self) -> Dict[str, Any]:
+        cumulative = 0
+        buckets: Dict[str, int] = {}
+        for upper, count in zip(list(self._buckets) + [float("inf")], self._counts):
+            cumulative += count
+            buckets["+Inf" if upper == float("inf") else str(upper)] = cumulative
+        return {"buckets": buckets, "count": self._count, "sum": self._sum}
+
+
+@dataclass
+class UploadMetricsSnapshot:
+    """Point-in-time view of an upload session."""
+
+    timestamp: float
+    elapsed_sec: float
+    files_queued: int
+    files_uploaded: int
+    files_failed: int
+    files_hedged: int
+    bytes_queued: int
+    bytes_uploaded: int
+    queue_depth: int
+    in_flight: int
+    concurrency_limit: int
+    files_per_sec: float
+    bytes_per_sec: float
+    avg_files_per_sec: float
+    avg_bytes_per_sec: float
+    presign_latency: Dict[str, Any] = field(default_factory=dict)
+    upload_latency: Dict[str, Any] = field(default_factory=dict)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "timestamp": self.timestamp,
+            "elapsed_sec": self.elapsed_sec,
+            "files_queued": self.files_queued,
+            "files_uploaded": self.files_uploaded,
+            "files_failed": self.files_failed,
+            "files_hedged": self.files_hedged,
+            "bytes_queued": self.bytes_queued,
+            "bytes_uploaded": self.bytes_uploaded,
+            "queue_depth": self.queue_depth,
+            "in_flight": self.in_flight,
+            "concurrency_limit": self.concurrency_limit,
+            "files_per_sec": self.files_per_sec,
+            "bytes_per_sec": self.bytes_per_sec,
+            "avg_files_per_sec": self.avg_files_per_sec,
+            "avg_bytes_per_sec": self.avg_bytes_per_sec,
+            "presign_latency": self.presign_latency,
+            "upload_latency": self.upload_latency,
+        }
+
+
+class UploadMetrics:
+    """Thread-safe counters, gauges and latency histograms of one upload session.
+    The upload workers update it, and users may poll snapshot() or register callbacks at any time.
+    """
+
+    _lock: threading.Lock
+    _callbacks: List[Callable[[UploadMetricsSnapshot], None]]
+    _start_time: Optional[float] = None
+    _files_queued: int = 0
+    _files_started: int = 0
+    _files_uploaded: int = 0
+    _files_failed: int = 0
+    # Files uploaded a second time because the first attempt ran past the hedging deadline.
+    _files_hedged: int = 0
+    _bytes_queued: int = 0
+    _bytes_uploaded: int = 0
+    # Current cap of in-flight uploads. 0 until the upload manager starts.
+    _concurrency_limit: int = 0
+    _presign_latency: LatencyHistogram
+    _upload_latency: LatencyHistogram
+    # Completion events (monotonic time, bytes) within the rate window.
+    _recent: Deque[Tuple[float, int]]
+    _rate_window_sec: float = DEFAULT_RATE_WINDOW_SEC
+
+    def __init__(self, rate_window_sec: float = DEFAULT_RATE_WINDOW_SEC) -> None:
+        log.check_gt(rate_window_sec, 0)
+        self._lock = threading.Lock()
+        self._callbacks = []
+        self._start_time = None
+        self._files_queued = 0
+        self._files_started = 0
+        self._files_uploaded = 0
+        self._files_failed = 0
+        self._files_hedged = 0
+        self._bytes_queued = 0
+        self._bytes_uploaded = 0
+        self._concurrency_limit = 0
+        self._presign_latency = LatencyHistogram()
+        self._upload_latency = LatencyHistogram()
+        self._recent = deque()
+        self._rate_window_sec = rate_window_sec
+
+    @property
+    def files_queued(self) -> int:
+        return self._files_queued
+
+    @property
+    def files_uploaded(self) -> int:
+        return self._files_uploaded
+
+    @property
+    def files_failed(self) -> int:
+        return self._files_failed
+
+    @property
+    def files_done(self) -> int:
+        return self._files_uploaded + self._files_failed
+
+    def add_callback(self, callback: Callable[[UploadMetricsSnapshot], None]) -> None:
+        """Registers a callback invoked with a fresh snapshot whenever a file finishes, successfully or not.
+        Callbacks run on the upload worker threads, so they should return quickly.
+        """
+        log.check(callable(callback), "callback must be callable")
+        with self._lock:
+            self._callbacks.append(callback)
+
+    def remove_callback(self, callback: Callable[[UploadMetricsSnapshot], None]) -> None:
+        with self._lock:
+            if callback in self._callbacks:
+                self._callbacks.remove(callback)
+
+    def on_queued(self, size: int) -> None:
+        with self._lock:
+            if self._start_time is None:
+                self._start_time = time.monotonic()
+            self._files_queued += 1
+            self._bytes_queued += size
+
+    def set_concurrency_limit(self, limit: int) -> None:
+        with self._lock:
+            self._concurrency_limit = limit
+
+    def on_started(self) -> None:
+        with self._lock:
+            self._files_started += 1
+
+    def on_presigned(self, seconds: float) -> None:
+        with self._lock:
+            self._presign_latency.observe(seconds)
+
+    def on_uploaded(self, size: int, seconds: float) -> None:
+        with self._lock:
+            self._files_uploaded += 1
+            self._bytes_uploaded += size
+            self._upload_latency.observe(seconds)
+            self._recent.append((time.monotonic(), size))
+        self._notify()
+
+    def on_hedged(self) -> None:
+        with self._lock:
+            self._files_hedged += 1
+
+    def on_failed(self) -> None:
+        with self._lock:
+            self._files_failed += 1
+        self._notify()
+
+    def snapshot(self) -> UploadMetricsSnapshot:
+        with self._lock:
+            now = time.monotonic()
+            elapsed = now - self._start_time if self._start_time is not None else 0.0
+            self._trim_recent(now)
+            window = min(self._rate_window_sec, elapsed) if elapsed > 0 else 0.0
+            recent_files = len(self._recent)
+            recent_bytes = sum(size for _, size in self._recent)
+            return UploadMetricsSnapshot(
+                timestamp=time.time(),
+                elapsed_sec=elapsed,
+                files_queued=self._files_queued,
+                files_uploaded=self._files_uploaded,
+                files_failed=self._files_failed,
+                files_hedged=self._files_hedged,
+                bytes_queued=self._bytes_queued,
+                bytes_uploaded=self._bytes_uploaded,
+                queue_depth=self._files_queued - self._files_started,
+                in_flight=self._files_started - self._files_uploaded - self._files_failed,
+                concurrency_limit=self._concurrency_limit,
+                files_per_sec=recent_files / window if window > 0 else 0.0,
+                bytes_per_sec=recent_bytes / window if window > 0 else 0.0,
+                avg_files_per_sec=self._files_uploaded / elapsed if elapsed > 0 else 0.0,
+                avg_bytes_per_sec=self._bytes_uploaded / elapsed if elapsed > 0 else 0.0,
+                presign_latency=self._presign_latency.to_dict(),
+                upload_latency=self._upload_latency.to_dict(),
+            )
+
+    def _trim_recent(self, now: float) -> None:
+        while self._recent and now - self._recent[0][0] > self._rate_window_sec:
+            self._recent.popleft()
+
+    def _notify(self) -> None:
+        with self._lock:
+            callbacks = list(self._callbacks)
+        if not callbacks:
+            return
+        snapshot = self.snapshot()
+        for callback in callbacks:
+            try:
+                callback(snapshot)
+            except Exception as e:
+                log.warning(f"Upload metrics callback failed: {e}")
@@ -0,0 +1,86 @@
+"""OpenTelemetry adapter for the SDK trace hooks.
+Importable only if opentelemetry-api is installed: pip install "podonos[opentelemetry]"
+
+Example:
+    from podonos.core.otel import OpenTelemetryTraceHook
+    client = podonos.init(api_key="<API_KEY>", trace_hook=OpenTelemetryTraceHook())
+"""
+
+import threading
+
+from typing import Any, Dict, Optional
+
+try:
+    from opentelemetry import trace as otel_trace
+    from opentelemetry.trace import NonRecordingSpan, SpanContext, Status, StatusCode, TraceFlags
+except ImportError as e:
+    raise ImportError(
+        "OpenTelemetryTraceHook requires opentelemetry-api. " 'Install it by \'pip install "podonos[opentelemetry]"\'.'
+    ) from e
+
+from podonos.core.base import *
+from podonos.core.tracing import Span, TraceHook
+
+_TRACER_NAME = "podonos"
+
+
+def _to_ns(seconds: float) -> int:
+    return int(seconds * 1e9)
+
+
+def _session_span_id(trace_id: str) -> int:
+    # The low 64 bits of the trace id. A span id must not be 0.
+    return int(trace_id[-16:], 16) or 1
+
+
+class OpenTelemetryTraceHook(TraceHook):
+    """Forwards SDK spans to an OpenTelemetry tracer.
+    The SDK trace id becomes the OpenTelemetry trace id, so every span of one evaluation session lands in one trace.
+    The root spans of a session hang under a remote parent standing for the session, which is not exported.
+    """
+
+    _tracer: Any
+    _lock: threading.Lock
+    _otel_spans: Dict[str, Any]
+
+    def __init__(self, tracer_provider: Optional[Any] = None) -> None:
+        self._tracer = otel_trace.get_tracer(_TRACER_NAME, tracer_provider=tracer_provider)
+        self._lock = threading.Lock()
+        self._otel_spans = {}
+
+    def on_span_start(self, span: Span) -> None:
+        with self._lock:
+            parent = self._otel_spans.get(span.parent_id) if span.parent_id else None
+        if parent is None:
+            # Root spans of a session hang under a remote parent carrying the session trace id. Its span id is of the
+            # session, the same for every root span of it, and never the id of a span of its own.
+            parent = NonRecordingSpan(
+                SpanContext(
+                    trace_id=int(span.trace_id, 16),
+                    span_id=_session_span_id(span.trace_id),
+                    is_remote=True,
+                    trace_flags=TraceFlags(TraceFlags.SAMPLED),
+                )
+            )
+        otel_span = self._tracer.start_span(
+            span.name,
+            context=otel_trace.set_span_in_context(parent),
+            start_time=_to_ns(span.start_time),
+        )
+        with self._lock:
+            self._otel_spans[span.span_id] = otel_span
+
+    def on_span_end(self, span: Span) -> None:
+        with self._lock:
+            otel_span = self._otel_spans.pop(span.span_id, None)
+        if otel_span is None:
+            return
+
+        for key, value in span.attributes.items():
+            if isinstance(value, (str, bool, int, float)):
+                otel_span.set_attribute(key, value)
+        for name, seconds in span.phases.items():
+            otel_span.set_attribute(f"podonos.phase.{name}_ms", seconds * 1000.0)
+        if span.error:
+            otel_span.set_status(Status(StatusCode.ERROR, span.error))
+        otel_span.end(end_time=_to_ns(span.end_time) if span.end_time is not None else None)
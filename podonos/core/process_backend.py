@@ -0,0 +1,218 @@
+"""Upload backend sharding the file PUTs across worker processes.
+
+The GIL caps how many bytes one Python process pushes through TLS, however many threads it runs. With this backend
+the upload workers of the engine still presign, schedule and track every file, but hand the PUT of the file body
+to one of the worker processes. Each process has its own threads and its own connection pool, and sends back the
+timing or the error of every PUT.
+
+The processes are started with the spawn method, so a script using this backend must guard its entry point with
+if __name__ == "__main__":, like any other use of multiprocessing.
+"""
+
+import itertools
+import math
+import multiprocessing
+import queue
+import threading
+import time
+
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, replace
+from typing import Any, Dict, List, Optional, Tuple
+
+from podonos.common.exception import HTTPError
+from podonos.core.api import APIClient, retries_of
+from podonos.core.base import *
+from podonos.core.rate_limit import RateLimits, get_rate_limiter, set_rate_limits
+from podonos.core.transport import Transport
+
+# Seconds between the health checks of the worker processes.
+_POLL_INTERVAL_SEC = 1.0
+
+
+@dataclass
+class ShardResult:
+    """Outcome of one PUT in a worker process."""
+
+    shard: int
+    upload_sec: float
+    # HTTP retries of the PUT.
+    retries: int = 0
+
+
+def _divide(value: Optional[float], parts: int) -> Optional[float]:
+    return value / parts if value is not None else None
+
+
+def _shard_main(
+    shard: int,
+    tasks: Any,
+    results: Any,
+    api_key: str,
+    api_url: str,
+    timeout: Tuple[float, float],
+    rate_limits: RateLimits,
+    num_threads: int,
+    transport: Transport,
+) -> None:
+    """Entry point of a worker process. Runs PUTs from tasks until it receives None."""
+    set_rate_limits(rate_limits)
+    api_client = APIClient(api_key, api_url, timeout=timeout, transport=transport)
+    api_client.enable_connection_pool(num_threads)
+
+    def put(task_id: int, url: str, path: str) -> None:
+        start = time.monotonic()
+        try:
+            response = api_client.put_file_presigned_url(url, path)
+            response.raise_for_status()
+            results.put((task_id, time.monotonic() - start, retries_of(response), None, None))
+        except Exception as e:
+            status_code = getattr(getattr(e, "response", None), "status_code", None) or getattr(e, "status_code", None)
+            results.put((task_id, time.monotonic() - start, 0, str(e), status_code))
+
+    with ThreadPoolExecutor(max_workers=num_threads, thread_name_prefix=f"podonos-shard{shard}") as executor:
+        while True:
+            task = tasks.get()
+            if task is None:
+                break
+            executor.submit(put, *task)
+
+
+class _Shard:
+    process: Any
+    tasks: Any
+    # Ids of the PUTs sent to this process and not answered yet.
+    pending: set
+
+    def __init__(self, process: Any, tasks: Any) -> None:
+        self.process = process
+        self.tasks = tasks
+        self.pending = set()
+
+
+class ProcessUploadBackend:
+    """Pool of worker processes uploading file bodies to presigned URLs."""
+
+    _lock: threading.Lock
+    _shards: List[_Shard]
+    _results: Any
+    _futures: Dict[int, Tuple[int, Future]]
+    _task_ids: Any
+    _collector: Optional[threading.Thread] = None
+    _closed: bool = False
+
+    def __init__(self, api_client: APIClient, num_processes: int, num_threads: int) -> None:
+        """
+        Args:
+            api_client: Client whose key, URL, timeouts, rate limits and transport the worker processes copy.
+            num_processes: Number of worker processes.
+            num_threads: Total number of concurrent PUTs, split evenly across the processes.
+        """
+        log.check_gt(num_processes, 0)
+        log.check_gt(num_threads, 0)
+        context = multiprocessing.get_context("spawn")
+        threads_per_process = max(1, math.ceil(num_threads / num_processes))
+        # The limits hold for the whole host, so each process gets its share.
+        limits = get_rate_limiter().limits
+        process_limits = replace(
+            limits,
+            storage_requests_per_sec=_divide(limits.storage_requests_per_sec, num_processes),
+            upload_bytes_per_sec=_divide(limits.upload_bytes_per_sec, num_processes),
+        )
+
+        self._lock = threading.Lock()
+        self._results = context.Queue()
+        self._futures = {}
+        self._task_ids = itertools.count()
+        self._shards = []
+        for shard in range(num_processes):
+            tasks = context.Queue()
+            process = context.Process(
+                target=_shard_main,
+                args=(
+                    shard,
+                    tasks,
+                    self._results,
+                    api_client.api_key,
+                    api_client.api_url,
+                    api_client.timeout,
+                    process_limits,
+                    threads_per_process,
+                    # A fresh transport of the same kind, without the connections of this process.
+                    api_client.transport,
+                ),
+                name=f"podonos-upload-shard{shard}",
+                daemon=True,
+            )
+            process.start()
+            self._shards.append(_Shard(process, tasks))
+        self._closed = False
+        self._collector = threading.Thread(target=self._collect, name="podonos-shard-collector", daemon=True)
+        self._collector.start()
+        log.debug(f"Started {num_processes} upload processes with {threads_per_process} threads each")
+
+    @property
+    def num_processes(self) -> int:
+        return len(self._shards)
+
+    def submit(self, url: str, path: str) -> Future:
+        """Sends one PUT to the least busy process. The future resolves to a ShardResult."""
+        future: Future = Future()
+        with self._lock:
+            if self._closed:
+                raise ValueError("Upload backend is closed")
+            shard = min(range(len(self._shards)), key=lambda index: len(self._shards[index].pending))
+            task_id = next(self._task_ids)
+            self._futures[task_id] = (shard, future)
+            self._shards[shard].pending.add(task_id)
+        self._shards[shard].tasks.put((task_id, url, path))
+        return future
+
+    def put_file(self, url: str, path: str) -> ShardResult:
+        """Uploads one file in a worker process and waits for it. Raises HTTPError on failure."""
+        return self.submit(url, path).result()
+
+    def close(self) -> None:
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+        for shard in self._shards:
+            shard.tasks.put(None)
+        for shard in self._shards:
+            shard.process.join()
+        self._results.put(None)
+        if self._collector is not None:
+            self._collector.join()
+        self._fail_pending(lambda shard: True, "Upload backend is closed")
+        log.debug("Upload processes are closed")
+
+    def _collect(self) -> None:
+        while True:
+            try:
+                result = self._results.get(timeout=_POLL_INTERVAL_SEC)
+            except queue.Empty:
+                self._fail_pending(lambda shard: not self._shards[shard].process.is_alive(), "Upload process exited")
+                continue
+            if result is None:
+                return
+
+            task_id, upload_sec, retries, error, status_code = result
+            with self._lock:
+                shard, future = self._futures.pop(task_id)
+                self._shards[shard].pending.discard(task_id)
+            if error is None:
+                future.set_result(ShardResult(shard=shard, upload_sec=upload_sec, retries=retries))
+            else:
+                future.set_exception(HTTPError(error, status_code=status_code))
+
+    def _fail_pending(self, should_fail, message: str) -> None:
+        failed = []
+        with self._lock:
+            for task_id, (shard, future) in list(self._futures.items()):
+                if should_fail(shard):
+                    del self._futures[task_id]
+                    self._shards[shard].pending.discard(task_id)
+                    failed.append((shard, future))
+        for shard, future in failed:
+            future.set_exception(HTTPError(f"{message}: shard {shard}, exit code {self._shards[shard].process.exitcode}"))
@@ -0,0 +1,233 @@
+"""Opt-in profiling mode for evaluation sessions.
+
+Enable by Podonos.init(profile_dir="/path/to/dir") or by setting the PODONOS_PROFILE environment variable to a directory.
+While enabled, the SDK records the wall and CPU time of its phases (add_file, metadata probing, upload workers and
+each close() phase) and samples the Python stacks of all threads. Each Evaluator.close() writes
+    podonos-profile-<evaluation_id>.json       Per-phase wall/CPU breakdown.
+    podonos-profile-<evaluation_id>.collapsed  Sampled stacks in the collapsed format of flamegraph.pl and speedscope.
+When disabled, profile_phase() returns a shared no-op context manager and profiled() adds one global lookup.
+"""
+
+import functools
+import json
+import os
+import sys
+import threading
+import time
+
+from collections import Counter
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Optional, Tuple, TypeVar
+
+from podonos.core.base import *
+
+DEFAULT_SAMPLE_INTERVAL_SEC = 0.005
+
+_F = TypeVar("_F", bound=Callable[..., Any])
+
+
+@dataclass
+class PhaseStats:
+    count: int = 0
+    wall_sec: float = 0.0
+    cpu_sec: float = 0.0
+    max_wall_sec: float = 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "count": self.count,
+            "wall_sec": self.wall_sec,
+            "cpu_sec": self.cpu_sec,
+            "max_wall_sec": self.max_wall_sec,
+        }
+
+
+class _NullPhase:
+    def __enter__(self) -> None:
+        return None
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        return None
+
+
+_NULL_PHASE = _NullPhase()
+
+
+class _Phase:
+    """Measures the wall time and the CPU time of the current thread."""
+
+    _profiler: "Profiler"
+    _name: str
+    _wall_start: float = 0.0
+    _cpu_start: float = 0.0
+
+    def __init__(self, profiler: "Profiler", name: str) -> None:
+        self._profiler = profiler
+        self._name = name
+
+    def __enter__(self) -> None:
+        self._wall_start = time.perf_counter()
+        self._cpu_start = time.thread_time()
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self._profiler.record(self._name, time.perf_counter() - self._wall_start, time.thread_time() - self._cpu_start)
+
+
+class Profiler:
+    """Collects per-phase timings and a sampling profile of every thread in the process."""
+
+    _output_dir: str
+    _sample_interval: float
+    _lock: threading.Lock
+    _phases: Dict[str, PhaseStats]
+    _samples: Counter
+    _num_samples: int = 0
+    _sampler_event: threading.Event
+    _sampler_thread: Optional[threading.Thread] = None
+
+    def __init__(self, output_dir: str, sample_interval: float = DEFAULT_SAMPLE_INTERVAL_SEC) -> None:
+        log.check_ne(output_dir, "")
+        log.check_gt(sample_interval, 0)
+        self._output_dir = output_dir
+        self._sample_interval = sample_interval
+        self._lock = threading.Lock()
+        self._phases = {}
+        self._samples = Counter()
+        self._num_samples = 0
+        self._sampler_event = threading.Event()
+        self._sampler_thread = None
+
+    @property
+    def output_dir(self) -> str:
+        return self._output_dir
+
+    def phase(self, name: str) -> _Phase:
+        return _Phase(self, name)
+
+    def record(self, name: str, wall_sec: float, cpu_sec: float) -> None:
+        with self._lock:
+            stats = self._phases.get(name)
+            if stats is None:
+                stats = self._phases[name] = PhaseStats()
+            stats.count += 1
+            stats.wall_sec += wall_sec
+            stats.cpu_sec += cpu_sec
+            stats.max_wall_sec = max(stats.max_wall_sec, wall_sec)
+
+    def get_phases(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            return {name: stats.to_dict() for name, stats in self._phases.items()}
+
+    def start(self) -> None:
+        if self._sampler_thread is not None:
+            return
+        self._sampler_event.clear()
+        self._sampler_thread = threading.Thread(target=self._sample_loop, name="podonos-profiler", daemon=True)
+        self._sampler_thread.start()
+
+    def stop(self) -> None:
+        if self._sampler_thread is None:
+            return
+        self._sampler_event.set()
+        self._sampler_thread.join()
+        self._sampler_thread = None
+
+    def dump(self, tag: str) -> Tuple[str, str]:
+        """Writes the phase breakdown and the sampled stacks collected so far.
+
+        Returns:
+            Paths of the JSON report and the collapsed stack file.
+        """
+        log.check_ne(tag, "")
+        os.makedirs(self._output_dir, exist_ok=True)
+        report_path = os.path.join(self._output_dir, f"podonos-profile-{tag}.json")
+        stacks_path = os.path.join(self._output_dir, f"podonos-profile-{tag}.collapsed")
+
+        with self._lock:
+            report = {
+                "created_at": time.time(),
+                "pid": os.getpid(),
+                "phases": {name: stats.to_dict() for name, stats in self._phases.items()},
+                "sampling": {"interval_sec": self._sample_interval, "num_samples": self._num_samples},
+            }
+            stacks = list(self._samples.most_common())
+
+        with open(report_path, "w") as f:
+            json.dump(report, f, indent=2)
+        with open(stacks_path, "w") as f:
+            for stack, count in stacks:
+                f.write(f"{stack} {count}\n")
+        log.info(f"Profile is written to {report_path}")
+        return report_path, stacks_path
+
+    def _sample_loop(self) -> None:
+        own_id = threading.get_ident()
+        while not self._sampler_event.wait(self._sample_interval):
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            frames = sys._current_frames()
+            collapsed = []
+            for thread_id, frame in frames.items():
+                if thread_id == own_id:
+                    continue
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append(f"{os.path.basename(code.co_filename)}:{code.co_name}")
+                    frame = frame.f_back
+                stack.append(names.get(thread_id, str(thread_id)))
+                collapsed.append(";".join(reversed(stack)))
+            with self._lock:
+                self._samples.update(collapsed)
+                self._num_samples += 1
+
+
+# Process-wide profiler. None unless the profiling mode is enabled.
+_profiler: Optional[Profiler] = None
+
+
+def enable_profiling(output_dir: str, sample_interval: float = DEFAULT_SAMPLE_INTERVAL_SEC) -> Profiler:
+    """Enables the profiling mode in this process and starts the stack sampler."""
+    global _profiler
+    if _profiler is not None:
+        log.debug("Profiling mode is already enabled")
+        return _profiler
+    _profiler = Profiler(output_dir, sample_interval)
+    _profiler.start()
+    log.info(f"Profiling mode is enabled. Profiles go to {output_dir}")
+    return _profiler
+
+
+def disable_profiling() -> None:
+    global _profiler
+    if _profiler is not None:
+        _profiler.stop()
+    _profiler = None
+
+
+def get_profiler() -> Optional[Profiler]:
+    return _profiler
+
+
+def profile_phase(name: str):
+    """Context manager timing one phase. A shared no-op if the profiling mode is disabled."""
+    profiler = _profiler
+    if profiler is None:
+        return _NULL_PHASE
+    return profiler.phase(name)
+
+
+def profiled(name: str) -> Callable[[_F], _F]:
+    """Decorator timing every call of the function as one phase."""
+
+    def decorator(func: _F) -> _F:
+        @functools.wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            profiler = _profiler
+            if profiler is None:
+                return func(*args, **kwargs)
+            with profiler.phase(name):
+                return func(*args, **kwargs)
+
+        return wrapper  # type: ignore
+
+    return decorator
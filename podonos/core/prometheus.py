@@ -0,0 +1,156 @@
+"""Prometheus text exporter for upload metrics.
+No extra dependency is required. Either call render() and ship the text yourself, or start() a tiny HTTP endpoint.
+
+Example:
+    exporter = PrometheusExporter()
+    exporter.register(etor.upload_metrics, labels={"evaluation_id": etor.get_evaluation_id()})
+    exporter.start(port=9464)
+"""
+
+import threading
+
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple
+
+from podonos.core.base import *
+from podonos.core.metrics import UploadMetrics, UploadMetricsSnapshot
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+_METRIC_PREFIX = "podonos_upload"
+
+# (name, type, help, snapshot attribute)
+_SCALAR_METRICS = [
+    ("files_queued_total", "counter", "Files added to the upload queue.", "files_queued"),
+    ("files_uploaded_total", "counter", "Files uploaded successfully.", "files_uploaded"),
+    ("files_failed_total", "counter", "Files that failed to upload.", "files_failed"),
+    ("files_hedged_total", "counter", "Files uploaded a second time because the first attempt was slow.", "files_hedged"),
+    ("bytes_queued_total", "counter", "Bytes added to the upload queue.", "bytes_queued"),
+    ("bytes_uploaded_total", "counter", "Bytes uploaded successfully.", "bytes_uploaded"),
+    ("queue_depth", "gauge", "Files waiting in the upload queue.", "queue_depth"),
+    ("in_flight", "gauge", "Files currently being uploaded.", "in_flight"),
+    ("concurrency_limit", "gauge", "Current cap of in-flight uploads.", "concurrency_limit"),
+    ("files_per_second", "gauge", "Uploaded files per second over the recent window.", "files_per_sec"),
+    ("bytes_per_second", "gauge", "Uploaded bytes per second over the recent window.", "bytes_per_sec"),
+]
+
+_HISTOGRAM_METRICS = [
+    ("presign_latency_seconds", "Latency of presigned URL requests.", "presign_latency"),
+    ("upload_latency_seconds", "Latency of file uploads to the presigned URL.", "upload_latency"),
+]
+
+
+def _format_labels(labels: Dict[str, str], extra: Optional[Dict[str, str]] = None) -> str:
+    merged = dict(labels)
+    if extra:
+        merged.update(extra)
+    if not merged:
+        return ""
+    escaped = [f'{key}="{_escape_label_value(str(value))}"' for key, value in sorted(merged.items())]
+    return "{" + ",".join(escaped) + "}"
+
+
+def _escape_label_value(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def render_prometheus(sources: List[Tuple[UploadMetricsSnapshot, Dict[str, str]]]) -> str:
+    """Renders snapshots in the Prometheus text exposition format.
+
+    Args:
+        sources: List of (snapshot, labels). Labels distinguish evaluation sessions.
+
+    Returns:
+        Text for a /metrics response.
+    """
+    lines: List[str] = []
+    for name, metric_type, help_text, attribute in _SCALAR_METRICS:
+        full_name = f"{_METRIC_PREFIX}_{name}"
+        lines.append(f"# HELP {full_name} {help_text}")
+        lines.append(f"# TYPE {full_name} {metric_type}")
+        for snapshot, labels in sources:
+            lines.append(f"{full_name}{_format_labels(labels)} {getattr(snapshot, attribute)}")
+
+    for name, help_text, attribute in _HISTOGRAM_METRICS:
+        full_name = f"{_METRIC_PREFIX}_{name}"
+        lines.append(f"# HELP {full_name} {help_text}")
+        lines.append(f"# TYPE {full_name} histogram")
+        for snapshot, labels in sources:
+            histogram = getattr(snapshot, attribute)
+            for upper, count in histogram["buckets"].items():
+                lines.append(f"{full_name}_bucket{_format_labels(labels, {'le': upper})} {count}")
+            lines.append(f"{full_name}_sum{_format_labels(labels)} {histogram['sum']}")
+            lines.append(f"{full_name}_count{_format_labels(labels)} {histogram['count']}")
+    return "\n".join(lines) + "\n"
+
+
+class PrometheusExporter:
+    """Collects UploadMetrics from one or more evaluators and exposes them to Prometheus."""
+
+    _lock: threading.Lock
+    _sources: List[Tuple[UploadMetrics, Dict[str, str]]]
+    _server: Optional[ThreadingHTTPServer] = None
+    _server_thread: Optional[threading.Thread] = None
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._sources = []
+        self._server = None
+        self._server_thread = None
+
+    def register(self, metrics: UploadMetrics, labels: Optional[Dict[str, str]] = None) -> None:
+        log.check_notnone(metrics)
+        with self._lock:
+            self._sources.append((metrics, dict(labels or {})))
+
+    def unregister(self, metrics: UploadMetrics) -> None:
+        with self._lock:
+            self._sources = [(source, labels) for source, labels in self._sources if source is not metrics]
+
+    def render(self) -> str:
+        with self._lock:
+            sources = list(self._sources)
+        return render_prometheus([(metrics.snapshot(), labels) for metrics, labels in sources])
+
+    def start(self, port: int = 9464, addr: str = "0.0.0.0") -> int:
+        """Serves GET /metrics in a daemon thread.
+
+        Returns:
+            The bound port. Useful when port=0.
+        """
+        if self._server is not None:
+            raise ValueError("Prometheus exporter is already running")
+
+        exporter = self
+
+        class _Handler(BaseHTTPRequestHandler):
+            def do_GET(self) -> None:
+                if self.path.split("?")[0] != "/metrics":
+                    self.send_error(404)
+                    return
+                body = exporter.render().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", PROMETHEUS_CONTENT_TYPE)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args) -> None:
+                log.debug(f"Prometheus exporter: {format % args}")
+
+        self._server = ThreadingHTTPServer((addr, port), _Handler)
+        self._server.daemon_threads = True
+        self._server_thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._server_thread.start()
+        bound_port = self._server.server_address[1]
+        log.info(f"Prometheus exporter is listening on {addr}:{bound_port}/metrics")
+        return bound_port
+
+    def stop(self) -> None:
+        if self._server is None:
+            return
+        self._server.shutdown()
+        self._server.server_close()
+        if self._server_thread is not None:
+            self._server_thread.join()
+        self._server = None
+        self._server_thread = None
@@ -0,0 +1,214 @@
+"""Token-bucket limits on requests per second and upload bytes per second, shared by every APIClient in the process.
+
+Requests are limited per endpoint class:
+    api:      Control-plane calls such as creating evaluations and registering files.
+    presign:  Calls issuing presigned URLs. One per uploaded file.
+    storage:  PUTs to presigned URLs on the object store.
+Upload bytes are limited while the file bodies stream, so one large file doesn't burst the uplink.
+
+A 429 response pauses its endpoint class for the Retry-After period, or an exponential backoff without one,
+and halves the rate of the class until successful responses bring it back. The request is then retried.
+
+Example:
+    from podonos.core.rate_limit import RateLimits
+    client = podonos.init(api_key="<API_KEY>", rate_limits=RateLimits(presign_requests_per_sec=10, upload_bytes_per_sec=5e6))
+"""
+
+import threading
+import time
+
+from dataclasses import dataclass
+from email.utils import parsedate_to_datetime
+from typing import Dict, Optional
+
+from podonos.core.base import *
+
+ENDPOINT_CLASS_API = "api"
+ENDPOINT_CLASS_PRESIGN = "presign"
+ENDPOINT_CLASS_STORAGE = "storage"
+ENDPOINT_CLASSES = (ENDPOINT_CLASS_API, ENDPOINT_CLASS_PRESIGN, ENDPOINT_CLASS_STORAGE)
+
+HTTP_TOO_MANY_REQUESTS = 429
+
+# Bucket capacity in seconds of the rate.
+_REQUEST_BURST_SEC = 1.0
+_BYTES_BURST_SEC = 0.1
+
+_INITIAL_BACKOFF_SEC = 1.0
+_MAX_BACKOFF_SEC = 60.0
+# The throttled rate never goes below this fraction of the configured one.
+_MIN_RATE_FRACTION = 1 / 16
+# Each successful response restores this fraction of the configured rate.
+_RECOVERY_FRACTION = 0.05
+
+
+@dataclass
+class RateLimits:
+    """Limits shared by the whole process. None means unlimited."""
+
+    api_requests_per_sec: Optional[float] = None
+    presign_requests_per_sec: Optional[float] = None
+    storage_requests_per_sec: Optional[float] = None
+    upload_bytes_per_sec: Optional[float] = None
+    # Number of retries of a request answered with 429.
+    max_retries_on_429: int = 3
+
+    def requests_per_sec(self, endpoint_class: str) -> Optional[float]:
+        return {
+            ENDPOINT_CLASS_API: self.api_requests_per_sec,
+            ENDPOINT_CLASS_PRESIGN: self.presign_requests_per_sec,
+            ENDPOINT_CLASS_STORAGE: self.storage_requests_per_sec,
+        }[endpoint_class]
+
+
+class TokenBucket:
+    """Thread-safe token bucket. Callers reserve tokens and sleep until the reservation is covered,
+    so the tokens may go negative and waiters are served in order of arrival.
+    """
+
+    _lock: threading.Lock
+    _configured_rate: Optional[float] = None
+    _rate: Optional[float] = None
+    _burst_sec: float
+    _tokens: float = 0.0
+    _updated: float = 0.0
+    _blocked_until: float = 0.0
+    _backoff: float = _INITIAL_BACKOFF_SEC
+
+    def __init__(self, rate: Optional[float] = None, burst_sec: float = _REQUEST_BURST_SEC) -> None:
+        log.check_gt(burst_sec, 0)
+        self._lock = threading.Lock()
+        self._burst_sec = burst_sec
+        self._updated = time.monotonic()
+        self._blocked_until = 0.0
+        self._backoff = _INITIAL_BACKOFF_SEC
+        self.configure(rate)
+
+    @property
+    def rate(self) -> Optional[float]:
+        """Current rate. Lower than the configured one while recovering from 429 responses."""
+        return self._rate
+
+    def configure(self, rate: Optional[float]) -> None:
+        if rate is not None:
+            log.check_gt(rate, 0)
+        with self._lock:
+            self._configured_rate = rate
+            self._rate = rate
+            self._tokens = self._capacity()
+            self._updated = time.monotonic()
+
+    def acquire(self, amount: float = 1.0) -> float:
+        """Takes amount tokens, waiting for them if needed.
+
+        Returns:
+            Seconds spent waiting.
+        """
+        with self._lock:
+            now = time.monotonic()
+            ready = max(now, self._blocked_until)
+            if self._rate is not None:
+                self._refill(now)
+                self._tokens -= amount
+                if self._tokens < 0:
+                    ready = max(ready, now + -self._tokens / self._rate)
+        delay = ready - now
+        if delay > 0:
+            time.sleep(delay)
+        return max(delay, 0.0)
+
+    def on_throttled(self, retry_after: Optional[float] = None) -> None:
+        with self._lock:
+            if retry_after is None:
+                retry_after = self._backoff
+                self._backoff = min(self._backoff * 2, _MAX_BACKOFF_SEC)
+            self._blocked_until = max(self._blocked_until, time.monotonic() + retry_after)
+            if self._rate is not None and self._configured_rate is not None:
+                self._refill(time.monotonic())
+                self._rate = max(self._rate / 2, self._configured_rate * _MIN_RATE_FRACTION)
+
+    def on_success(self) -> None:
+        with self._lock:
+            self._backoff = _INITIAL_BACKOFF_SEC
+            if self._rate is not None and self._configured_rate is not None and self._rate < self._configured_rate:
+                self._refill(time.monotonic())
+                self._rate = min(self._rate + self._configured_rate * _RECOVERY_FRACTION, self._configured_rate)
+
+    def _capacity(self) -> float:
+        return max(self._rate * self._burst_sec, 1.0) if self._rate is not None else 0.0
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(self._tokens + (now - self._updated) * self._rate, self._capacity())
+        self._updated = now
+
+
+class RateLimiter:
+    """Request buckets by endpoint class and a bucket of upload bytes."""
+
+    _limits: RateLimits
+    _request_buckets: Dict[str, TokenBucket]
+    _byte_bucket: TokenBucket
+
+    def __init__(self, limits: Optional[RateLimits] = None) -> None:
+        self._request_buckets = {endpoint_class: TokenBucket() for endpoint_class in ENDPOINT_CLASSES}
+        self._byte_bucket = TokenBucket(burst_sec=_BYTES_BURST_SEC)
+        self.configure(limits or RateLimits())
+
+    @property
+    def limits(self) -> RateLimits:
+        return self._limits
+
+    @property
+    def max_retries(self) -> int:
+        return self._limits.max_retries_on_429
+
+    @property
+    def byte_bucket(self) -> Optional[TokenBucket]:
+        """Bucket of upload bytes. None if the upload bandwidth is unlimited."""
+        return self._byte_bucket if self._limits.upload_bytes_per_sec is not None else None
+
+    def configure(self, limits: RateLimits) -> None:
+        log.check_ge(limits.max_retries_on_429, 0)
+        self._limits = limits
+        for endpoint_class, bucket in self._request_buckets.items():
+            bucket.configure(limits.requests_per_sec(endpoint_class))
+        self._byte_bucket.configure(limits.upload_bytes_per_sec)
+
+    def acquire(self, endpoint_class: str) -> float:
+        """Waits for a request permit of the endpoint class. Returns the seconds spent waiting."""
+        return self._request_buckets[endpoint_class].acquire()
+
+    def on_response(self, endpoint_class: str, status_code: int, retry_after: Optional[float] = None) -> None:
+        bucket = self._request_buckets[endpoint_class]
+        if status_code == HTTP_TOO_MANY_REQUESTS:
+            log.warning(f"Rate limited on {endpoint_class} requests. Backing off.")
+            bucket.on_throttled(retry_after)
+        else:
+            bucket.on_success()
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Parses a Retry-After header, either in seconds or in an HTTP date. None if missing or malformed."""
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        return max(parsedate_to_datetime(value).timestamp() - time.time(), 0.0)
+    except (TypeError, ValueError):
+        return None
+
+
+# Shared by every APIClient in this process unless one is given its own.
+_shared_rate_limiter = RateLimiter()
+
+
+def get_rate_limiter() -> RateLimiter:
+    return _shared_rate_limiter
+
+
+def set_rate_limits(limits: RateLimits) -> None:
+    """Replaces the process-wide limits. Takes effect for the requests after this call."""
+    _shared_rate_limiter.configure(limits)
@@ -0,0 +1,172 @@
+import math
+import os
+
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+from podonos.core.base import *
+
+# Number of the slowest files listed in the report.
+DEFAULT_SLOWEST_N = 10
+
+
+@dataclass
+class UploadRecord:
+    """Timings of one uploaded file, kept by the upload manager."""
+
+    size: int
+    presign_sec: float
+    upload_sec: float
+    # Monotonic clock at the presign start and at the upload finish.
+    started_at: float
+    finished_at: float
+    # HTTP retries of the requests of the upload.
+    retries: int = 0
+    # Attempts started besides the first one by hedging. See podonos.core.hedging.
+    hedges: int = 0
+
+
+@dataclass
+class FileTiming:
+    name: str
+    remote_name: str
+    size: int
+    upload_sec: float
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"name": self.name, "remote_name": self.remote_name, "size": self.size, "upload_sec": self.upload_sec}
+
+
+@dataclass
+class UploadReport:
+    """Performance report of one evaluation session, returned by Evaluator.close()."""
+
+    evaluation_id: str
+    num_files: int
+    total_bytes: int
+    unique_bytes: int
+    duplicate_files: int
+    retries: int
+    hedges: int
+    upload_wall_sec: float
+    files_per_sec: float
+    mb_per_sec: float
+    latency_p50_sec: Optional[float]
+    latency_p95_sec: Optional[float]
+    latency_p99_sec: Optional[float]
+    presign_p50_sec: Optional[float]
+    close_phases_sec: Dict[str, float] = field(default_factory=dict)
+    slowest_files: List[FileTiming] = field(default_factory=list)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "status": "ok",
+            "evaluation_id": self.evaluation_id,
+            "num_files": self.num_files,
+            "total_bytes": self.total_bytes,
+            "unique_bytes": self.unique_bytes,
+            "duplicate_files": self.duplicate_files,
+            "retries": self.retries,
+            "hedges": self.hedges,
+            "upload_wall_sec": self.upload_wall_sec,
+            "files_per_sec": self.files_per_sec,
+            "mb_per_sec": self.mb_per_sec,
+            "latency_p50_sec": self.latency_p50_sec,
+            "latency_p95_sec": self.latency_p95_sec,
+            "latency_p99_sec": self.latency_p99_sec,
+            "presign_p50_sec": self.presign_p50_sec,
+            "close_phases_sec": self.close_phases_sec,
+            "slowest_files": [timing.to_dict() for timing in self.slowest_files],
+        }
+
+
+def percentile(sorted_values: List[float], q: float) -> Optional[float]:
+    """Linear-interpolated q-quantile of already sorted values. None if empty."""
+    log.check(0.0 <= q <= 1.0, "q must be in [0, 1]")
+    if not sorted_values:
+        return None
+    position = q * (len(sorted_values) - 1)
+    lower = math.floor(position)
+    upper = math.ceil(position)
+    if lower == upper:
+        return sorted_values[lower]
+    return sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * (position - lower)
+
+
+def upload_wall_time(records: Dict[str, UploadRecord]) -> float:
+    """Wall time from the first presign start to the last upload finish."""
+    if not records:
+        return 0.0
+    return max(record.finished_at for record in records.values()) - min(record.started_at for record in records.values())
+
+
+def _file_identity(path: str) -> Tuple[Any, ...]:
+    """Identifies the content source of a file, so that the same file added twice is counted once."""
+    try:
+        stat = os.stat(path)
+        return stat.st_dev, stat.st_ino
+    except OSError:
+        return (os.path.realpath(path),)
+
+
+def build_upload_report(
+    evaluation_id: str,
+    files: List[Tuple[str, str, str]],
+    records: Dict[str, UploadRecord],
+    upload_wall_sec: float,
+    close_phases_sec: Dict[str, float],
+    slowest_n: int = DEFAULT_SLOWEST_N,
+) -> UploadReport:
+    """Builds the report of an evaluation session.
+
+    Args:
+        evaluation_id: Evaluation id.
+        files: List of (name, remote object name, local path) of every file in the session.
+        records: Upload record by remote object name.
+        upload_wall_sec: Wall time of uploading. See upload_wall_time().
+        close_phases_sec: Wall time of each close() phase.
+        slowest_n: Number of the slowest files to list.
+
+    Returns:
+        UploadReport
+    """
+    log.check_ge(slowest_n, 0)
+    total_bytes = 0
+    unique_bytes = 0
+    duplicate_files = 0
+    seen = set()
+    timings: List[FileTiming] = []
+    for name, remote_name, path in files:
+        record = records.get(remote_name)
+        if record is None:
+            continue
+        total_bytes += record.size
+        identity = _file_identity(path)
+        if identity in seen:
+            duplicate_files += 1
+        else:
+            seen.add(identity)
+            unique_bytes += record.size
+        timings.append(FileTiming(name=name, remote_name=remote_name, size=record.size, upload_sec=record.upload_sec))
+
+    latencies = sorted(timing.upload_sec for timing in timings)
+    presign_latencies = sorted(record.presign_sec for record in records.values())
+    timings.sort(key=lambda timing: timing.upload_sec, reverse=True)
+    return UploadReport(
+        evaluation_id=evaluation_id,
+        num_files=len(timings),
+        total_bytes=total_bytes,
+        unique_bytes=unique_bytes,
+        duplicate_files=duplicate_files,
+        retries=sum(record.retries for record in records.values()),
+        hedges=sum(record.hedges for record in records.values()),
+        upload_wall_sec=upload_wall_sec,
+        files_per_sec=len(timings) / upload_wall_sec if upload_wall_sec > 0 else 0.0,
+        mb_per_sec=total_bytes / 1e6 / upload_wall_sec if upload_wall_sec > 0 else 0.0,
+        latency_p50_sec=percentile(latencies, 0.50),
+        latency_p95_sec=percentile(latencies, 0.95),
+        latency_p99_sec=percentile(latencies, 0.99),
+        presign_p50_sec=percentile(presign_latencies, 0.50),
+        close_phases_sec=dict(close_phases_sec),
+        slowest_files=timings[:slowest_n],
+    )
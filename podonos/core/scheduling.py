@@ -0,0 +1,126 @@
+"""Order in which the upload workers take files from the queue.
+
+    fifo:           In the order of add_file(). Default.
+    largest_first:  Largest file first (longest processing time first), so that a long file added last
+                    doesn't become the tail that keeps close() waiting.
+    group_atomic:   Files of one group, e.g. the two stimuli of add_files(), are taken back to back and only
+                    once the whole group is queued, so they finish close together. Groups go largest first.
+
+Other policies may be added by register_scheduling_policy() with a factory returning an UploadQueue.
+"""
+
+import heapq
+import itertools
+import queue
+
+from collections import deque
+from typing import TYPE_CHECKING, Callable, Deque, Dict, List, Tuple
+
+from podonos.core.base import *
+
+if TYPE_CHECKING:
+    from podonos.core.upload_manager import UploadItem
+
+SCHEDULING_FIFO = "fifo"
+SCHEDULING_LARGEST_FIRST = "largest_first"
+SCHEDULING_GROUP_ATOMIC = "group_atomic"
+
+
+class UploadQueue(queue.Queue):
+    """FIFO queue of upload items. Subclasses change the order through the queue.Queue hooks
+    _init, _qsize, _put and _get, which run with the queue mutex held.
+    """
+
+    def flush(self) -> None:
+        """Makes every queued item available to get(). Called before waiting for the queue to drain."""
+        pass
+
+
+class LargestFirstUploadQueue(UploadQueue):
+    def _init(self, maxsize: int) -> None:
+        self._heap: List[Tuple[int, int, "UploadItem"]] = []
+        self._counter = itertools.count()
+
+    def _qsize(self) -> int:
+        return len(self._heap)
+
+    def _put(self, item: "UploadItem") -> None:
+        # The counter keeps the insertion order among files of the same size.
+        heapq.heappush(self._heap, (-item.size, next(self._counter), item))
+
+    def _get(self) -> "UploadItem":
+        return heapq.heappop(self._heap)[2]
+
+
+class GroupAtomicUploadQueue(UploadQueue):
+    """Holds the files of a group until group_size of them are queued, then releases them together."""
+
+    def _init(self, maxsize: int) -> None:
+        # Incomplete groups by (evaluation id, group).
+        self._pending: Dict[Tuple[str, str], List["UploadItem"]] = {}
+        # Complete groups as (-total bytes, insertion order, files).
+        self._ready: List[Tuple[int, int, List["UploadItem"]]] = []
+        # Rest of the group being taken.
+        self._current: Deque["UploadItem"] = deque()
+        self._num_ready = 0
+        self._counter = itertools.count()
+
+    def _qsize(self) -> int:
+        return self._num_ready
+
+    def _put(self, item: "UploadItem") -> None:
+        if item.group is None or item.group_size <= 1:
+            self._release([item])
+            return
+
+        key = (item.evaluation_id, item.group)
+        members = self._pending.setdefault(key, [])
+        members.append(item)
+        if len(members) >= item.group_size:
+            del self._pending[key]
+            self._release(members)
+
+    def _get(self) -> "UploadItem":
+        if not self._current:
+            _, _, members = heapq.heappop(self._ready)
+            self._current.extend(members)
+        self._num_ready -= 1
+        return self._current.popleft()
+
+    def _release(self, members: List["UploadItem"]) -> None:
+        members = sorted(members, key=lambda member: member.size, reverse=True)
+        heapq.heappush(self._ready, (-sum(member.size for member in members), next(self._counter), members))
+        self._num_ready += len(members)
+
+    def flush(self) -> None:
+        with self.mutex:
+            if not self._pending:
+                return
+            log.warning(f"{len(self._pending)} upload groups are incomplete. Uploading them as they are.")
+            for members in self._pending.values():
+                self._release(members)
+            self._pending.clear()
+            self.not_empty.notify_all()
+
+
+_policies: Dict[str, Callable[[], UploadQueue]] = {
+    SCHEDULING_FIFO: UploadQueue,
+    SCHEDULING_LARGEST_FIRST: LargestFirstUploadQueue,
+    SCHEDULING_GROUP_ATOMIC: GroupAtomicUploadQueue,
+}
+
+
+def register_scheduling_policy(name: str, factory: Callable[[], UploadQueue]) -> None:
+    log.check_ne(name, "")
+    log.check(callable(factory), "factory must be callable")
+    _policies[name] = factory
+
+
+def get_scheduling_policies() -> List[str]:
+    return list(_policies)
+
+
+def create_upload_queue(policy: str) -> UploadQueue:
+    if policy not in _policies:
+        raise ValueError(f'Unknown upload scheduling policy "{policy}". Use one of {get_scheduling_policies()}')
+    return _policies[policy]()
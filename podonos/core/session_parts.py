@@ -0,0 +1,77 @@
+"""session.json split into part files and an index, for very large evaluations.
+
+A session.json of hundreds of thousands of files takes long to serialize and goes through a single PUT. With parts,
+close() cuts "files" of session.json into N slices in order, and uploads each as its own object in parallel:
+
+    session.part-00000.json    {"part": 0, "files": [...]}
+    session.part-00001.json    {"part": 1, "files": [...]}
+
+Then it uploads session.json itself as the index: the usual document without "files", plus "parts", the name, the
+number of file groups, the size and the SHA-256 of every part in order. The index goes last, so the parts are complete
+once it exists. The server reassembles the usual document by concatenating "files" of the parts in the order of the
+index and dropping "parts". See assemble_session_json(), which the fake backend runs as the server does.
+"""
+
+import hashlib
+import json
+
+from typing import Any, Callable, Dict, List, Tuple
+
+SESSION_JSON_NAME = "session.json"
+SESSION_PART_CONTENT_TYPE = "application/json"
+
+
+def part_name(index: int) -> str:
+    return f"session.part-{index:05d}.json"
+
+
+def split_session_json(session_json: Dict[str, Any], num_parts: int) -> Tuple[Dict[str, Any], List[Tuple[str, bytes]]]:
+    """
+    Cuts "files" of session.json into parts of about the same number of file groups.
+
+    Args:
+        session_json: The document to split.
+        num_parts: Number of parts. Fewer if there are fewer file groups, but at least one.
+
+    Returns:
+        The index, and the name and the serialized body of each part in order.
+    """
+    files = session_json["files"]
+    num_parts = max(1, min(num_parts, len(files)))
+    index = {key: value for key, value in session_json.items() if key != "files"}
+    index["parts"] = []
+    parts = []
+    for i in range(num_parts):
+        part_files = files[len(files) * i // num_parts : len(files) * (i + 1) // num_parts]
+        body = json.dumps({"part": i, "files": part_files}).encode("utf-8")
+        name = part_name(i)
+        index["parts"].append({"name": name, "num_files": len(part_files), "size": len(body), "sha256": hashlib.sha256(body).hexdigest()})
+        parts.append((name, body))
+    return index, parts
+
+
+def assemble_session_json(index: Dict[str, Any], read_part: Callable[[str], bytes]) -> Dict[str, Any]:
+    """
+    Rebuilds the usual session.json from its index and parts. What the server does on the upload of an index.
+
+    Args:
+        index: The uploaded session.json with "parts".
+        read_part: Reads the body of a part by its name, e.g. from the object store.
+
+    Raises:
+        ValueError: if a part is missing, or doesn't match the index.
+    """
+    session_json = {key: value for key, value in index.items() if key != "parts"}
+    session_json["files"] = []
+    for i, part in enumerate(index["parts"]):
+        try:
+            body = read_part(part["name"])
+        except KeyError:
+            raise ValueError(f"Missing session part {part['name']}")
+        if len(body) != part["size"] or hashlib.sha256(body).hexdigest() != part["sha256"]:
+            raise ValueError(f"Session part {part['name']} doesn't match the index")
+        document = json.loads(body)
+        if document["part"] != i or len(document["files"]) != part["num_files"]:
+            raise ValueError(f"Session part {part['name']} is out of order")
+        session_json["files"].extend(document["files"])
+    return session_json
@@ -0,0 +1,107 @@
+"""Hands audio from worker processes to the evaluator through shared memory.
+
+A worker of a multiprocessing pool encodes its audio into a shared memory segment with share_audio(), and returns
+the SharedAudio handle, which carries only the name of the segment and the metadata. The parent passes the handle
+to File, which maps the segment instead of copying it, and the segment is freed once the file is uploaded.
+
+Example:
+    def generate(text):
+        return share_audio((vocoder(text), 24000))
+
+    with multiprocessing.Pool() as pool:
+        for index, shared in enumerate(pool.imap(generate, texts)):
+            evaluator.add_file(File(path=shared, model_tag="my_model", name=f"utt{index}"))
+
+The parent owns a segment from attaching it on. share_audio() takes the segment off the resource tracker of the
+worker, which a forked worker may run on its own and which would free the segment when the pool exits. Attaching
+registers it with the tracker of the parent instead, which frees it if the parent exits before uploading it. A
+segment returned but never passed to File is left behind.
+
+POSIX only. On Windows, a segment goes away with the last process mapping it, i.e. before the parent can attach it.
+"""
+
+import os
+
+from dataclasses import dataclass
+from multiprocessing import resource_tracker, shared_memory
+
+from podonos.core.audio import AudioBuffer, AudioSource, load_audio_source
+from podonos.core.base import *
+from podonos.errors.error import NotSupportedError
+
+
+@dataclass(frozen=True)
+class SharedAudio:
+    """Encoded audio in a shared memory segment. Small enough to send through a pipe."""
+
+    segment: str
+    size: int
+    content_type: str
+    nchannels: int
+    framerate: int
+    duration_in_ms: int
+
+    def attach(self) -> AudioBuffer:
+        """Maps the segment in this process. Releasing the buffer unmaps and frees the segment."""
+        # Registered with the resource tracker of this process.
+        shm = shared_memory.SharedMemory(name=self.segment)
+        view = shm.buf[: self.size]
+
+        def free() -> None:
+            try:
+                shm.unlink()
+            except FileNotFoundError:
+                pass
+            view.release()
+            try:
+                shm.close()
+            except BufferError:
+                # A chunk of the body is still referenced, e.g. by a hedged attempt. The map goes with it.
+                log.debug(f"Shared audio {self.segment} is still referenced, leaving the map to the garbage collector")
+
+        return AudioBuffer(
+            data=view,
+            content_type=self.content_type,
+            nchannels=self.nchannels,
+            framerate=self.framerate,
+            duration_in_ms=self.duration_in_ms,
+            on_release=free,
+        )
+
+
+def share_audio(source: AudioSource) -> SharedAudio:
+    """Encodes the audio like File does, and copies it into a new shared memory segment. Call in the worker process.
+
+    Args:
+        source: Encoded bytes or a binary stream of a wav, flac or mp3, or a (NumPy array, sampling rate) pair.
+
+    Returns:
+        Handle to pass to the parent process, then to File(path=...).
+
+    Raises:
+        NotSupportedError: on Windows.
+    """
+    if os.name == "nt":
+        raise NotSupportedError("Shared audio is not supported on Windows. Return the encoded bytes from the worker instead.")
+    buffer = load_audio_source(source)
+    data = memoryview(buffer.data).cast("B")
+    # A segment can't be empty.
+    shm = shared_memory.SharedMemory(create=True, size=max(len(data), 1))
+    try:
+        shm.buf[: len(data)] = data
+        shared = SharedAudio(
+            segment=shm.name,
+            size=len(data),
+            content_type=buffer.content_type,
+            nchannels=buffer.nchannels,
+            framerate=buffer.framerate,
+            duration_in_ms=buffer.duration_in_ms,
+        )
+    except BaseException:
+        shm.close()
+        shm.unlink()
+        raise
+    # Unmaps it here. The segment stays until the parent frees it, so the tracker of this process must not free it.
+    resource_tracker.unregister(shm._name, "shared_memory")  # type: ignore[attr-defined]
+    shm.close()
+    return shared
@@ -0,0 +1,173 @@
+"""Tracing hooks for HTTP calls and upload phases.
+
+The SDK emits spans only when a TraceHook is installed, e.g. Podonos.init(trace_hook=MyHook()).
+Without a hook, Tracer.span() hands out a shared no-op span and no timing is taken.
+Spans created within trace_context(trace_id) share that trace id, so the API calls of the upload
+workers and of Evaluator.close() phases can be attributed to one evaluation session.
+"""
+
+import contextvars
+import secrets
+import time
+
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, Optional
+
+from podonos.core.base import *
+
+_current_trace_id: contextvars.ContextVar = contextvars.ContextVar("podonos_trace_id", default=None)
+_current_span: contextvars.ContextVar = contextvars.ContextVar("podonos_span", default=None)
+
+
+def new_trace_id() -> str:
+    """Returns a random trace id in the W3C trace-context format (32 hex digits)."""
+    return secrets.token_hex(16)
+
+
+def new_span_id() -> str:
+    """Returns a random span id in the W3C trace-context format (16 hex digits)."""
+    return secrets.token_hex(8)
+
+
+def get_current_trace_id() -> Optional[str]:
+    return _current_trace_id.get()
+
+
+@contextmanager
+def trace_context(trace_id: Optional[str]) -> Iterator[None]:
+    """Makes every span created in this block, on this thread, belong to trace_id."""
+    token = _current_trace_id.set(trace_id)
+    try:
+        yield
+    finally:
+        _current_trace_id.reset(token)
+
+
+@dataclass
+class Span:
+    """One timed operation. Phases hold the duration of the sub-steps in seconds."""
+
+    name: str
+    trace_id: str
+    span_id: str
+    parent_id: Optional[str]
+    start_time: float
+    end_time: Optional[float] = None
+    attributes: Dict[str, Any] = field(default_factory=dict)
+    phases: Dict[str, float] = field(default_factory=dict)
+    error: Optional[str] = None
+
+    @property
+    def duration(self) -> Optional[float]:
+        if self.end_time is None:
+            return None
+        return self.end_time - self.start_time
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+
+    def add_phase(self, name: str, seconds: float) -> None:
+        self.phases[name] = self.phases.get(name, 0.0) + seconds
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "start_time": self.start_time,
+            "end_time": self.end_time,
+            "duration": self.duration,
+            "attributes": self.attributes,
+            "phases": self.phases,
+            "error": self.error,
+        }
+
+
+class _NoopSpan:
+    """Stand-in for Span when tracing is disabled. Every method is a no-op."""
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        pass
+
+    def add_phase(self, name: str, seconds: float) -> None:
+        pass
+
+
+class _NoopSpanContext:
+    def __enter__(self) -> _NoopSpan:
+        return _NOOP_SPAN
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        return None
+
+
+_NOOP_SPAN = _NoopSpan()
+_NOOP_SPAN_CONTEXT = _NoopSpanContext()
+
+
+class TraceHook:
+    """Interface for receiving spans. Subclass and override what you need.
+    Hooks are called on the thread that runs the operation, so they should return quickly and be thread-safe.
+    """
+
+    def on_span_start(self, span: Span) -> None:
+        pass
+
+    def on_span_end(self, span: Span) -> None:
+        pass
+
+
+class Tracer:
+    """Creates spans and forwards them to the trace hook. A Tracer without a hook is a no-op."""
+
+    _hook: Optional[TraceHook] = None
+
+    def __init__(self, hook: Optional[TraceHook] = None) -> None:
+        self._hook = hook
+
+    @property
+    def enabled(self) -> bool:
+        return self._hook is not None
+
+    @property
+    def hook(self) -> Optional[TraceHook]:
+        return self._hook
+
+    def span(self, name: str, **attributes: Any):
+        """Context manager yielding a Span. Yields a shared no-op span if no hook is installed."""
+        if self._hook is None:
+            return _NOOP_SPAN_CONTEXT
+        return self._span(name, attributes)
+
+    @contextmanager
+    def _span(self, name: str, attributes: Dict[str, Any]) -> Iterator[Span]:
+        assert self._hook is not None
+        parent: Optional[Span] = _current_span.get()
+        trace_id = parent.trace_id if parent is not None else (_current_trace_id.get() or new_trace_id())
+        span = Span(
+            name=name,
+            trace_id=trace_id,
+            span_id=new_span_id(),
+            parent_id=parent.span_id if parent is not None else None,
+            start_time=time.time(),
+            attributes=attributes,
+        )
+        self._call_hook("on_span_start", span)
+        token = _current_span.set(span)
+        try:
+            yield span
+        except BaseException as e:
+            span.error = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            _current_span.reset(token)
+            span.end_time = time.time()
+            self._call_hook("on_span_end", span)
+
+    def _call_hook(self, method: str, span: Span) -> None:
+        try:
+            getattr(self._hook, method)(span)
+        except Exception as e:
+            log.warning(f"Trace hook {method} failed: {e}")
@@ -0,0 +1,285 @@
+"""HTTP transports sending the requests of APIClient.
+
+    RequestsTransport:  The requests module, with a connection per request until pooled() by the upload engine,
+                        then a requests session over a pool of keep-alive connections. Default.
+    PooledTransport:    A urllib3 pool manager without the session, hook, cookie and redirect handling that
+                        requests runs around each request. Less CPU per request, for many small uploads.
+    LoopbackTransport:  Answers every request in this process, without a network. Consumes the bodies chunk by chunk
+                        like a socket, so that a benchmark of the upload pipeline measures the SDK alone.
+
+A transport takes the keyword arguments of the requests functions that APIClient uses, i.e. headers, params, json,
+data and timeout, returns a requests.Response and raises the exceptions of requests, so that APIClient handles
+every transport the same way. Transports are pickled by their configuration for the worker processes of the
+process upload backend, which open their own connections.
+
+Example:
+    from podonos.core.transport import PooledTransport
+
+    client = podonos.init(api_key, transport=PooledTransport())
+"""
+
+import datetime
+import json as jsonlib
+import threading
+import time
+
+import requests
+import urllib3
+
+from requests import PreparedRequest, Response
+from requests.structures import CaseInsensitiveDict
+from typing import Any, Callable, Dict, Mapping, Optional, Tuple, Union
+from urllib.parse import urlencode, urlsplit
+
+from podonos.core.base import *
+
+# Connections kept per host by PooledTransport unless pooled() with more.
+DEFAULT_POOL_SIZE = 10
+
+Timeout = Union[None, float, Tuple[float, float]]
+
+
+def build_response(
+    url: str,
+    status: int,
+    headers: Mapping[str, str],
+    content: bytes,
+    elapsed: float,
+    reason: Optional[str] = None,
+    request: Optional[PreparedRequest] = None,
+) -> Response:
+    """requests.Response of a reply received by other means than requests."""
+    response = Response()
+    response.status_code = status
+    response.reason = reason or ""
+    response.headers = CaseInsensitiveDict(headers)
+    response.url = url
+    response.encoding = requests.utils.get_encoding_from_headers(response.headers)
+    response._content = content
+    response.elapsed = datetime.timedelta(seconds=elapsed)
+    response.request = request  # type: ignore
+    return response
+
+
+class Transport:
+    """Sends HTTP requests. Subclasses implement request()."""
+
+    # Whether APIClient may send file bodies to plain HTTP URLs with sendfile(2), on a connection of its own.
+    supports_sendfile: bool = False
+
+    def request(self, method: str, url: str, **kwargs: Any) -> Response:
+        raise NotImplementedError
+
+    def get(self, url: str, **kwargs: Any) -> Response:
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url: str, **kwargs: Any) -> Response:
+        return self.request("POST", url, **kwargs)
+
+    def put(self, url: str, **kwargs: Any) -> Response:
+        return self.request("PUT", url, **kwargs)
+
+    def pooled(self, pool_size: int) -> "Transport":
+        """Transport keeping up to pool_size connections per host. This one if it already keeps a pool."""
+        return self
+
+    def close(self) -> None:
+        pass
+
+
+class RequestsTransport(Transport):
+    supports_sendfile = True
+
+    # The requests module, or a session once pooled.
+    _http: Any = requests
+    # Connections per host of the session made by pooled(). None for a session of the caller, left as it is.
+    _pool_size: Optional[int] = None
+
+    def __init__(self, session: Optional[requests.Session] = None) -> None:
+        self._http = session if session is not None else requests
+
+    @property
+    def pool_size(self) -> Optional[int]:
+        return self._pool_size
+
+    def request(self, method: str, url: str, **kwargs: Any) -> Response:
+        # The module functions, looked up on every call, e.g. requests.put(url, data=..., headers=..., timeout=...).
+        return getattr(self._http, method.lower())(url, **kwargs)
+
+    def pooled(self, pool_size: int) -> Transport:
+        """A transport over a session of pool_size connections per host. Grows the pool of this one if it made it."""
+        log.check_gt(pool_size, 0)
+        if self._http is requests:
+            transport = RequestsTransport(requests.Session())
+            transport._mount(pool_size)
+            return transport
+        if self._pool_size is not None and pool_size > self._pool_size:
+            self._mount(pool_size)
+        return self
+
+    def _mount(self, pool_size: int) -> None:
+        old_adapter = self._http.adapters.get("http://")
+        adapter = requests.adapters.HTTPAdapter(pool_maxsize=pool_size)
+        self._http.mount("https://", adapter)
+        self._http.mount("http://", adapter)
+        self._pool_size = pool_size
+        if old_adapter is not None:
+            # The connections in use are dropped once returned.
+            old_adapter.close()
+
+    def close(self) -> None:
+        if self._http is not requests:
+            self._http.close()
+
+    def __reduce__(self) -> Tuple[Any, ...]:
+        return RequestsTransport, ()
+
+
+class PooledTransport(Transport):
+    supports_sendfile = True
+
+    _pool_size: int
+    _pool: urllib3.PoolManager
+
+    def __init__(self, pool_size: int = DEFAULT_POOL_SIZE) -> None:
+        log.check_gt(pool_size, 0)
+        self._pool_size = pool_size
+        # Failures go back to APIClient, whose callers retry.
+        self._pool = urllib3.PoolManager(maxsize=pool_size, retries=False)
+
+    @property
+    def pool_size(self) -> int:
+        return self._pool_size
+
+    def request(
+        self,
+        method: str,
+        url: str,
+        headers: Optional[Mapping[str, str]] = None,
+        params: Optional[Mapping[str, str]] = None,
+        json: Any = None,
+        data: Any = None,
+        timeout: Timeout = None,
+    ) -> Response:
+        if params:
+            url += ("&" if urlsplit(url).query else "?") + urlencode(params)
+        request_headers = dict(headers or {})
+        body = data
+        if json is not None:
+            body = jsonlib.dumps(json).encode("utf-8")
+            request_headers.setdefault("Content-Type", "application/json")
+        elif body is not None and not isinstance(body, (bytes, bytearray, memoryview, str)):
+            # Sized upload bodies go with a Content-Length, as by requests, rather than chunked.
+            request_headers.setdefault("Content-Length", str(len(body)))
+
+        start = time.perf_counter()
+        try:
+            raw = self._pool.request(method, url, body=body, headers=request_headers, timeout=_urllib3_timeout(timeout), redirect=False)
+        # As requests.adapters.HTTPAdapter maps them. A refused connection is a ConnectTimeoutError to urllib3.
+        except urllib3.exceptions.NewConnectionError as e:
+            raise requests.exceptions.ConnectionError(e)
+        except urllib3.exceptions.ConnectTimeoutError as e:
+            raise requests.exceptions.ConnectTimeout(e)
+        except urllib3.exceptions.ReadTimeoutError as e:
+            raise requests.exceptions.ReadTimeout(e)
+        except urllib3.exceptions.SSLError as e:
+            raise requests.exceptions.SSLError(e)
+        except urllib3.exceptions.HTTPError as e:
+            raise requests.exceptions.ConnectionError(e)
+        elapsed = time.perf_counter() - start
+
+        request = PreparedRequest()
+        request.method = method
+        request.url = url
+        request.headers = CaseInsensitiveDict(request_headers)
+        request.body = body if isinstance(body, bytes) else None
+        return build_response(url, raw.status, raw.headers, raw.data, elapsed, raw.reason, request)
+
+    def pooled(self, pool_size: int) -> Transport:
+        """Grows the pools to pool_size connections per host, e.g. to the number of upload workers."""
+        log.check_gt(pool_size, 0)
+        if pool_size > self._pool_size:
+            self._pool_size = pool_size
+            self._pool.clear()
+            self._pool.connection_pool_kw["maxsize"] = pool_size
+        return self
+
+    def close(self) -> None:
+        self._pool.clear()
+
+    def __reduce__(self) -> Tuple[Any, ...]:
+        return PooledTransport, (self._pool_size,)
+
+
+def _urllib3_timeout(timeout: Timeout) -> urllib3.Timeout:
+    if isinstance(timeout, tuple):
+        return urllib3.Timeout(connect=timeout[0], read=timeout[1])
+    return urllib3.Timeout(connect=timeout, read=timeout)
+
+
+# (method, url, headers, body) to (status, headers, content). The body is the JSON or the bytes sent, or None.
+LoopbackHandler = Callable[[str, str, Dict[str, str], Optional[bytes]], Tuple[int, Dict[str, str], bytes]]
+
+
+def loopback_reply(method: str, url: str, headers: Dict[str, str], body: Optional[bytes]) -> Tuple[int, Dict[str, str], bytes]:
+    """Default reply of LoopbackTransport. Presigns URLs on the same host, and accepts the rest."""
+    parts = urlsplit(url)
+    if parts.path.endswith("/uploading-presigned-url") and body is not None:
+        processed_uri = jsonlib.loads(body)["processed_uri"]
+        return 200, {"Content-Type": "application/json"}, jsonlib.dumps(f"{parts.scheme}://{parts.netloc}/upload/{processed_uri}").encode("utf-8")
+    return 200, {}, b""
+
+
+class LoopbackTransport(Transport):
+    _handler: Optional[LoopbackHandler] = None
+    _lock: threading.Lock
+    requests_received: int = 0
+    bytes_received: int = 0
+
+    def __init__(self, handler: Optional[LoopbackHandler] = None) -> None:
+        """
+        Args:
+            handler: Answers the requests, and is given the bodies. If None, loopback_reply() answers, and upload
+                     bodies are read and dropped chunk by chunk. Must be picklable for the process upload backend.
+        """
+        self._handler = handler
+        self._lock = threading.Lock()
+        self.requests_received = 0
+        self.bytes_received = 0
+
+    def request(
+        self,
+        method: str,
+        url: str,
+        headers: Optional[Mapping[str, str]] = None,
+        params: Optional[Mapping[str, str]] = None,
+        json: Any = None,
+        data: Any = None,
+        timeout: Timeout = None,
+    ) -> Response:
+        start = time.perf_counter()
+        if params:
+            url += ("&" if urlsplit(url).query else "?") + urlencode(params)
+        body: Optional[bytes] = None
+        if json is not None:
+            body = jsonlib.dumps(json).encode("utf-8")
+            size = len(body)
+        elif data is None:
+            size = 0
+        elif isinstance(data, (bytes, bytearray, memoryview)):
+            body = bytes(data)
+            size = len(body)
+        elif self._handler is not None:
+            body = b"".join(bytes(chunk) for chunk in data)
+            size = len(body)
+        else:
+            size = sum(len(chunk) for chunk in data)
+        with self._lock:
+            self.requests_received += 1
+            self.bytes_received += size
+
+        status, reply_headers, content = (self._handler or loopback_reply)(method, url, dict(headers or {}), body)
+        return build_response(url, status, reply_headers, content, time.perf_counter() - start)
+
+    def __reduce__(self) -> Tuple[Any, ...]:
+        return LoopbackTransport, (self._handler,)
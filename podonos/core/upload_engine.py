@@ -0,0 +1,209 @@
+import atexit
+import multiprocessing
+import queue
+import threading
+
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import TYPE_CHECKING, List, Optional, Tuple
+
+from podonos.core.api import APIClient
+from podonos.core.base import *
+from podonos.core.process_backend import ProcessUploadBackend
+
+if TYPE_CHECKING:
+    from podonos.core.upload_manager import UploadItem, UploadManager
+
+# Connections per upload worker in the pool. The extra one is for hedged attempts.
+_CONNECTIONS_PER_WORKER = 2
+
+
+class UploadEngine:
+    """Upload workers shared by the evaluation sessions of a process.
+
+    Each session is an UploadManager with its own queue, concurrency limiter and completion tracking.
+    The engine runs a fixed number of worker threads that take files from the sessions in turn, one file
+    per session, so that a large session doesn't starve the others. A session only gets a worker while
+    it is under its own limit of in-flight uploads.
+
+    The Client owns one engine. The worker threads and the connection pool start with the first session
+    and stay until close(). With num_processes > 0, the file bodies go through a ProcessUploadBackend instead.
+    """
+
+    _api_client: APIClient
+    _max_workers: int
+    # Guards the sessions and the cursor. Workers wait on it for new files and freed permits.
+    _condition: threading.Condition
+    _sessions: List["UploadManager"]
+    # Index of the session to take the next file from.
+    _cursor: int = 0
+    _workers: List[threading.Thread]
+    _stop_event: threading.Event
+    # Threads running the attempts of hedged uploads. Created by the first session that hedges.
+    _hedge_executor: Optional[ThreadPoolExecutor] = None
+    # Processes running the pre-upload transforms, one per core. Created by the first session that transforms.
+    _transform_executor: Optional[ProcessPoolExecutor] = None
+    # Number of worker processes for the file bodies. 0 to upload in the worker threads.
+    _num_processes: int = 0
+    _process_backend: Optional[ProcessUploadBackend] = None
+    _closed: bool = False
+
+    def __init__(self, api_client: APIClient, max_workers: int, num_processes: int = 0) -> None:
+        log.check(api_client, "api_client is not initialized")
+        log.check_gt(max_workers, 0)
+        log.check_ge(num_processes, 0)
+        self._api_client = api_client
+        self._max_workers = max_workers
+        self._num_processes = num_processes
+        self._process_backend = None
+        self._condition = threading.Condition()
+        self._sessions = []
+        self._cursor = 0
+        self._workers = []
+        self._stop_event = threading.Event()
+        self._hedge_executor = None
+        self._transform_executor = None
+        self._closed = False
+
+        atexit.register(self.close)
+
+    @property
+    def max_workers(self) -> int:
+        return self._max_workers
+
+    @property
+    def num_sessions(self) -> int:
+        with self._condition:
+            return len(self._sessions)
+
+    @property
+    def process_backend(self) -> Optional[ProcessUploadBackend]:
+        return self._process_backend
+
+    @property
+    def hedge_executor(self) -> ThreadPoolExecutor:
+        with self._condition:
+            if self._hedge_executor is None:
+                # Room for one hedged attempt per worker.
+                self._hedge_executor = ThreadPoolExecutor(max_workers=self._max_workers * 2, thread_name_prefix="podonos-hedge")
+            return self._hedge_executor
+
+    @property
+    def transform_executor(self) -> ProcessPoolExecutor:
+        with self._condition:
+            if self._transform_executor is None:
+                # Spawned, as forking a process with running upload threads isn't safe.
+                self._transform_executor = ProcessPoolExecutor(mp_context=multiprocessing.get_context("spawn"))
+            return self._transform_executor
+
+    def register(self, session: "UploadManager") -> None:
+        with self._condition:
+            if self._closed:
+                raise ValueError("Upload engine is closed")
+            self._sessions.append(session)
+            if not self._workers:
+                self._start_workers()
+        log.debug(f"Upload session is registered. {len(self._sessions)} sessions")
+
+    def unregister(self, session: "UploadManager") -> None:
+        with self._condition:
+            if session in self._sessions:
+                self._sessions.remove(session)
+                self._cursor = 0
+
+    def submit(self, session: "UploadManager", item: "UploadItem") -> None:
+        """Queues a file of the session and wakes up a worker."""
+        with self._condition:
+            session.upload_queue.put(item)
+            self._condition.notify()
+
+    def flush(self, session: "UploadManager") -> None:
+        with self._condition:
+            session.upload_queue.flush()
+            self._condition.notify_all()
+
+    def drain(self, session: "UploadManager") -> List["UploadItem"]:
+        """Takes every queued file of the session off its queue, before a worker picks it."""
+        items = []
+        with self._condition:
+            session.upload_queue.flush()
+            while True:
+                try:
+                    items.append(session.upload_queue.get_nowait())
+                except queue.Empty:
+                    return items
+
+    def notify(self) -> None:
+        """Wakes up a worker, e.g. after a session got a permit back."""
+        with self._condition:
+            self._condition.notify()
+
+    def close(self) -> None:
+        """Waits for the files of every session, then stops the workers."""
+        if self._closed:
+            return
+        with self._condition:
+            sessions = list(self._sessions)
+        for session in sessions:
+            session.wait_and_close()
+
+        with self._condition:
+            self._closed = True
+            self._stop_event.set()
+            self._condition.notify_all()
+        for worker in self._workers:
+            if worker is not threading.current_thread():
+                worker.join()
+        if self._hedge_executor is not None:
+            # Don't wait for the slower attempts of hedged uploads.
+            self._hedge_executor.shutdown(wait=False)
+        if self._transform_executor is not None:
+            self._transform_executor.shutdown()
+        if self._process_backend is not None:
+            self._process_backend.close()
+        log.debug("Upload engine is closed")
+
+    def _start_workers(self) -> None:
+        log.debug(f"Upload engine is starting {self._max_workers} workers")
+        # One pool of keep-alive connections for every upload of every session.
+        self._api_client.enable_connection_pool(self._max_workers * _CONNECTIONS_PER_WORKER)
+        if self._num_processes > 0:
+            self._process_backend = ProcessUploadBackend(self._api_client, self._num_processes, self._max_workers * _CONNECTIONS_PER_WORKER)
+        for index in range(self._max_workers):
+            worker = threading.Thread(target=self._worker, args=(index,), name=f"podonos-upload-{index}", daemon=True)
+            worker.start()
+            self._workers.append(worker)
+
+    def _pick(self) -> Optional[Tuple["UploadManager", "UploadItem"]]:
+        # Round robin over the sessions with a queued file and a free permit. Called with the lock held.
+        num_sessions = len(self._sessions)
+        for offset in range(num_sessions):
+            session = self._sessions[(self._cursor + offset) % num_sessions]
+            if not session.limiter.acquire(timeout=0):
+                continue
+            try:
+                item = session.upload_queue.get_nowait()
+            except queue.Empty:
+                session.limiter.cancel()
+                continue
+            self._cursor = (self._cursor + offset + 1) % num_sessions
+            return session, item
+        return None
+
+    def _worker(self, index: int) -> None:
+        log.debug(f"Worker {index} is ready")
+        while not self._stop_event.is_set():
+            with self._condition:
+                picked = self._pick()
+                if picked is None:
+                    # Checked under the lock, as close() may have notified since the loop condition.
+                    if not self._stop_event.is_set():
+                        # Woken up by new files and freed permits. The timeout is only a safety net.
+                        self._condition.wait(timeout=1.0)
+                    continue
+            session, item = picked
+            try:
+                session.process(index, item)
+            finally:
+                # The session may take another file now.
+                self.notify()
+        log.debug(f"Worker {index} is done")
@@ -1,46 +1,101 @@
-import atexit
+import contextvars
 import datetime
+import os
+import posixpath
 import requests
-import queue
 import threading
 import time
 
-from concurrent.futures import ThreadPoolExecutor
-from threading import Event
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError, as_completed
+from dataclasses import dataclass
 from tqdm import tqdm
-from typing import Optional
+from typing import Any, Dict, List, Optional, Tuple, Union
 
-from podonos.core.api import APIClient
+from podonos.core.api import APIClient, retries_of
+from podonos.core.audio import AudioBuffer
 from podonos.common.exception import HTTPError
+from podonos.common.util import generate_random_name
 from podonos.core.base import *
+from podonos.core.bundling import BUNDLE_CONTENT_TYPE, Bundle
+from podonos.core.concurrency import AIMDLimiter, ConcurrencyLimiter
+from podonos.core.hedging import HedgingPolicy
+from podonos.core.metrics import UploadMetrics
+from podonos.core.profiler import profile_phase
+from podonos.core.report import UploadRecord
+from podonos.core.scheduling import SCHEDULING_FIFO, UploadQueue, create_upload_queue
+from podonos.core.tracing import trace_context
+from podonos.core.transform import FLAC_CONTENT_TYPE, TransformedAudio, UploadTransform, transform_audio
+from podonos.core.upload_engine import UploadEngine
+
+
+@dataclass
+class UploadItem:
+    """One file waiting in the uploading queue."""
+
+    # A future while the evaluation is created in the background. The presign waits for it. See _evaluation_id_of().
+    evaluation_id: Union[str, "Future[str]"]
+    remote_object_name: str
+    path: str
+    size: int
+    # Trace id of the evaluation session. Spans of this upload join the session trace.
+    trace_id: Optional[str] = None
+    # Group of files evaluated together, and the number of files in it. Used by the group-atomic scheduling.
+    group: Optional[str] = None
+    group_size: int = 1
+    # Pre-upload transform running in the engine's process pool. Its encoded bytes are uploaded instead of the file.
+    transform: Optional["Future[TransformedAudio]"] = None
+    # Encoded audio in memory, uploaded instead of the file. The path is only a name then.
+    buffer: Optional[AudioBuffer] = None
+    # Files packed into this upload. The item is the bundle object then, and the size is of the files.
+    bundle: Optional[Bundle] = None
+    # Body other than audio held in memory, e.g. a part of session.json, uploaded as it is with content_type.
+    data: Optional[bytes] = None
+    content_type: Optional[str] = None
 
 
 class UploadManager:
-    """Concurrent file upload manager.
-    Internally creates multiple threads, and manages the uploading status.
+    """Upload session of one evaluation.
+    Queues the files, uploads them on the workers of an UploadEngine, and tracks their completion.
+    The engine is usually shared by every evaluation of the Client; without one, the session runs its own.
     """
 
-    # File path queue
-    # TODO: use a file queue.
-    _queue: Optional[queue.Queue] = None
-    # Total number of files added to the uploading queue.
-    _total_files: int = 0
-    _total_uploaded: int = 0
+    # File path queue. Its class decides the upload order. See podonos.core.scheduling.
+    _queue: Optional[UploadQueue] = None
+    # Counters, gauges and latency histograms. Thread-safe.
+    _metrics: Optional[UploadMetrics] = None
 
     _pbar: Optional[tqdm] = None
-    # Event to all the uploader threads
-    _worker_event: Optional[Event] = None
-    # Master daemon thread. Alive until the manager closes.
-    _daemon_thread: Optional[threading.Thread] = None
+    # Workers running the uploads.
+    _engine: Optional[UploadEngine] = None
+    # True if the engine is private to this session and closes with it.
+    _owns_engine: bool = False
     # API client for
     _api_client: Optional[APIClient] = None
     # Manager status. True if the manager is ready.
     _status: bool = False
-    # Maximum number of uploader worker threads
+    # Maximum number of in-flight uploads of this session
     _max_workers: int = 1
+    # Caps the in-flight uploads. Either fixed to _max_workers or adaptive with _max_workers as the ceiling.
+    _limiter: Optional[ConcurrencyLimiter] = None
+    # Deadlines of hedged uploads. None unless hedging is enabled.
+    _hedging: Optional[HedgingPolicy] = None
     #
     _upload_start: Optional[dict] = None
     _upload_finish: Optional[dict] = None
+    # Error message by remote object name for the files that failed to upload.
+    _upload_errors: Optional[Dict[str, str]] = None
+    # Size and timings by remote object name for the uploaded files.
+    _upload_records: Optional[Dict[str, UploadRecord]] = None
+    # Metadata of what was uploaded by remote object name, for the transformed files.
+    _transmitted: Optional[Dict[str, Dict[str, Any]]] = None
+    # Maximum bytes of files packed into one bundle. None to upload each file as its own object.
+    _bundle_max_bytes: Optional[int] = None
+    # Bundle being filled by add_file_to_queue(). Guarded by _bundle_lock.
+    _bundle: Optional[Bundle] = None
+    _bundle_lock: threading.Lock
+    # Index of every uploaded bundle, and the bundle, offset and size by remote object name of the bundled files.
+    _bundles: Optional[List[Dict[str, Any]]] = None
+    _bundle_members: Optional[Dict[str, Dict[str, Any]]] = None
 
     def get_upload_time(self):
         if not self._upload_start or not self._upload_finish:
@@ -48,35 +103,83 @@ class UploadManager:
 
         return self._upload_start, self._upload_finish
 
-    def __init__(self, api_client: APIClient, max_workers: int) -> None:
+    def get_upload_errors(self) -> Dict[str, str]:
+        return dict(self._upload_errors) if self._upload_errors else {}
+
+    def get_upload_records(self) -> Dict[str, UploadRecord]:
+        return dict(self._upload_records) if self._upload_records else {}
+
+    def get_transmitted(self) -> Dict[str, Dict[str, Any]]:
+        return dict(self._transmitted) if self._transmitted else {}
+
+    def get_bundles(self) -> List[Dict[str, Any]]:
+        return list(self._bundles) if self._bundles else []
+
+    def get_bundle_members(self) -> Dict[str, Dict[str, Any]]:
+        return dict(self._bundle_members) if self._bundle_members else {}
+
+    @property
+    def metrics(self) -> UploadMetrics:
+        log.check(self._metrics, "metrics is not initialized")
+        assert self._metrics
+        return self._metrics
+
+    @property
+    def upload_queue(self) -> UploadQueue:
+        log.check(self._queue, "queue is not initialized")
+        assert self._queue is not None
+        return self._queue
+
+    @property
+    def limiter(self) -> ConcurrencyLimiter:
+        log.check(self._limiter, "limiter is not initialized")
+        assert self._limiter is not None
+        return self._limiter
+
+    def __init__(
+        self,
+        api_client: APIClient,
+        max_workers: int,
+        metrics: Optional[UploadMetrics] = None,
+        adaptive: bool = False,
+        scheduling: str = SCHEDULING_FIFO,
+        hedging: bool = False,
+        engine: Optional[UploadEngine] = None,
+        bundle_max_bytes: Optional[int] = None,
+    ) -> None:
         log.check(api_client, "api_client is not initialized")
+        log.check_gt(max_workers, 0)
+        if bundle_max_bytes is not None:
+            log.check_gt(bundle_max_bytes, 0)
 
         self._upload_start = dict()
         self._upload_finish = dict()
+        self._upload_errors = dict()
+        self._upload_records = dict()
+        self._transmitted = dict()
+        self._bundle_max_bytes = bundle_max_bytes
+        self._bundle = None
+        self._bundle_lock = threading.Lock()
+        self._bundles = []
+        self._bundle_members = dict()
         self._api_client = api_client
-        self._queue = queue.Queue()
-        self._total_files = 0
+        self._queue = create_upload_queue(scheduling)
+        self._metrics = metrics if metrics is not None else UploadMetrics()
         self._max_workers = max_workers
-        self._worker_event = Event()
-        self._daemon_thread = threading.Thread(target=self._uploader_daemon, daemon=True)
-        self._daemon_thread.start()
+        self._limiter = AIMDLimiter(max_limit=max_workers) if adaptive else ConcurrencyLimiter(max_workers)
+        self._metrics.set_concurrency_limit(self._limiter.limit)
+        self._hedging = HedgingPolicy() if hedging else None
+        self._owns_engine = engine is None
+        self._engine = engine if engine is not None else UploadEngine(api_client, max_workers)
+        self._engine.register(self)
         self._status = True
 
-        atexit.register(self.wait_and_close)
-
-    def _uploader_daemon(self) -> None:
-        log.debug(f"Uploader daemon is running with {self._max_workers} workers")
-        with ThreadPoolExecutor(max_workers=self._max_workers) as executor:
-            for index in range(self._max_workers):
-                future = executor.submit(self._upload_worker, index, self._worker_event)
-        log.debug(f"Uploader daemon is shutting down")
-        executor.shutdown(wait=True)
-
     def _get_presigned_url_for_put_method(
         self,
         evaluation_id: str,
         remote_object_name: str,
-    ) -> str:
+    ) -> Tuple[str, int]:
+        """Returns the presigned URL, and the number of HTTP retries it took."""
         log.check_ne(evaluation_id, "")
         log.check_ne(remote_object_name, "")
 
@@ -92,7 +195,7 @@ class UploadManager:
                 },
             )
             response.raise_for_status()
-            return response.text.replace('"', "")
+            return response.text.replace('"', ""), retries_of(response)
         except requests.exceptions.HTTPError as e:
             log.error(f"HTTP error in getting a presigned url: {e}")
             raise HTTPError(
@@ -100,100 +203,332 @@ class UploadManager:
                 status_code=e.response.status_code if e.response else None,
             )
 
-    def _upload_worker(self, index, worker_event) -> None:
-        # Individual worker for uploading files. The upload manager creates multiple threads for each of this worker.
-        if not (
-            self._queue is not None
-            and self._worker_event is not None
-            and self._daemon_thread is not None
-            and self._api_client is not None
-            and self._upload_start is not None
-            and self._upload_finish is not None
-        ):
-            raise ValueError("Upload Manager is not initialized")
+    def process(self, index: int, item: UploadItem) -> None:
+        """Uploads one file taken from this session's queue. Called by the engine workers with a permit of the limiter."""
+        assert self._api_client is not None and self._limiter is not None
+        assert self._metrics is not None and self._queue is not None
+
+        success = False
+        start = time.monotonic()
+        try:
+            with trace_context(item.trace_id), self._api_client.tracer.span(
+                "upload.file", remote_object_name=item.remote_object_name, bytes=item.size, worker=index
+            ), profile_phase("upload.file"):
+                success = self._upload_item(index, item)
+        finally:
+            for file_item in _files_of(item):
+                if file_item.buffer is not None:
+                    # Frees e.g. the shared memory of the audio, uploaded or not.
+                    file_item.buffer.release()
+            self._limiter.release(success, time.monotonic() - start, item.size)
+            self._metrics.set_concurrency_limit(self._limiter.limit)
+            self._queue.task_done()
 
-        log.debug(f"Worker is {index} ready")
-        while True:
-            if not self._queue.empty():
-                item = self._queue.get()
-                evaluation_id = item[0]
-                remote_object_name = item[1]
-                path = item[2]
-
-                log.debug(f"Worker {index} presigned url request")
-                presigned_url = self._get_presigned_url_for_put_method(
-                    evaluation_id,
-                    remote_object_name,
+    def _upload_item(self, index: int, item: UploadItem) -> bool:
+        assert self._api_client is not None and self._metrics is not None
+        assert self._upload_start is not None and self._upload_finish is not None
+        assert self._upload_errors is not None and self._upload_records is not None
+        assert self._transmitted is not None and self._bundles is not None and self._bundle_members is not None
+
+        # The files of a bundle are tracked one by one, as if uploaded alone.
+        files = _files_of(item)
+        for _ in files:
+            self._metrics.on_started()
+        try:
+            log.debug(f"Worker {index} presigned url request")
+            presign_start = time.monotonic()
+            with profile_phase("upload.presign"):
+                presigned_url, presign_retries = self._get_presigned_url_for_put_method(
+                    _evaluation_id_of(item),
+                    item.remote_object_name,
                 )
-                log.debug(f"Worker {index} presigned url obtained")
-
-                log.debug(f"Worker {index} uploading {path}")
-                # Timestamp in ISO 8601.
-                upload_start_at = datetime.datetime.now().astimezone().isoformat(timespec="milliseconds")
-                self._api_client.put_file_presigned_url(presigned_url, path)
-                upload_finish_at = datetime.datetime.now().astimezone().isoformat(timespec="milliseconds")
-                log.debug(f"Worker {index} finished uploading {item}")
-
-                self._upload_start[remote_object_name] = upload_start_at
-                self._upload_finish[remote_object_name] = upload_finish_at
-                self._queue.task_done()
-                self._total_uploaded += 1
-                log.debug(f"Worker {index} total_uploaded: {self._total_uploaded}")
-                if self._pbar:
-                    self._pbar.update(1)
-
-            time.sleep(0.1)
-            if worker_event.is_set():
-                log.debug(f"Worker {index} is done")
-                return
-
-    def add_file_to_queue(self, evaluation_id: str, remote_object_name: str, path: str) -> None:
-        if not (
-            self._queue is not None
-            and self._worker_event is not None
-            and self._daemon_thread is not None
-            and self._api_client is not None
-            and self._upload_start is not None
-            and self._upload_finish is not None
-        ):
+            presign_elapsed = time.monotonic() - presign_start
+            self._metrics.on_presigned(presign_elapsed)
+            log.debug(f"Worker {index} presigned url obtained")
+
+            log.debug(f"Worker {index} uploading {item.path}")
+            # Timestamp in ISO 8601.
+            upload_start_at = datetime.datetime.now().astimezone().isoformat(timespec="milliseconds")
+            upload_start = time.monotonic()
+            with profile_phase("upload.put"):
+                retries, hedges = self._put_file(index, item, presigned_url)
+            upload_finish = time.monotonic()
+            upload_elapsed = upload_finish - upload_start
+            upload_finish_at = datetime.datetime.now().astimezone().isoformat(timespec="milliseconds")
+            log.debug(f"Worker {index} finished uploading {item}")
+        except Exception as e:
+            log.error(f"Worker {index} failed to upload {item.path}: {e}")
+            for file_item in files:
+                self._upload_errors[file_item.remote_object_name] = str(e)
+                self._metrics.on_failed()
+            if self._pbar:
+                self._pbar.update(len(files))
+            return False
+
+        for file_item in files:
+            size = file_item.size
+            if file_item.transform is not None:
+                transformed = file_item.transform.result()
+                size = transformed.size
+                self._transmitted[file_item.remote_object_name] = transformed.to_dict()
+            self._upload_start[file_item.remote_object_name] = upload_start_at
+            self._upload_finish[file_item.remote_object_name] = upload_finish_at
+            self._upload_records[file_item.remote_object_name] = UploadRecord(
+                size=size,
+                presign_sec=presign_elapsed,
+                upload_sec=upload_elapsed,
+                started_at=presign_start,
+                finished_at=upload_finish,
+                retries=presign_retries + retries,
+                hedges=hedges,
+            )
+            self._metrics.on_uploaded(size, upload_elapsed)
+        if item.bundle is not None:
+            self._bundles.append(item.bundle.index())
+            for member in item.bundle.members:
+                self._bundle_members[member.remote_object_name] = dict(member.to_dict(), remote_name=item.remote_object_name)
+        log.debug(f"Worker {index} total_uploaded: {self._metrics.files_uploaded}")
+        if self._pbar:
+            self._pbar.update(len(files))
+        return True
+
+    def _put_attempt(self, item: UploadItem, presigned_url: Optional[str] = None) -> int:
+        """Uploads the file once. Returns the number of HTTP retries it took, of the presign too if it presigns."""
+        assert self._api_client is not None
+        retries = 0
+        if presigned_url is None:
+            # A hedged attempt gets its own presigned URL and another connection, as the slow one stays checked out.
+            presigned_url, retries = self._get_presigned_url_for_put_method(_evaluation_id_of(item), item.remote_object_name)
+        if item.bundle is not None:
+            with profile_phase("upload.pack"):
+                data = item.bundle.pack(self._read_file)
+            response = self._api_client.put_data_presigned_url(presigned_url, data, BUNDLE_CONTENT_TYPE)
+            response.raise_for_status()
+            return retries + retries_of(response)
+        if item.transform is not None:
+            # Encoded in memory, so it goes from this process whatever the backend.
+            with profile_phase("upload.transform_wait"):
+                transformed = item.transform.result()
+            response = self._api_client.put_data_presigned_url(presigned_url, transformed.data, FLAC_CONTENT_TYPE)
+            response.raise_for_status()
+            return retries + retries_of(response)
+        if item.buffer is not None:
+            response = self._api_client.put_data_presigned_url(presigned_url, item.buffer.data, item.buffer.content_type)
+            response.raise_for_status()
+            return retries + retries_of(response)
+        if item.data is not None:
+            assert item.content_type is not None
+            response = self._api_client.put_data_presigned_url(presigned_url, item.data, item.content_type)
+            response.raise_for_status()
+            return retries + retries_of(response)
+        process_backend = self._engine.process_backend if self._engine is not None else None
+        if process_backend is not None:
+            result = process_backend.put_file(presigned_url, item.path)
+            log.debug(f"Uploaded {item.path} in process {result.shard} in {result.upload_sec:.3f} seconds")
+            return retries + result.retries
+        response = self._api_client.put_file_presigned_url(presigned_url, item.path)
+        response.raise_for_status()
+        return retries + retries_of(response)
+
+    @staticmethod
+    def _read_file(item: UploadItem) -> Any:
+        """Content of a file to pack into a bundle: the transformed audio, the in-memory audio or the file."""
+        if item.transform is not None:
+            return item.transform.result().data
+        if item.buffer is not None:
+            return item.buffer.data
+        with open(item.path, "rb") as f:
+            return f.read()
+
+    def _submit_attempt(self, item: UploadItem, presigned_url: Optional[str] = None) -> Future:
+        assert self._engine is not None
+        # Carries the trace context over to the executor thread.
+        context = contextvars.copy_context()
+        return self._engine.hedge_executor.submit(context.run, self._put_attempt, item, presigned_url)
+
+    def _put_file(self, index: int, item: UploadItem, presigned_url: str) -> Tuple[int, int]:
+        """Uploads the file. With hedging, starts a second attempt if the first one runs past the deadline
+        of its size class, and keeps whichever finishes first. The slower attempt runs to its end in the
+        background, bounded by the request timeouts, and its result is ignored.
+
+        Returns:
+            The number of HTTP retries of the attempt that succeeded, and the number of hedged attempts.
+        """
+        assert self._metrics is not None
+        deadline = self._hedging.deadline(item.size) if self._hedging is not None else None
+        start = time.monotonic()
+        if deadline is None:
+            retries = self._put_attempt(item, presigned_url)
+            if self._hedging is not None:
+                self._hedging.observe(item.size, time.monotonic() - start)
+            return retries, 0
+
+        assert self._hedging is not None
+        primary = self._submit_attempt(item, presigned_url)
+        try:
+            retries = primary.result(timeout=deadline)
+            self._hedging.observe(item.size, time.monotonic() - start)
+            return retries, 0
+        except FutureTimeoutError:
+            pass
+
+        log.info(f"Worker {index} hedges {item.path} after {deadline:.2f} seconds")
+        self._metrics.on_hedged()
+        hedge = self._submit_attempt(item)
+        error: Optional[BaseException] = None
+        for future in as_completed([primary, hedge]):
+            error = future.exception()
+            if error is None:
+                self._hedging.observe(item.size, time.monotonic() - start)
+                return future.result(), 1
+        assert error is not None
+        raise error
+
+    def add_file_to_queue(
+        self,
+        evaluation_id: Union[str, "Future[str]"],
+        remote_object_name: str,
+        path: str,
+        trace_id: Optional[str] = None,
+        group: Optional[str] = None,
+        group_size: int = 1,
+        transform: Optional[UploadTransform] = None,
+        buffer: Optional[AudioBuffer] = None,
+    ) -> None:
+        if not self._status or self._engine is None:
             raise ValueError("Upload Manager is not initialized")
 
         log.debug(f"Added: {path}")
-        self._queue.put((evaluation_id, remote_object_name, path))
-        self._total_files += 1
+        size = buffer.size if buffer is not None else os.path.getsize(path)
+        self.metrics.on_queued(size)
+        transformed = None
+        if transform is not None:
+            # Starts right away, so that the transforms run ahead of the uploads.
+            source = bytes(buffer.data) if buffer is not None else path
+            transformed = self._engine.transform_executor.submit(transform_audio, source, transform)
+        item = UploadItem(evaluation_id, remote_object_name, path, size, trace_id, group, group_size, transformed, buffer)
+        if self._bundle_max_bytes is not None and size < self._bundle_max_bytes // 2:
+            self._add_to_bundle(item)
+        else:
+            # Long recordings go alone, streamed from the file rather than read into a bundle.
+            self._engine.submit(self, item)
+
+    def add_data_to_queue(
+        self,
+        evaluation_id: Union[str, "Future[str]"],
+        remote_object_name: str,
+        data: bytes,
+        content_type: str,
+        trace_id: Optional[str] = None,
+    ) -> None:
+        """Queues a body held in memory that isn't audio, e.g. a part of session.json. Never bundled."""
+        if not self._status or self._engine is None:
+            raise ValueError("Upload Manager is not initialized")
+
+        log.debug(f"Added: {remote_object_name}")
+        self.metrics.on_queued(len(data))
+        item = UploadItem(evaluation_id, remote_object_name, remote_object_name, len(data), trace_id, data=data, content_type=content_type)
+        self._engine.submit(self, item)
+
+    def _add_to_bundle(self, item: UploadItem) -> None:
+        """Packs a small file into the current bundle. A bundle never exceeds the bound: it goes before it would."""
+        assert self._bundle_max_bytes is not None
+        full = []
+        with self._bundle_lock:
+            if self._bundle is not None and self._bundle.size + item.size > self._bundle_max_bytes:
+                full.append(self._bundle)
+                self._bundle = None
+            if self._bundle is None:
+                # Next to the files, under the same prefix.
+                prefix = posixpath.dirname(item.remote_object_name)
+                self._bundle = Bundle(posixpath.join(prefix, f"bundle-{generate_random_name()}.tar"))
+            self._bundle.add(item)
+            if self._bundle.size >= self._bundle_max_bytes:
+                full.append(self._bundle)
+                self._bundle = None
+        for bundle in full:
+            self._submit_bundle(bundle)
+
+    def _submit_bundle(self, bundle: Bundle) -> None:
+        assert self._engine is not None
+        first = bundle.items[0]
+        log.debug(f"Bundle {bundle.remote_object_name}: {len(bundle.items)} files, {bundle.size} bytes")
+        name = bundle.remote_object_name
+        self._engine.submit(self, UploadItem(first.evaluation_id, name, name, bundle.size, first.trace_id, bundle=bundle))
 
     def wait_and_close(self) -> bool:
         if not self._status:
             return False
 
-        if not (self._queue is not None and self._worker_event is not None and self._daemon_thread is not None):
+        if not (self._queue is not None and self._engine is not None):
             raise ValueError("Upload Manager is not initialized")
-        log.debug(f"total_files: {self._total_files}")
-        self._pbar = tqdm(total=self._total_files, dynamic_ncols=True)
-        self._pbar.update(self._total_uploaded)
+        log.debug(f"total_files: {self.metrics.files_queued}")
+        self._pbar = tqdm(total=self.metrics.files_queued, dynamic_ncols=True)
+        self._pbar.update(self.metrics.files_done)
+
+        # The last bundle goes as it is.
+        with self._bundle_lock:
+            bundle, self._bundle = self._bundle, None
+        if bundle is not None:
+            self._submit_bundle(bundle)
 
-        # Block until all tasks are done.
+        # Block until all tasks of this session are done.
         log.debug("Queue join")
-        self._queue.join()
+        self._engine.flush(self)
+        self._close()
+        log.info("All upload work complete.")
+        return True
 
-        # Signal all the workers to exit.
-        log.debug("Set exit event to workers")
-        self._worker_event.set()
-        # Shutdown the executor.
-        log.debug("Shutdown uploader daemon")
-        self._daemon_thread.join()
+    def cancel(self) -> bool:
+        """Stops the uploads: drops the files still queued, and only waits for those being uploaded.
+        The dropped files are recorded as upload errors.
+        """
+        if not self._status:
+            return False
 
-        self._pbar.close()
-        log.info("All upload work complete.")
-        self._status = False
+        if not (self._queue is not None and self._engine is not None and self._upload_errors is not None):
+            raise ValueError("Upload Manager is not initialized")
+        with self._bundle_lock:
+            bundle, self._bundle = self._bundle, None
+        dropped = self._engine.drain(self)
+        files = [file_item for item in dropped for file_item in _files_of(item)]
+        if bundle is not None:
+            files.extend(bundle.items)
+        for file_item in files:
+            if file_item.transform is not None:
+                file_item.transform.cancel()
+            if file_item.buffer is not None:
+                file_item.buffer.release()
+            self._upload_errors[file_item.remote_object_name] = "Cancelled"
+            self.metrics.on_failed()
+        for _ in dropped:
+            self._queue.task_done()
+        log.info(f"Upload is cancelled. {len(files)} queued files are dropped")
+
+        log.debug("Queue join")
+        self._close()
         return True
 
-    def _check_if_initialize(self) -> bool:
-        return (
-            self._queue is not None
-            and self._worker_event is not None
-            and self._daemon_thread is not None
-            and self._api_client is not None
-            and self._upload_start is not None
-            and self._upload_finish is not None
-        )
+    def _close(self) -> None:
+        assert self._queue is not None and self._engine is not None
+        self._queue.join()
+        self._status = False
+
+        self._engine.unregister(self)
+        if self._owns_engine:
+            log.debug("Shutdown the private upload engine")
+            self._engine.close()
+
+        if self._pbar:
+            self._pbar.close()
+
+
+def _evaluation_id_of(item: UploadItem) -> str:
+    """The evaluation id of the item, waiting for the evaluation if it is being created."""
+    if isinstance(item.evaluation_id, Future):
+        return item.evaluation_id.result()
+    return item.evaluation_id
+
+
+def _files_of(item: UploadItem) -> List[UploadItem]:
+    return item.bundle.items if item.bundle is not None else [item]
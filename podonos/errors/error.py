@@ -1,3 +1,8 @@
+from typing import Any, Dict, List, Optional
+
+from requests import HTTPError
+
+
 class NotSupportedError(Exception):
     """Exception raised for unsupported operations."""
 
@@ -12,3 +17,18 @@ class InvalidFileError(Exception):
     def __init__(self, message="This file is invalid"):
         self.message = message
         super().__init__(self.message)
+
+
+class EvaluatorsCreationError(HTTPError):
+    """Exception raised when some evaluators of Client.create_evaluators() fail to be created.
+
+    Attributes:
+        evaluators: Evaluators in the order of the configs, None for those that failed. The others are created and open.
+        errors: Error by the index of each config that failed.
+    """
+
+    def __init__(self, message: str, evaluators: List[Optional[Any]], errors: Dict[int, BaseException]):
+        self.message = message
+        self.evaluators = evaluators
+        self.errors = errors
+        super().__init__(self.message)
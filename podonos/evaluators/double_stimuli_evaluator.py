@@ -1,13 +1,17 @@
 import time
 import uuid
-from typing import Union, List
+from typing import Optional, Union, List
 
 from podonos.common.enum import EvalType, QuestionFileType
 from podonos.core.api import APIClient
 from podonos.core.base import *
 from podonos.core.config import EvalConfig
+from podonos.core.distributed import Shard
+from podonos.core.evaluation import Evaluation
 from podonos.core.evaluator import Evaluator
 from podonos.core.file import File
+from podonos.core.profiler import profiled
+from podonos.core.upload_engine import UploadEngine
 from podonos.errors.error import NotSupportedError
 
 
@@ -17,14 +21,18 @@ class DoubleStimuliEvaluator(Evaluator):
         supported_evaluation_types: List[EvalType],
         api_client: APIClient,
         eval_config: Union[EvalConfig, None] = None,
+        upload_engine: Optional[UploadEngine] = None,
+        evaluation: Optional[Evaluation] = None,
+        shard: Optional[Shard] = None,
     ):
         log.check(api_client, "api_client is not initialized")
-        super().__init__(api_client, eval_config)
+        super().__init__(api_client, eval_config, upload_engine, evaluation, shard)
         self._supported_evaluation_types = supported_evaluation_types
 
     def add_file(self, file: File) -> None:
         raise NotSupportedError("The 'add_file' is only supported in single file evaluation types: " "{'NMOS', 'QMOS', 'P808'}")
 
+    @profiled("add_files")
     def add_files(self, file0: File, file1: File) -> None:
         """Adds files for speech evaluation in an ordered or unordered way. If the evaluation requires an order of
         the input files, the order is kept strictly. The files will be securely uploaded to Podonos service system.
@@ -50,6 +58,7 @@ class DoubleStimuliEvaluator(Evaluator):
 
         if not self._initialized:
             raise ValueError("Try to add_files once the evaluator is not initialized.")
+        self._check_open_for_files()
 
         eval_config = self._get_eval_config()
         if eval_config.eval_type not in self._supported_evaluation_types:
@@ -76,8 +85,15 @@ class DoubleStimuliEvaluator(Evaluator):
             audio1 = self._set_audio(file=file1, group=group, type=audio1_type, order_in_group=1)
         self._eval_audios.append([audio0, audio1])
 
-        self._upload_one_file(evaluation_id=self.get_evaluation_id(), remote_object_name=audio0.remote_object_name, path=audio0.path)
-        self._upload_one_file(evaluation_id=self.get_evaluation_id(), remote_object_name=audio1.remote_object_name, path=audio1.path)
+        for audio in [audio0, audio1]:
+            self._upload_one_file(
+                evaluation_id=self._get_upload_evaluation_id(),
+                remote_object_name=audio.remote_object_name,
+                path=audio.path,
+                buffer=audio.buffer,
+                group=group,
+                group_size=2,
+            )
 
     @staticmethod
     def _generate_random_group_name() -> str:
@@ -1,11 +1,15 @@
-from typing import Union, List
+from typing import Optional, Union, List
 
 from podonos.common.enum import EvalType, QuestionFileType
 from podonos.core.api import APIClient
 from podonos.core.base import *
 from podonos.core.config import EvalConfig
+from podonos.core.distributed import Shard
+from podonos.core.evaluation import Evaluation
 from podonos.core.evaluator import Evaluator
 from podonos.core.file import File
+from podonos.core.profiler import profiled
+from podonos.core.upload_engine import UploadEngine
 from podonos.errors.error import NotSupportedError
 
 
@@ -15,11 +19,15 @@ class SingleStimulusEvaluator(Evaluator):
         supported_evaluation_types: List[EvalType],
         api_client: APIClient,
         eval_config: Union[EvalConfig, None] = None,
+        upload_engine: Optional[UploadEngine] = None,
+        evaluation: Optional[Evaluation] = None,
+        shard: Optional[Shard] = None,
     ):
         log.check(api_client, "api_client is not initialized")
-        super().__init__(api_client, eval_config)
+        super().__init__(api_client, eval_config, upload_engine, evaluation, shard)
         self._supported_evaluation_types = supported_evaluation_types
 
+    @profiled("add_file")
     def add_file(self, file: File) -> None:
         """Add new file for speech evaluation.
         The file may be either in {wav, mp3} format. The file will be securely uploaded to
@@ -32,6 +40,8 @@ class SingleStimulusEvaluator(Evaluator):
         If you want to evaluate each audio file separately (e.g., Naturalness MOS):
             add_file(file=File(path='./test.wav', model_tag='my_new_model1', tags=['male', 'generated'],
                                script='hello there'))
+        Or straight from the output of a model, without writing a file:
+            add_file(file=File(path=(samples, 24000), model_tag='my_new_model1', name='utt001'))
 
         Returns: None
 
@@ -43,6 +53,7 @@ class SingleStimulusEvaluator(Evaluator):
 
         if not self._initialized:
             raise ValueError("Try to add file once the evaluator is closed.")
+        self._check_open_for_files()
 
         eval_config = self._get_eval_config()
         if eval_config.eval_type in self._supported_evaluation_types:
@@ -60,9 +71,10 @@ class SingleStimulusEvaluator(Evaluator):
             )
             self._eval_audios.append([audio])
             self._upload_one_file(
-                evaluation_id=self.get_evaluation_id(),
+                evaluation_id=self._get_upload_evaluation_id(),
                 remote_object_name=audio.remote_object_name,
                 path=audio.path,
+                buffer=audio.buffer,
             )
 
     def add_files(self, file0: File, file1: File) -> None:
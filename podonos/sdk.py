@@ -9,6 +9,12 @@ from podonos.common.constant import *
 from podonos.core.api import APIClient
 from podonos.core.base import *
 from podonos.core.client import Client
+from podonos.core.config import EvalConfigDefault
+from podonos.core.init_cache import InitCache
+from podonos.core.profiler import enable_profiling
+from podonos.core.rate_limit import RateLimits, set_rate_limits
+from podonos.core.tracing import TraceHook
+from podonos.core.transport import Transport
 
 
 class Podonos:
@@ -18,12 +24,37 @@ class Podonos:
     _initialized: bool = False
 
     @staticmethod
-    def init(api_key: Optional[str] = None, api_url: str = PODONOS_API_BASE_URL) -> Client:
+    def init(
+        api_key: Optional[str] = None,
+        api_url: str = PODONOS_API_BASE_URL,
+        trace_hook: Optional[TraceHook] = None,
+        profile_dir: Optional[str] = None,
+        rate_limits: Optional[RateLimits] = None,
+        max_upload_workers: int = EvalConfigDefault.MAX_UPLOAD_WORKERS,
+        upload_processes: int = 0,
+        transport: Optional[Transport] = None,
+        init_cache_ttl_sec: Optional[float] = None,
+        lazy_init: bool = False,
+    ) -> Client:
         """Initializes the SDK. This function must be called before calling other functions.
         Raises error on invalid or missing API key. Also, raises exception on other failures.
         Args:
             api_key: API Key. If not set, try to read PODONOS_API_KEY. If both are not set, raises an error. Optional.
             api_url: URL for API access. Optional.
+            trace_hook: Receives a span for every HTTP call and upload phase. See podonos.core.tracing. Optional.
+            profile_dir: Enables the profiling mode and writes the profiles into this directory.
+                         If not set, try to read PODONOS_PROFILE. See podonos.core.profiler. Optional.
+            rate_limits: Limits on requests per second by endpoint class and on upload bytes per second,
+                         shared by every evaluator in this process. See podonos.core.rate_limit. Optional.
+            max_upload_workers: The number of upload workers shared by all the evaluators of the client. Default: 20
+            upload_processes: Uploads the file bodies in this many worker processes, for hosts where one process
+                         can't fill the link. Requires an if __name__ == "__main__": guard. See podonos.core.process_backend. Default: 0
+            transport: Sends the HTTP requests, e.g. a PooledTransport. See podonos.core.transport.
+                         Default: RequestsTransport
+            init_cache_ttl_sec: Caches the success of the version check and the API key verification on disk for
+                         this many seconds, for processes that start often. If not set, try to read PODONOS_INIT_CACHE_TTL.
+                         See podonos.core.init_cache. Default: no cache
+            lazy_init: Defers the checks until the first request, which then raises their errors. Default: False
 
         Returns: Client
 
@@ -56,9 +87,21 @@ class Podonos:
                 f"Please use a valid API key or visit {PODONOS_HOME}." + TerminalColor.ENDC
             )
 
-        api_client = APIClient(final_api_key, api_url)
+        final_profile_dir = profile_dir or os.environ.get(PODONOS_PROFILE, None)
+        if final_profile_dir:
+            enable_profiling(final_profile_dir)
+
+        if rate_limits is not None:
+            set_rate_limits(rate_limits)
+
+        api_client = APIClient(final_api_key, api_url, trace_hook=trace_hook, transport=transport)
         log.check(api_client, "api_client is not properly initiated.")
 
+        final_init_cache_ttl_sec = init_cache_ttl_sec
+        if final_init_cache_ttl_sec is None and os.environ.get(PODONOS_INIT_CACHE_TTL):
+            final_init_cache_ttl_sec = float(os.environ[PODONOS_INIT_CACHE_TTL])
+        init_cache = InitCache(final_init_cache_ttl_sec) if final_init_cache_ttl_sec else None
+
         Podonos._api_client = api_client
-        Podonos._initialized = api_client.initialize()
-        return Client(api_client)
+        Podonos._initialized = api_client.initialize(cache=init_cache, lazy=lazy_init)
+        return Client(api_client, max_upload_workers=max_upload_workers, upload_processes=upload_processes)
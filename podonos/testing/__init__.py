@@ -0,0 +1 @@
+from .fake_backend import PROFILES, FakeBackend, FakeBackendProfile, free_port, serve_forever, wait_for_port
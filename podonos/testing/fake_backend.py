@@ -0,0 +1,486 @@
+"""In-process fake of the Podonos API and its object store, for offline tests and benchmarks.
+
+FakeBackend serves the endpoints the SDK uses: version/sdk, customers/verify/api-key, evaluations (also in bulk), the
+presigned URL of a file, files, templates, stats, and the presigned PUTs of the files and session.json, also in parts
+(see podonos.core.session_parts). Each request is routed by handle(), either from a local HTTP server:
+
+    with FakeBackend(PROFILES["broadband"]) as backend:
+        client = podonos.init(api_key="fake-key", api_url=backend.base_url)
+
+or without sockets, as the handler of a loopback transport, to leave the network out of a measurement:
+
+    backend = FakeBackend()
+    client = podonos.init(api_key="fake-key", api_url="http://fake", transport=LoopbackTransport(backend.handle))
+
+The profile sets the latency of each request, the bandwidth of the link shared by all the uploads and of each upload,
+the congestion of the link, and the rate of injected 503 and 429 responses. With a seed, the injected errors repeat
+from run to run. The server can also run in a process of its own, with serve_forever(), and serve HTTPS.
+"""
+
+import datetime
+import itertools
+import json
+import random
+import re
+import socket
+import ssl
+import threading
+import time
+import uuid
+
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from urllib.parse import parse_qs, unquote, urlsplit
+
+import podonos
+
+from podonos.core.base import *
+from podonos.core.bundling import unpack_bundle
+from podonos.core.rate_limit import ENDPOINT_CLASS_API, ENDPOINT_CLASS_PRESIGN, ENDPOINT_CLASS_STORAGE
+from podonos.core.session_parts import SESSION_JSON_NAME, assemble_session_json
+
+# (status, headers, content) of a reply.
+Reply = Tuple[int, Dict[str, str], bytes]
+
+_UPLOAD_PREFIX = "/upload/"
+_EVALUATION_ROUTE = re.compile(r"^/evaluations/(?P<id>[^/]+)/(?P<action>uploading-presigned-url|files|stats)$")
+_CHUNK_SIZE = 64 * 1024
+
+
+@dataclass(frozen=True)
+class FakeBackendProfile:
+    # Seconds before every reply.
+    latency_sec: float = 0.0
+    # Bytes per second of the link shared by every upload. None for no limit.
+    upload_bytes_per_sec: Optional[float] = None
+    # Bytes per second of each upload, like the TCP window of a long-haul link. None for no limit.
+    connection_bytes_per_sec: Optional[float] = None
+    # Number of concurrent uploads past which the shared link degrades, like a congested link dropping packets and
+    # retransmitting: its bandwidth is scaled by (knee / uploads) ** degradation. None for no congestion.
+    congestion_knee: Optional[int] = None
+    congestion_degradation: float = 1.0
+    # Fractions of the requests answered with 503 Service Unavailable, and with 429 Too Many Requests.
+    error_rate: float = 0.0
+    throttle_rate: float = 0.0
+    # Retry-After of the 429 responses, in seconds.
+    retry_after_sec: int = 0
+    # Endpoint classes whose requests may get an injected error. See podonos.core.rate_limit.
+    error_endpoints: Tuple[str, ...] = (ENDPOINT_CLASS_PRESIGN, ENDPOINT_CLASS_STORAGE)
+    seed: Optional[int] = None
+
+
+PROFILES: Dict[str, FakeBackendProfile] = {
+    "local": FakeBackendProfile(),
+    "broadband": FakeBackendProfile(latency_sec=0.02, upload_bytes_per_sec=12.5e6),
+    "congested": FakeBackendProfile(latency_sec=0.05, upload_bytes_per_sec=2e6, throttle_rate=0.05, seed=0),
+    "flaky": FakeBackendProfile(latency_sec=0.01, error_rate=0.02, throttle_rate=0.02, seed=0),
+}
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+    # Room for the connections of many upload workers at once.
+    request_queue_size = 256
+
+
+class _Link:
+    """Paces the bytes of all uploads to one bandwidth, and of each upload to the bandwidth of a connection."""
+
+    _profile: FakeBackendProfile
+    _next_free: float = 0.0
+    _connections: int = 0
+    _lock: threading.Lock
+
+    def __init__(self, profile: FakeBackendProfile) -> None:
+        self._profile = profile
+        self._next_free = 0.0
+        self._connections = 0
+        self._lock = threading.Lock()
+
+    def transfer(self, nbytes: int) -> None:
+        if not (self._profile.upload_bytes_per_sec or self._profile.connection_bytes_per_sec) or nbytes <= 0:
+            return
+        with self._lock:
+            self._connections += 1
+        try:
+            # Chunk by chunk, so that the congestion follows the uploads that come and go.
+            for offset in range(0, nbytes, _CHUNK_SIZE):
+                self._transfer_chunk(min(_CHUNK_SIZE, nbytes - offset))
+        finally:
+            with self._lock:
+                self._connections -= 1
+
+    def _transfer_chunk(self, nbytes: int) -> None:
+        now = time.monotonic()
+        finish = now
+        if self._profile.connection_bytes_per_sec:
+            finish = now + nbytes / self._profile.connection_bytes_per_sec
+        if self._profile.upload_bytes_per_sec:
+            with self._lock:
+                bytes_per_sec = self._profile.upload_bytes_per_sec
+                knee = self._profile.congestion_knee
+                if knee and self._connections > knee:
+                    bytes_per_sec *= (knee / self._connections) ** self._profile.congestion_degradation
+                start = max(now, self._next_free)
+                self._next_free = start + nbytes / bytes_per_sec
+                finish = max(finish, self._next_free)
+        delay = finish - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+
+
+class FakeBackend:
+    """Fake of the Podonos API and the object store. Thread-safe."""
+
+    _profile: FakeBackendProfile
+    _api_keys: Optional[List[str]] = None
+    _port: int = 0
+    _retain: bool = True
+    _certfile: Optional[str] = None
+    _keyfile: Optional[str] = None
+    _upload_base_urls: Optional[Iterator[str]] = None
+    _lock: threading.Lock
+    _random: random.Random
+    _link: _Link
+    _server: Optional[_Server] = None
+    _thread: Optional[threading.Thread] = None
+    # Created evaluations by id, with the "files" registered to each.
+    evaluations: Dict[str, Dict[str, Any]]
+    # Uploaded bodies by remote object name, including the files of uploaded bundles, and session.json by evaluation id.
+    objects: Dict[str, bytes]
+    session_jsons: Dict[str, Dict[str, Any]]
+    # Bytes of the session.json and its parts by evaluation id, kept even if the backend doesn't retain the uploads.
+    session_json_sizes: Dict[str, int]
+    # Parts of session.json by evaluation id and name, until the index reassembles them into session_jsons.
+    session_parts: Dict[str, Dict[str, bytes]]
+    # Number of requests by endpoint class, of the injected errors, and of the bytes uploaded.
+    requests: Dict[str, int]
+    errors_injected: int = 0
+    bytes_uploaded: int = 0
+
+    def __init__(
+        self,
+        profile: Optional[FakeBackendProfile] = None,
+        api_keys: Optional[List[str]] = None,
+        port: int = 0,
+        retain: bool = True,
+        certfile: Optional[str] = None,
+        keyfile: Optional[str] = None,
+        upload_base_urls: Optional[List[str]] = None,
+    ) -> None:
+        """
+        Args:
+            profile: Latency, bandwidth and errors. Default: PROFILES["local"], i.e. none.
+            api_keys: API keys to accept. If None, any key is accepted.
+            port: Port of the HTTP server on localhost. 0 for a free one.
+            retain: Keeps the uploaded objects, the registered files and session.json. Off for benchmarks of many
+                    files, so that the memory of the process is the SDK's. The HTTP server then reads the uploads
+                    chunk by chunk, and drops them.
+            certfile: Certificate of the HTTP server, in PEM. With it, the server serves HTTPS.
+            keyfile: Private key of the certificate, if not in certfile.
+            upload_base_urls: Base URLs the presigned URLs point to in turn, e.g. of several servers that share the
+                              uploads of a benchmark. If None, they point to this backend.
+        """
+        self._profile = profile or PROFILES["local"]
+        log.check_ge(self._profile.error_rate + self._profile.throttle_rate, 0.0)
+        log.check_le(self._profile.error_rate + self._profile.throttle_rate, 1.0)
+        self._api_keys = api_keys
+        self._port = port
+        self._retain = retain
+        self._certfile = certfile
+        self._keyfile = keyfile
+        self._upload_base_urls = itertools.cycle(upload_base_urls) if upload_base_urls else None
+        self._lock = threading.Lock()
+        self._random = random.Random(self._profile.seed)
+        self._link = _Link(self._profile)
+        self.evaluations = {}
+        self.objects = {}
+        self.session_jsons = {}
+        self.session_json_sizes = {}
+        self.session_parts = {}
+        self.requests = {ENDPOINT_CLASS_API: 0, ENDPOINT_CLASS_PRESIGN: 0, ENDPOINT_CLASS_STORAGE: 0}
+        self.errors_injected = 0
+        self.bytes_uploaded = 0
+
+    @property
+    def profile(self) -> FakeBackendProfile:
+        return self._profile
+
+    @property
+    def base_url(self) -> str:
+        log.check(self._server, "The server is not started")
+        assert self._server is not None
+        host, port = self._server.server_address[:2]
+        return f"{'https' if self._certfile else 'http'}://{host}:{port}"
+
+    def start(self) -> str:
+        """Starts the HTTP server in a thread, and returns its base URL."""
+        backend = self
+
+        class _Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def _handle(self) -> None:
+                length = int(self.headers.get("Content-Length", 0))
+                url = f"{backend.base_url}{self.path}"
+                if not backend._retain and self.path.startswith(_UPLOAD_PREFIX):
+                    # Dropped anyway, so not held in memory, even for uploads of gigabytes.
+                    size = 0
+                    while size < length:
+                        chunk = self.rfile.read(min(_CHUNK_SIZE, length - size))
+                        if not chunk:
+                            break
+                        size += len(chunk)
+                    status, headers, content = backend._handle(self.command, url, dict(self.headers), None, size)
+                else:
+                    body = bytearray()
+                    while len(body) < length:
+                        chunk = self.rfile.read(min(_CHUNK_SIZE, length - len(body)))
+                        if not chunk:
+                            break
+                        body += chunk
+                    status, headers, content = backend.handle(self.command, url, dict(self.headers), bytes(body) if length else None)
+                self.send_response(status)
+                for key, value in headers.items():
+                    self.send_header(key, value)
+                self.send_header("Content-Length", str(len(content)))
+                self.end_headers()
+                self.wfile.write(content)
+
+            do_GET = do_POST = do_PUT = _handle
+
+            def log_message(self, format, *args) -> None:
+                pass
+
+        self._server = _Server(("127.0.0.1", self._port), _Handler)
+        if self._certfile:
+            context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+            context.load_cert_chain(self._certfile, self._keyfile)
+            self._server.socket = context.wrap_socket(self._server.socket, server_side=True)
+        self._thread = threading.Thread(target=self._server.serve_forever, name="podonos-fake-backend", daemon=True)
+        self._thread.start()
+        return self.base_url
+
+    def stop(self) -> None:
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def __enter__(self) -> "FakeBackend":
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.stop()
+
+    def handle(self, method: str, url: str, headers: Dict[str, str], body: Optional[bytes]) -> Reply:
+        """Answers one request. The handler of the HTTP server, and of a LoopbackTransport."""
+        return self._handle(method, url, headers, body, len(body) if body else 0)
+
+    def _handle(self, method: str, url: str, headers: Dict[str, str], body: Optional[bytes], size: int) -> Reply:
+        parts = urlsplit(url)
+        path = unquote(parts.path)
+        endpoint_class = _endpoint_class(path)
+        with self._lock:
+            self.requests[endpoint_class] += 1
+            injected = self._inject_error(endpoint_class)
+        if self._profile.latency_sec:
+            time.sleep(self._profile.latency_sec)
+        if endpoint_class == ENDPOINT_CLASS_STORAGE:
+            self._link.transfer(size)
+        if injected is not None:
+            return injected
+
+        if endpoint_class == ENDPOINT_CLASS_STORAGE:
+            if method != "PUT":
+                return _reply(405, "Method Not Allowed")
+            return self._store(path[len(_UPLOAD_PREFIX) :], body or b"", size)
+        if not self._authorized(headers):
+            return _reply(401, "Unauthorized")
+        return self._route(method, f"{parts.scheme}://{parts.netloc}", path, parse_qs(parts.query), body)
+
+    def _inject_error(self, endpoint_class: str) -> Optional[Reply]:
+        if endpoint_class not in self._profile.error_endpoints:
+            return None
+        draw = self._random.random()
+        if draw < self._profile.error_rate:
+            self.errors_injected += 1
+            return _reply(503, "Service Unavailable")
+        if draw < self._profile.error_rate + self._profile.throttle_rate:
+            self.errors_injected += 1
+            return 429, {"Retry-After": str(self._profile.retry_after_sec)}, b"Too Many Requests"
+        return None
+
+    def _authorized(self, headers: Dict[str, str]) -> bool:
+        api_key = next((value for key, value in headers.items() if key.lower() == "x-api-key"), None)
+        return bool(api_key) and (self._api_keys is None or api_key in self._api_keys)
+
+    def _route(self, method: str, base_url: str, path: str, query: Dict[str, List[str]], body: Optional[bytes]) -> Reply:
+        if method == "GET" and path == "/version/sdk":
+            return _json_reply({"minimum": "0.0.0", "recommended": "0.0.0", "latest": podonos.__version__})
+        if method == "GET" and path == "/customers/verify/api-key":
+            return _json_reply(True)
+        if path == "/evaluations" and method == "POST":
+            return _json_reply(self._create_evaluation(json.loads(body or b"{}")))
+        if path == "/evaluations/bulk" and method == "POST":
+            creations = json.loads(body or b"{}")["evaluations"]
+            return _json_reply([self._create_evaluation(request) for request in creations])
+        if path == "/evaluations" and method == "GET":
+            with self._lock:
+                return _json_reply([_evaluation_dict(evaluation) for evaluation in self.evaluations.values()])
+        if path == "/templates" and method == "POST":
+            return _json_reply({"id": str(uuid.uuid4())})
+
+        match = _EVALUATION_ROUTE.match(path)
+        if match is None:
+            return _reply(404, "Not Found")
+        evaluation_id, action = match.group("id"), match.group("action")
+        with self._lock:
+            evaluation = self.evaluations.get(evaluation_id)
+        if evaluation is None:
+            return _reply(400 if action == "stats" else 404, f"Unknown evaluation {evaluation_id}")
+        if action == "uploading-presigned-url" and method == "PUT":
+            processed_uri = json.loads(body or b"{}")["processed_uri"]
+            if self._upload_base_urls is not None:
+                with self._lock:
+                    base_url = next(self._upload_base_urls)
+            return _json_reply(f"{base_url}{_UPLOAD_PREFIX}{evaluation_id}/{processed_uri}")
+        if action == "files" and method == "PUT":
+            files = json.loads(body or b"{}")["files"]
+            with self._lock:
+                evaluation["num_files"] += len(files)
+                if self._retain:
+                    evaluation["files"].extend(files)
+            return _json_reply({"count": evaluation["num_files"]})
+        if action == "stats" and method == "GET":
+            return _json_reply(_stats(evaluation["files"]))
+        return _reply(405, "Method Not Allowed")
+
+    def _create_evaluation(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        now = datetime.datetime.now(datetime.timezone.utc).isoformat().replace("+00:00", "Z")
+        evaluation = {
+            "id": str(uuid.uuid4()),
+            "title": request.get("title"),
+            "internal_name": request.get("internal_name"),
+            "description": request.get("description"),
+            "status": "DRAFT",
+            "created_time": now,
+            "updated_time": now,
+            "request": request,
+            "files": [],
+            "num_files": 0,
+        }
+        with self._lock:
+            self.evaluations[evaluation["id"]] = evaluation
+        return _evaluation_dict(evaluation)
+
+    def _store(self, key: str, body: bytes, size: int) -> Reply:
+        evaluation_id, _, remote_object_name = key.partition("/")
+        is_session_part = remote_object_name.startswith("session.part-")
+        with self._lock:
+            self.bytes_uploaded += size
+            if remote_object_name == SESSION_JSON_NAME or is_session_part:
+                self.session_json_sizes[evaluation_id] = self.session_json_sizes.get(evaluation_id, 0) + size
+        if not self._retain:
+            return 200, {}, b""
+
+        if is_session_part:
+            with self._lock:
+                self.session_parts.setdefault(evaluation_id, {})[remote_object_name] = body
+            return 200, {}, b""
+        if remote_object_name == SESSION_JSON_NAME:
+            session_json = json.loads(body)
+            if "parts" in session_json:
+                # The server-side reassembly of the parts.
+                try:
+                    with self._lock:
+                        parts = dict(self.session_parts.get(evaluation_id, {}))
+                    session_json = assemble_session_json(session_json, parts.__getitem__)
+                except ValueError as e:
+                    return _reply(400, str(e))
+            with self._lock:
+                self.objects[remote_object_name] = body
+                self.session_jsons[evaluation_id] = session_json
+            return 200, {}, b""
+
+        stored = {remote_object_name: body}
+        if remote_object_name.endswith(".tar"):
+            # The server-side hook cuts the files out of a bundle. See podonos.core.bundling.
+            stored.update(unpack_bundle(body))
+        with self._lock:
+            self.objects.update(stored)
+        return 200, {}, b""
+
+
+def serve_forever(
+    port: int,
+    profile: Optional[FakeBackendProfile] = None,
+    certfile: Optional[str] = None,
+    keyfile: Optional[str] = None,
+    upload_base_urls: Optional[List[str]] = None,
+) -> None:
+    """Entry point of a process that serves a FakeBackend on the port. It doesn't retain the uploads."""
+    FakeBackend(profile, port=port, retain=False, certfile=certfile, keyfile=keyfile, upload_base_urls=upload_base_urls).start()
+    threading.Event().wait()
+
+
+def free_port() -> int:
+    """A free port on localhost, e.g. for the server process of serve_forever()."""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def wait_for_port(port: int, timeout: float = 30.0) -> None:
+    """Waits until a server accepts connections on the port of localhost.
+
+    Raises:
+        RuntimeError: if none does within the timeout.
+    """
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            with socket.create_connection(("127.0.0.1", port), timeout=1.0):
+                return
+        except OSError:
+            time.sleep(0.1)
+    raise RuntimeError(f"Server on port {port} didn't start")
+
+
+def _endpoint_class(path: str) -> str:
+    if path.startswith(_UPLOAD_PREFIX):
+        return ENDPOINT_CLASS_STORAGE
+    if path.endswith("/uploading-presigned-url"):
+        return ENDPOINT_CLASS_PRESIGN
+    return ENDPOINT_CLASS_API
+
+
+def _evaluation_dict(evaluation: Dict[str, Any]) -> Dict[str, Any]:
+    keys = ["id", "title", "internal_name", "description", "status", "created_time", "updated_time"]
+    return {key: evaluation[key] for key in keys}
+
+
+def _stats(files: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Constant scores for each registered file, in the format of podonos.core.stimulus_stats."""
+    return [
+        {
+            "files": [{"name": file.get("original_uri"), "model_tag": file.get("model_tag"), "tags": file.get("tags") or [], "type": "A"}],
+            "mean": 3.0,
+            "median": 3.0,
+            "std": 0.0,
+            "ci_90": 0.0,
+            "ci_95": 0.0,
+            "ci_99": 0.0,
+        }
+        for file in files
+    ]
+
+
+def _json_reply(value: Any) -> Reply:
+    return 200, {"Content-Type": "application/json"}, json.dumps(value).encode("utf-8")
+
+
+def _reply(status: int, message: str) -> Reply:
+    return status, {"Content-Type": "text/plain"}, message.encode("utf-8")
@@ -33,7 +33,7 @@ class TestAPIClient(unittest.TestCase):
 
         response = self.client.get("test-endpoint")
         self.assertEqual(response.text, "true")
-        mock_get.assert_called_once_with(f"{self.api_url}/test-endpoint", headers=self.client._headers, params=None)
+        mock_get.assert_called_once_with(f"{self.api_url}/test-endpoint", headers=self.client._headers, params=None, timeout=self.client.timeout)
 
     @patch("requests.post")
     def test_post_success(self, mock_post):
@@ -44,7 +44,7 @@ class TestAPIClient(unittest.TestCase):
         data = {"key": "value"}
         response = self.client.post("test-endpoint", data)
         self.assertEqual(response.status_code, 200)
-        mock_post.assert_called_once_with(f"{self.api_url}/test-endpoint", headers=self.client._headers, json=data)
+        mock_post.assert_called_once_with(f"{self.api_url}/test-endpoint", headers=self.client._headers, json=data, timeout=self.client.timeout)
 
     @patch("requests.put")
     def test_put_success(self, mock_put):
@@ -55,7 +55,7 @@ class TestAPIClient(unittest.TestCase):
         data = {"key": "value"}
         response = self.client.put("test-endpoint", data)
         self.assertEqual(response.status_code, 200)
-        mock_put.assert_called_once_with(f"{self.api_url}/test-endpoint", headers=self.client._headers, json=data)
+        mock_put.assert_called_once_with(f"{self.api_url}/test-endpoint", headers=self.client._headers, json=data, timeout=self.client.timeout)
 
     @patch("podonos.core.api.APIClient._check_minimum_version")
     @patch("podonos.core.api.APIClient.get")
@@ -0,0 +1,95 @@
+import io
+import os
+import unittest
+
+from unittest.mock import MagicMock
+
+import soundfile as sf
+
+from podonos.common.enum import QuestionFileType
+from podonos.core.audio import Audio, AudioBuffer
+from podonos.core.file import File
+from podonos.core.upload_manager import UploadManager
+from tests.test_audio import TESTDATA_SPEECH_CH1_MP3, TESTDATA_SPEECH_TWO_CH1_WAV
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+class TestAudioBuffer(unittest.TestCase):
+    def test_file_from_bytes(self):
+        with open(TESTDATA_SPEECH_TWO_CH1_WAV, "rb") as f:
+            data = f.read()
+        file = File(path=data, model_tag="model1", name="speech")
+        self.assertEqual("speech", file.path)
+        self.assertEqual("audio/wav", file.buffer.content_type)
+        self.assertEqual(len(data), file.buffer.size)
+        info = sf.info(TESTDATA_SPEECH_TWO_CH1_WAV)
+        self.assertEqual((info.channels, info.samplerate), (file.buffer.nchannels, file.buffer.framerate))
+
+    def test_file_from_stream(self):
+        with open(TESTDATA_SPEECH_CH1_MP3, "rb") as f:
+            file = File(path=f, model_tag="model1")
+        self.assertEqual("audio/mpeg", file.buffer.content_type)
+        self.assertTrue(file.path.startswith("in-memory-"))
+
+        stream = io.BytesIO(open(TESTDATA_SPEECH_TWO_CH1_WAV, "rb").read())
+        self.assertEqual(stream.getvalue(), bytes(File(path=stream, model_tag="model1").buffer.data))
+        # The stream stays writable.
+        stream.write(b"x")
+
+    def test_file_from_path_has_no_buffer(self):
+        self.assertIsNone(File(path=TESTDATA_SPEECH_TWO_CH1_WAV, model_tag="model1").buffer)
+
+    @unittest.skipIf(np is None, "numpy is not installed")
+    def test_file_from_array(self):
+        samples = np.random.default_rng(0).integers(-(2**15), 2**15, size=(24000, 2), dtype=np.int16)
+        file = File(path=(samples, 24000), model_tag="model1")
+        buffer = file.buffer
+        self.assertEqual((2, 24000, 1000, "audio/wav"), (buffer.nchannels, buffer.framerate, buffer.duration_in_ms, buffer.content_type))
+        decoded, rate = sf.read(io.BytesIO(buffer.data), dtype="int16", always_2d=True)
+        self.assertEqual(24000, rate)
+        np.testing.assert_array_equal(samples, decoded)
+
+        mono = AudioBuffer.from_array(np.zeros(16000, dtype=np.float32), 16000)
+        self.assertEqual((1, 1000), (mono.nchannels, mono.duration_in_ms))
+        self.assertEqual("FLOAT", sf.info(io.BytesIO(mono.data)).subtype)
+
+    def test_audio_takes_the_metadata_of_the_buffer(self):
+        buffer = AudioBuffer(data=b"RIFF", content_type="audio/wav", nchannels=2, framerate=48000, duration_in_ms=1500)
+        audio = Audio(
+            path="utt001",
+            name="utt001",
+            remote_object_name="remote",
+            script=None,
+            is_ref=False,
+            model_tag="model1",
+            tags=None,
+            group=None,
+            type=QuestionFileType.STIMULUS,
+            order_in_group=0,
+            buffer=buffer,
+        )
+        self.assertIs(buffer, audio.buffer)
+        self.assertEqual((2, 48000, 1500), (audio.metadata.nchannels, audio.metadata.framerate, audio.metadata.duration_in_ms))
+
+    def test_upload_manager_uploads_the_buffer(self):
+        with open(TESTDATA_SPEECH_TWO_CH1_WAV, "rb") as f:
+            buffer = AudioBuffer.from_bytes(f.read())
+        api_client = MagicMock()
+        api_client.put.return_value.text = '"http://storage/a"'
+        upload_manager = UploadManager(api_client=api_client, max_workers=1)
+        upload_manager.add_file_to_queue("AAAA1234", "ABCD1234", "utt001", buffer=buffer)
+        self.assertTrue(upload_manager.wait_and_close())
+
+        self.assertEqual({}, upload_manager.get_upload_errors())
+        api_client.put_file_presigned_url.assert_not_called()
+        api_client.put_data_presigned_url.assert_called_once_with("http://storage/a", buffer.data, "audio/wav")
+        self.assertEqual(buffer.size, upload_manager.metrics.snapshot().bytes_uploaded)
+        self.assertFalse(os.path.exists("utt001"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,130 @@
+import io
+import os
+import tarfile
+import tempfile
+import unittest
+
+from unittest.mock import MagicMock
+
+from podonos.core.audio import AudioBuffer
+from podonos.core.bundling import BUNDLE_CONTENT_TYPE, BUNDLE_INDEX_NAME, Bundle, unpack_bundle
+from podonos.core.upload_manager import UploadItem, UploadManager
+
+
+class TestBundling(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.files = {}
+        for index, size in enumerate([0, 1, 511, 512, 513, 3000]):
+            path = os.path.join(self.temp_dir.name, f"{index}.wav")
+            with open(path, "wb") as f:
+                f.write(os.urandom(size))
+            self.files[f"AAAA1234/{index}.wav"] = path
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def _read(self, item):
+        with open(item.path, "rb") as f:
+            return f.read()
+
+    def test_pack_and_unpack(self):
+        bundle = Bundle("AAAA1234/bundle.tar")
+        for remote_object_name, path in self.files.items():
+            bundle.add(UploadItem("AAAA1234", remote_object_name, path, os.path.getsize(path)))
+        self.assertEqual(sum(os.path.getsize(path) for path in self.files.values()), bundle.size)
+
+        data = bundle.pack(self._read)
+        # Packed once.
+        self.assertIs(data, bundle.pack(self._read))
+
+        expected = {name: open(path, "rb").read() for name, path in self.files.items()}
+        self.assertEqual(expected, unpack_bundle(data))
+        # A plain tar, with the index as the last member.
+        with tarfile.open(fileobj=io.BytesIO(data)) as tar:
+            self.assertEqual(list(self.files) + [BUNDLE_INDEX_NAME], tar.getnames())
+            for name in self.files:
+                self.assertEqual(expected[name], tar.extractfile(name).read())
+
+        index = bundle.index()
+        self.assertEqual(("AAAA1234/bundle.tar", "tar"), (index["remote_name"], index["format"]))
+        for member in index["members"]:
+            self.assertEqual(expected[member["remote_name"]], data[member["offset"] : member["offset"] + member["size"]])
+
+    def test_upload_manager_uploads_bundles(self):
+        api_client = MagicMock()
+        api_client.put.side_effect = lambda url, body: MagicMock(text=f'"http://storage/{body["processed_uri"]}"')
+        uploaded = {}
+
+        def put_data(url, data, content_type):
+            self.assertEqual(BUNDLE_CONTENT_TYPE, content_type)
+            uploaded[url] = bytes(data)
+            return MagicMock()
+
+        api_client.put_data_presigned_url.side_effect = put_data
+        # Three files of 3000 bytes each fill a bundle.
+        upload_manager = UploadManager(api_client=api_client, max_workers=2, bundle_max_bytes=9000)
+        for index in range(7):
+            buffer = AudioBuffer(data=bytes([index]) * 3000, content_type="audio/wav", nchannels=1, framerate=16000, duration_in_ms=94)
+            upload_manager.add_file_to_queue("AAAA1234", f"AAAA1234/{index}.wav", f"utt{index}", buffer=buffer)
+        self.assertTrue(upload_manager.wait_and_close())
+
+        self.assertEqual({}, upload_manager.get_upload_errors())
+        api_client.put_file_presigned_url.assert_not_called()
+        bundles = upload_manager.get_bundles()
+        self.assertEqual([3, 3, 1], sorted((len(bundle["members"]) for bundle in bundles), reverse=True))
+        self.assertEqual(sorted(f"http://storage/{bundle['remote_name']}" for bundle in bundles), sorted(uploaded))
+        for bundle in bundles:
+            self.assertTrue(bundle["remote_name"].startswith("AAAA1234/bundle-"))
+
+        # Every file is accounted for on its own, and can be cut out of its bundle.
+        members = upload_manager.get_bundle_members()
+        self.assertEqual({f"AAAA1234/{index}.wav" for index in range(7)}, set(members))
+        for index in range(7):
+            member = members[f"AAAA1234/{index}.wav"]
+            data = uploaded[f"http://storage/{member['remote_name']}"]
+            self.assertEqual(bytes([index]) * 3000, data[member["offset"] : member["offset"] + member["size"]])
+        self.assertEqual(7, upload_manager.metrics.snapshot().files_uploaded)
+        self.assertEqual(7 * 3000, upload_manager.metrics.snapshot().bytes_uploaded)
+        self.assertEqual(7, len(upload_manager.get_upload_records()))
+        upload_start, upload_finish = upload_manager.get_upload_time()
+        self.assertEqual(set(members), set(upload_start))
+
+    def test_large_files_go_alone(self):
+        api_client = MagicMock()
+        api_client.put.side_effect = lambda url, body: MagicMock(text=f'"http://storage/{body["processed_uri"]}"')
+        upload_manager = UploadManager(api_client=api_client, max_workers=1, bundle_max_bytes=9000)
+        # Sizes of 4000 bytes: two fill a bundle, and a third goes to the next rather than overflowing it.
+        for index in range(5):
+            buffer = AudioBuffer(data=bytes([index]) * 4000, content_type="audio/wav", nchannels=1, framerate=16000, duration_in_ms=125)
+            upload_manager.add_file_to_queue("AAAA1234", f"AAAA1234/{index}.wav", f"utt{index}", buffer=buffer)
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, "long.wav")
+            with open(path, "wb") as f:
+                f.write(b"x" * 20000)
+            upload_manager.add_file_to_queue("AAAA1234", "AAAA1234/long.wav", path)
+            self.assertTrue(upload_manager.wait_and_close())
+
+        self.assertEqual({}, upload_manager.get_upload_errors())
+        api_client.put_file_presigned_url.assert_called_once_with("http://storage/AAAA1234/long.wav", path)
+        bundles = upload_manager.get_bundles()
+        self.assertEqual([2, 2, 1], sorted((len(bundle["members"]) for bundle in bundles), reverse=True))
+        self.assertNotIn("AAAA1234/long.wav", upload_manager.get_bundle_members())
+        for bundle in bundles:
+            self.assertLessEqual(sum(member["size"] for member in bundle["members"]), 9000)
+        self.assertEqual(6, upload_manager.metrics.snapshot().files_uploaded)
+
+    def test_failed_bundle_fails_every_file(self):
+        api_client = MagicMock()
+        api_client.put.return_value.text = '"http://storage/a"'
+        api_client.put_data_presigned_url.side_effect = ValueError("rejected")
+        upload_manager = UploadManager(api_client=api_client, max_workers=1, bundle_max_bytes=1024 * 1024)
+        for remote_object_name, path in self.files.items():
+            upload_manager.add_file_to_queue("AAAA1234", remote_object_name, path)
+        self.assertTrue(upload_manager.wait_and_close())
+        self.assertEqual(set(self.files), set(upload_manager.get_upload_errors()))
+        self.assertEqual([], upload_manager.get_bundles())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,6 +1,13 @@
 import os
+import time
 import podonos
+from podonos import File
 from podonos.core.client import Client, Evaluator, SingleStimulusEvaluator, DoubleStimuliEvaluator
+from podonos.core.transport import LoopbackTransport
+from podonos.errors.error import EvaluatorsCreationError
+from podonos.testing import FakeBackend, FakeBackendProfile
+from requests import HTTPError
+from tests.test_audio import TESTDATA_SPEECH_TWO_CH1_WAV
 
 import unittest
 from unittest import mock
@@ -158,6 +165,86 @@ class TestEvaluationClient(unittest.TestCase):
         self.assertTrue("ci_99" in json)
 
 
+class TestCreateEvaluators(unittest.TestCase):
+    def _client(self, backend, handler=None):
+        return podonos.init(api_key="fake-key", api_url="http://fake", transport=LoopbackTransport(handler or backend.handle))
+
+    def test_bulk(self):
+        backend = FakeBackend()
+        client = self._client(backend)
+        evaluators = client.create_evaluators([{"name": "ckpt1"}, {"name": "ckpt2", "type": "PREF", "lan": "ko-kr"}])
+        self.assertEqual(["ckpt1", "ckpt2"], [backend.evaluations[evaluator.get_evaluation_id()]["title"] for evaluator in evaluators])
+        self.assertIsInstance(evaluators[1], DoubleStimuliEvaluator)
+        self.assertIs(evaluators[0]._upload_engine, evaluators[1]._upload_engine)
+        # The two init checks, then one request for both.
+        self.assertEqual(3, backend.requests["api"])
+
+    def test_concurrent_without_bulk_endpoint(self):
+        backend = FakeBackend(FakeBackendProfile(latency_sec=0.2))
+
+        def handler(method, url, headers, body):
+            if url.endswith("/evaluations/bulk"):
+                # As a server taking "bulk" for an evaluation id.
+                return 422, {}, b"Unprocessable Entity"
+            return backend.handle(method, url, headers, body)
+
+        client = self._client(backend, handler)
+        start = time.monotonic()
+        evaluators = client.create_evaluators([{"name": f"ckpt{index}"} for index in range(6)])
+        # Sequential creations would take 1.2 seconds.
+        self.assertLess(time.monotonic() - start, 0.8)
+        titles = [backend.evaluations[evaluator.get_evaluation_id()]["title"] for evaluator in evaluators]
+        self.assertEqual([f"ckpt{index}" for index in range(6)], titles)
+        self.assertEqual(1, len({id(evaluator._upload_engine) for evaluator in evaluators}))
+
+    def test_pool_fits_the_upload_workers_after_concurrent_creation(self):
+        with FakeBackend() as backend:
+            client = podonos.init(api_key="fake-key", api_url=backend.base_url, max_upload_workers=20)
+            client._bulk_create_supported = False
+            evaluators = client.create_evaluators([{"name": "ckpt1"}, {"name": "ckpt2"}])
+            transport = client._api_client.transport
+            self.assertEqual(2, transport.pool_size)
+
+            # The upload engine grows the pool of the creation to its workers.
+            evaluators[0].add_file(File(path=TESTDATA_SPEECH_TWO_CH1_WAV, model_tag="model1"))
+            self.assertIs(transport, client._api_client.transport)
+            self.assertEqual(40, transport.pool_size)
+            self.assertEqual(40, transport._http.get_adapter(backend.base_url)._pool_maxsize)
+            evaluators[1].add_file(File(path=TESTDATA_SPEECH_TWO_CH1_WAV, model_tag="model1"))
+            for evaluator in evaluators:
+                self.assertEqual(1, evaluator.close()["num_files"])
+
+    def test_partial_failure_returns_the_created_evaluators(self):
+        backend = FakeBackend()
+
+        def handler(method, url, headers, body):
+            if url.endswith("/evaluations/bulk"):
+                return 404, {}, b"Not Found"
+            if method == "POST" and url.endswith("/evaluations") and b"ckpt1" in body:
+                return 500, {}, b"Internal Server Error"
+            return backend.handle(method, url, headers, body)
+
+        client = self._client(backend, handler)
+        with self.assertRaises(EvaluatorsCreationError) as context:
+            client.create_evaluators([{"name": f"ckpt{index}"} for index in range(3)])
+        error = context.exception
+        self.assertIsInstance(error, HTTPError)
+        self.assertEqual([1], list(error.errors))
+        self.assertIsNone(error.evaluators[1])
+        created = [error.evaluators[0].get_evaluation_id(), error.evaluators[2].get_evaluation_id()]
+        self.assertEqual(sorted(created), sorted(backend.evaluations))
+        # Still open.
+        error.evaluators[0].add_file(File(path=TESTDATA_SPEECH_TWO_CH1_WAV, model_tag="model1"))
+        self.assertEqual(1, error.evaluators[0].close()["num_files"])
+
+    def test_invalid_config_creates_nothing(self):
+        backend = FakeBackend()
+        client = self._client(backend)
+        with self.assertRaises(ValueError):
+            client.create_evaluators([{"name": "ckpt1"}, {"name": "ckpt2", "type": "XMOS"}])
+        self.assertEqual({}, backend.evaluations)
+
+
 class TestEvaluationClientApiKey(unittest.TestCase):
     @classmethod
     def setUpClass(cls):
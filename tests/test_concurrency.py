@@ -0,0 +1,117 @@
+import itertools
+import threading
+import unittest
+
+from unittest.mock import MagicMock, patch
+
+from podonos.core.concurrency import AIMDLimiter, ConcurrencyLimiter
+from podonos.core.upload_manager import UploadManager
+from tests.test_audio import TESTDATA_SPEECH_CH1_MP3
+
+
+class TestConcurrencyLimiter(unittest.TestCase):
+    def test_fixed_limit(self):
+        limiter = ConcurrencyLimiter(2)
+        self.assertTrue(limiter.acquire(timeout=0))
+        self.assertTrue(limiter.acquire(timeout=0))
+        self.assertFalse(limiter.acquire(timeout=0))
+
+        limiter.release(True, 0.1, 100)
+        self.assertTrue(limiter.acquire(timeout=0))
+        limiter.cancel()
+        self.assertEqual(1, limiter.in_flight)
+        self.assertEqual(2, limiter.limit)
+
+    def test_release_wakes_up_waiter(self):
+        limiter = ConcurrencyLimiter(1)
+        limiter.acquire()
+        acquired = []
+        waiter = threading.Thread(target=lambda: acquired.append(limiter.acquire(timeout=5)))
+        waiter.start()
+        limiter.release(True, 0.1, 100)
+        waiter.join()
+        self.assertEqual([True], acquired)
+
+
+class TestAIMDLimiter(unittest.TestCase):
+    def setUp(self):
+        # Each reading of the clock advances it by 1 ms, so the throughput of a window doesn't depend on the host load.
+        clock = itertools.count(start=0.0, step=0.001)
+        patcher = patch("podonos.core.concurrency.time.monotonic", side_effect=lambda: next(clock))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _complete_window(self, limiter, success=True, latency=0.1, size=1000):
+        for _ in range(max(limiter.limit, 2)):
+            limiter.acquire(timeout=0)
+            limiter.release(success, latency, size)
+
+    def test_additive_increase_up_to_ceiling(self):
+        limiter = AIMDLimiter(max_limit=4, initial_limit=2)
+        for _ in range(10):
+            self._complete_window(limiter)
+        self.assertEqual(4, limiter.limit)
+        self.assertEqual(2, limiter.history[0])
+
+    def test_slow_start(self):
+        limiter = AIMDLimiter(max_limit=64, initial_limit=2)
+        self._complete_window(limiter)
+        self._complete_window(limiter)
+        self.assertEqual([2, 4, 8], limiter.history)
+
+        self._complete_window(limiter, success=False)
+        self.assertEqual(5, limiter.limit)
+        self._complete_window(limiter)
+        self.assertEqual(6, limiter.limit)
+
+    def test_decrease_on_errors(self):
+        limiter = AIMDLimiter(max_limit=20, initial_limit=10)
+        self._complete_window(limiter, success=False)
+        self.assertEqual(7, limiter.limit)
+
+    def test_decrease_on_latency_growth(self):
+        # At the ceiling, so that the windows carry the same throughput.
+        limiter = AIMDLimiter(max_limit=10, initial_limit=10)
+        self._complete_window(limiter, latency=0.1)
+        self._complete_window(limiter, latency=1.0)
+        self.assertEqual(7, limiter.limit)
+
+    def test_latency_growth_with_more_throughput_is_no_congestion(self):
+        # A window of twice the uploads carries twice the bytes on the clock of the test.
+        limiter = AIMDLimiter(max_limit=64, initial_limit=8)
+        self._complete_window(limiter, latency=0.1)
+        self._complete_window(limiter, latency=0.3)
+        self.assertEqual([8, 16, 17], limiter.history)
+
+    def test_recovers_to_the_ceiling_while_latency_is_flat(self):
+        limiter = AIMDLimiter(max_limit=64, initial_limit=32)
+        self._complete_window(limiter)
+        self._complete_window(limiter, success=False)
+        self.assertEqual(44, limiter.limit)
+        # One permit right after the back-off, then doubling again.
+        for _ in range(2):
+            self._complete_window(limiter)
+        self.assertEqual([32, 64, 44, 45, 64], limiter.history)
+
+    def test_never_below_minimum(self):
+        limiter = AIMDLimiter(max_limit=20, initial_limit=2, min_limit=2)
+        for _ in range(5):
+            self._complete_window(limiter, success=False)
+        self.assertEqual(2, limiter.limit)
+
+
+class TestAdaptiveUploadManager(unittest.TestCase):
+    def test_adaptive_upload(self):
+        upload_manager = UploadManager(api_client=MagicMock(), max_workers=8, adaptive=True)
+        for index in range(20):
+            upload_manager.add_file_to_queue("AAAA1234", f"ABCD{index}", TESTDATA_SPEECH_CH1_MP3)
+        self.assertTrue(upload_manager.wait_and_close())
+
+        snapshot = upload_manager.metrics.snapshot()
+        self.assertEqual(20, snapshot.files_uploaded)
+        self.assertGreaterEqual(snapshot.concurrency_limit, 1)
+        self.assertLessEqual(snapshot.concurrency_limit, 8)
+
+
+if __name__ == "__main__":
+    unittest.main()
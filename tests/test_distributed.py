@@ -0,0 +1,97 @@
+import os
+import tempfile
+import unittest
+
+import podonos
+
+from podonos import File
+from podonos.core.distributed import ShardManifest, ShardToken
+from podonos.core.transport import LoopbackTransport
+from podonos.testing import FakeBackend
+from tests.test_audio import TESTDATA_SPEECH_TWO_CH1_WAV
+
+
+class TestDistributed(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.backend = FakeBackend()
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def _client(self):
+        return podonos.init(api_key="fake-key", api_url="http://fake", transport=LoopbackTransport(self.backend.handle))
+
+    def _add_files(self, evaluator, num_files):
+        for _ in range(num_files):
+            evaluator.add_file(File(path=TESTDATA_SPEECH_TWO_CH1_WAV, model_tag="model1", tags=["tag1"]))
+
+    def test_token(self):
+        token = ShardToken({"id": "e1"}, {"name": "test"}, "20260101T000000")
+        self.assertEqual(token, ShardToken.decode(token.encode()))
+        for invalid in ["", "not a token", token.encode()[:-8]]:
+            with self.assertRaises(ValueError):
+                ShardToken.decode(invalid)
+
+    def test_merge_shards(self):
+        coordinator = self._client().create_evaluator(name="distributed", lan="ko-kr")
+        evaluation_id = coordinator.get_evaluation_id()
+        token = coordinator.get_shard_token()
+        self.assertNotIn("fake-key", token)
+        self._add_files(coordinator, 1)
+
+        manifest_paths = []
+        for rank in range(2):
+            manifest_path = os.path.join(self.temp_dir.name, f"node-{rank}.json")
+            shard = self._client().join_evaluation(token, shard_id=f"node-{rank}", manifest_path=manifest_path, max_upload_workers=2)
+            self.assertEqual(evaluation_id, shard.get_evaluation_id())
+            with self.assertRaises(ValueError):
+                shard.get_shard_token()
+            self._add_files(shard, 2)
+            report = shard.close()
+            self.assertEqual((f"node-{rank}", manifest_path, 2), (report["shard_id"], report["manifest_path"], report["num_files"]))
+            manifest_paths.append(manifest_path)
+        # The nodes only upload their files.
+        self.assertEqual({}, self.backend.session_jsons)
+        self.assertEqual([], self.backend.evaluations[evaluation_id]["files"])
+
+        coordinator.add_shard_manifests(manifest_paths)
+        with self.assertRaises(ValueError):
+            coordinator.add_shard_manifests(manifest_paths[:1])
+        report = coordinator.close()
+        self.assertEqual((1, 2, 4), (report["num_files"], report["num_shards"], report["num_shard_files"]))
+
+        files = self.backend.evaluations[evaluation_id]["files"]
+        self.assertEqual(5, len(files))
+        session_json = self.backend.session_jsons[evaluation_id]
+        self.assertEqual(["node-0", "node-1"], session_json["shards"])
+        self.assertEqual("ko-kr", session_json["eval_language"])
+        audios = [audio for audio_list in session_json["files"] for audio in audio_list]
+        # Every node names its files under the prefix of the coordinator.
+        for audio in audios:
+            self.assertIn(session_json["eval_creation_timestamp"], audio["remote_name"])
+        self.assertEqual(sorted(file["processed_uri"] for file in files), sorted(audio["remote_name"] for audio in audios))
+        for audio in audios:
+            self.assertIn(audio["remote_name"], self.backend.objects)
+
+    def test_rejects_manifests_of_other_evaluations(self):
+        client = self._client()
+        coordinator = client.create_evaluator()
+        other = client.create_evaluator()
+        other_id = other.get_evaluation_id()
+        manifest_path = os.path.join(self.temp_dir.name, "node.json")
+        shard = client.join_evaluation(other.get_shard_token(), shard_id="node", manifest_path=manifest_path)
+        self._add_files(shard, 1)
+        shard.close()
+        with self.assertRaises(ValueError):
+            coordinator.add_shard_manifests([manifest_path])
+        with self.assertRaises(ValueError):
+            client.join_evaluation("invalid", shard_id="node", manifest_path=manifest_path)
+
+        other.add_shard_manifests([ShardManifest.load(manifest_path)])
+        self.assertEqual(1, other.close()["num_shard_files"])
+        self.assertEqual(1, len(self.backend.evaluations[other_id]["files"]))
+
+
+if __name__ == "__main__":
+    unittest.main()
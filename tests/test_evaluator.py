@@ -1,4 +1,6 @@
 import os
+import threading
+import time
 import unittest
 import requests
 
@@ -6,14 +8,19 @@ from datetime import datetime
 from typing import Optional
 from unittest.mock import Mock, patch, MagicMock
 
-from podonos.common.enum import QuestionFileType
+from podonos.common.enum import EvalType, QuestionFileType
 from podonos.common.exception import HTTPError
 from podonos.core.api import APIClient
 from podonos.core.config import EvalConfig
 from podonos.core.evaluation import Evaluation
 from podonos.core.evaluator import Evaluator
 from podonos.core.file import File
-from tests.test_audio import TESTDATA_SPEECH_CH1_MP3
+from podonos.core.key_layout import get_key_layout
+from podonos.core.tracing import Tracer
+from podonos.core.transport import LoopbackTransport
+from podonos.evaluators.single_stimulus_evaluator import SingleStimulusEvaluator
+from podonos.testing import FakeBackend, FakeBackendProfile
+from tests.test_audio import TESTDATA_SPEECH_CH1_MP3, TESTDATA_SPEECH_TWO_CH1_WAV
 
 
 class MockEvaluator(Evaluator):
@@ -40,6 +47,11 @@ class MockEvaluator(Evaluator):
         return evaluation
 
 
+class MockSingleStimulusEvaluator(SingleStimulusEvaluator):
+    def _create_evaluation(self) -> Evaluation:
+        return MockEvaluator._create_evaluation(self)  # type: ignore
+
+
 class TestEvaluator(unittest.TestCase):
 
     def setUp(self):
@@ -101,6 +113,18 @@ class TestEvaluator(unittest.TestCase):
         self.assertEqual(audio.type, type)
         self.assertEqual(audio.order_in_group, order_in_group)
 
+    def test_set_audio_with_hash_prefix_key_layout(self):
+        evaluator = MockEvaluator(eval_config=EvalConfig(type="NMOS", key_layout="hash_prefix"))
+        audio_file = File(path=TESTDATA_SPEECH_CH1_MP3, model_tag="model1")
+        audio = evaluator._set_audio(audio_file, None, QuestionFileType.STIMULUS, 0)
+
+        flat_name = get_key_layout("hash_prefix").original(audio.remote_object_name)
+        self.assertTrue(flat_name.startswith(f"{evaluator._eval_config.eval_creation_timestamp}/"))
+        self.assertEqual(audio.remote_object_name, audio.to_dict()["remote_name"])
+        self.assertEqual("hash_prefix", evaluator._eval_config.to_dict()["key_layout"])
+        # session.json of the flat layout is unchanged.
+        self.assertNotIn("key_layout", EvalConfig(type="NMOS").to_dict())
+
     @patch("os.path.isfile")
     @patch("os.access")
     def test_validate_path_success(self, mock_access, mock_isfile):
@@ -148,6 +172,139 @@ class TestEvaluator(unittest.TestCase):
         mock_isfile.assert_called_once_with(unreadable_path)
         mock_access.assert_called_once_with(unreadable_path, os.R_OK)
 
+    def test_close_returns_report(self):
+        api_client = MagicMock()
+        api_client.tracer = Tracer()
+        evaluator = MockSingleStimulusEvaluator(
+            supported_evaluation_types=[EvalType.NMOS], api_client=api_client, eval_config=EvalConfig(type="NMOS")
+        )
+        evaluator.add_file(File(path=TESTDATA_SPEECH_CH1_MP3, model_tag="model1"))
+        evaluator.add_file(File(path=TESTDATA_SPEECH_CH1_MP3, model_tag="model2"))
+        evaluator.add_file(File(path=TESTDATA_SPEECH_TWO_CH1_WAV, model_tag="model1"))
+
+        report = evaluator.close()
+
+        mp3_size = os.path.getsize(TESTDATA_SPEECH_CH1_MP3)
+        wav_size = os.path.getsize(TESTDATA_SPEECH_TWO_CH1_WAV)
+        self.assertEqual("ok", report["status"])
+        self.assertEqual("mock_id", report["evaluation_id"])
+        self.assertEqual(3, report["num_files"])
+        self.assertEqual(2 * mp3_size + wav_size, report["total_bytes"])
+        self.assertEqual(mp3_size + wav_size, report["unique_bytes"])
+        self.assertEqual(1, report["duplicate_files"])
+        self.assertEqual((0, 0), (report["retries"], report["hedges"]))
+        self.assertIsNotNone(report["latency_p99_sec"])
+        self.assertEqual(3, len(report["slowest_files"]))
+        self.assertGreaterEqual(report["slowest_files"][0]["upload_sec"], report["slowest_files"][-1]["upload_sec"])
+        for phase in ["wait_uploads", "create_template", "register_files", "build_session_json", "upload_session_json", "total"]:
+            self.assertIn(phase, report["close_phases_sec"])
+
+    def _deferred_evaluator(self, handler):
+        api_client = APIClient("test_api_key", "http://fake", transport=LoopbackTransport(handler))
+        eval_config = EvalConfig(type="NMOS", defer_evaluation_creation=True)
+        return SingleStimulusEvaluator(supported_evaluation_types=[EvalType.NMOS], api_client=api_client, eval_config=eval_config)
+
+    def test_deferred_evaluation_creation(self):
+        backend = FakeBackend()
+        created = threading.Event()
+
+        def handler(method, url, headers, body):
+            if method == "POST" and url.endswith("/evaluations"):
+                created.wait(5)
+            return backend.handle(method, url, headers, body)
+
+        evaluator = self._deferred_evaluator(handler)
+        # Files are probed and queued while the creation waits.
+        for _ in range(3):
+            evaluator.add_file(File(path=TESTDATA_SPEECH_TWO_CH1_WAV, model_tag="model1"))
+        self.assertEqual({}, backend.evaluations)
+        created.set()
+
+        report = evaluator.close()
+        (evaluation_id,) = backend.evaluations
+        self.assertEqual((evaluation_id, 3), (report["evaluation_id"], report["num_files"]))
+        self.assertEqual(3, len(backend.evaluations[evaluation_id]["files"]))
+
+    def test_deferred_evaluation_creation_failure(self):
+        evaluator = self._deferred_evaluator(lambda method, url, headers, body: (500, {}, b"Internal Server Error"))
+        evaluator.add_file(File(path=TESTDATA_SPEECH_TWO_CH1_WAV, model_tag="model1"))
+        with self.assertRaises(HTTPError):
+            evaluator.get_evaluation_id()
+        with self.assertRaises(HTTPError):
+            evaluator.close()
+
+    def test_report_counts_retries(self):
+        backend = FakeBackend()
+        throttled = set()
+
+        def handle(method, url, headers, body):
+            # The first presign and the first PUT of every file are throttled, then succeed.
+            key = (url, body) if url.endswith("/uploading-presigned-url") else url
+            if method == "PUT" and (url.endswith("/uploading-presigned-url") or "/upload/" in url) and key not in throttled:
+                throttled.add(key)
+                return 429, {"Retry-After": "0"}, b""
+            return backend.handle(method, url, headers, body)
+
+        api_client = APIClient("test_api_key", "http://fake", transport=LoopbackTransport(handle))
+        evaluator = SingleStimulusEvaluator(supported_evaluation_types=[EvalType.NMOS], api_client=api_client, eval_config=EvalConfig(type="NMOS"))
+        for _ in range(3):
+            evaluator.add_file(File(path=TESTDATA_SPEECH_TWO_CH1_WAV, model_tag="model1"))
+        report = evaluator.close()
+        self.assertEqual((3, 6, 0), (report["num_files"], report["retries"], report["hedges"]))
+
+    def _fake_evaluators(self, backend, count):
+        api_client = APIClient("test_api_key", "http://fake", transport=LoopbackTransport(backend.handle))
+        return [
+            SingleStimulusEvaluator(supported_evaluation_types=[EvalType.NMOS], api_client=api_client, eval_config=EvalConfig(type="NMOS"))
+            for _ in range(count)
+        ]
+
+    def test_close_async(self):
+        backend = FakeBackend(FakeBackendProfile(latency_sec=0.1))
+        evaluators = self._fake_evaluators(backend, 3)
+        for evaluator in evaluators:
+            evaluator.add_file(File(path=TESTDATA_SPEECH_TWO_CH1_WAV, model_tag="model1"))
+
+        start = time.monotonic()
+        futures = [evaluator.close_async() for evaluator in evaluators]
+        self.assertLess(time.monotonic() - start, 0.1)
+        with self.assertRaises(ValueError):
+            evaluators[0].add_file(File(path=TESTDATA_SPEECH_TWO_CH1_WAV, model_tag="model1"))
+        reports = [future.result(10) for future in futures]
+        # Each close takes at least 4 round trips: the upload, the files, and the presign and PUT of session.json.
+        self.assertLess(time.monotonic() - start, 3 * 0.4)
+        self.assertEqual(sorted(backend.session_jsons), sorted(report["evaluation_id"] for report in reports))
+        self.assertIs(futures[0], evaluators[0].close_async())
+        self.assertEqual(reports[0], evaluators[0].close())
+
+    def test_context_manager(self):
+        backend = FakeBackend()
+        (first,) = self._fake_evaluators(backend, 1)
+        with first as evaluator:
+            evaluator.add_file(File(path=TESTDATA_SPEECH_TWO_CH1_WAV, model_tag="model1"))
+        self.assertIn(first.get_evaluation_id(), backend.session_jsons)
+
+        # The first evaluator uploaded a file and session.json.
+        self.assertEqual(2, backend.requests["storage"])
+
+        slow_backend = FakeBackend(FakeBackendProfile(latency_sec=0.05))
+        api_client = APIClient("test_api_key", "http://fake", transport=LoopbackTransport(slow_backend.handle))
+        second = SingleStimulusEvaluator(
+            supported_evaluation_types=[EvalType.NMOS], api_client=api_client, eval_config=EvalConfig(type="NMOS", max_upload_workers=1)
+        )
+        start = time.monotonic()
+        with self.assertRaises(RuntimeError):
+            with second as evaluator:
+                for _ in range(20):
+                    evaluator.add_file(File(path=TESTDATA_SPEECH_TWO_CH1_WAV, model_tag="model1"))
+                raise RuntimeError("model crashed")
+        # The queued files are dropped rather than uploaded, and the evaluation is not submitted.
+        self.assertLess(time.monotonic() - start, 20 * 2 * 0.05)
+        self.assertLess(slow_backend.requests["storage"], 20)
+        self.assertEqual({}, slow_backend.session_jsons)
+        with self.assertRaises(ValueError):
+            second.close()
+
     def test_paths(self):
         test_cases = [
             # Test case: paths with backslashes
@@ -0,0 +1,143 @@
+import os
+import threading
+import time
+import unittest
+
+import podonos
+
+from podonos import File
+from podonos.core.api import APIClient
+from podonos.core.transport import LoopbackTransport
+from podonos.testing import PROFILES, FakeBackend, FakeBackendProfile, free_port, wait_for_port
+from tests.test_audio import TESTDATA_SPEECH_TWO_CH1_WAV
+
+
+class TestFakeBackend(unittest.TestCase):
+    def _run_evaluation(self, client, num_files=3):
+        evaluator = client.create_evaluator(name="fake backend test", max_upload_workers=2)
+        evaluation_id = evaluator.get_evaluation_id()
+        for _ in range(num_files):
+            evaluator.add_file(File(path=TESTDATA_SPEECH_TWO_CH1_WAV, model_tag="model1", tags=["tag1"]))
+        report = evaluator.close()
+        return evaluation_id, report
+
+    def test_evaluation_over_http(self):
+        with FakeBackend() as backend:
+            client = podonos.init(api_key="fake-key", api_url=backend.base_url)
+            evaluation_id, report = self._run_evaluation(client)
+
+            self.assertEqual([evaluation_id], [evaluation["id"] for evaluation in client.get_evaluation_list()])
+            self.assertEqual(3, len(client.get_stats_dict_by_id(evaluation_id)))
+            self.assertEqual([], client.get_stats_dict_by_id("unknown"))
+
+        files = backend.evaluations[evaluation_id]["files"]
+        self.assertEqual(3, len(files))
+        with open(TESTDATA_SPEECH_TWO_CH1_WAV, "rb") as f:
+            data = f.read()
+        for file in files:
+            self.assertEqual(data, backend.objects[file["processed_uri"]])
+        session_json = backend.session_jsons[evaluation_id]
+        audios = [audio for audio_list in session_json["files"] for audio in audio_list]
+        self.assertEqual(sorted(file["processed_uri"] for file in files), sorted(audio["remote_name"] for audio in audios))
+        self.assertEqual((evaluation_id, 3), (report["evaluation_id"], report["num_files"]))
+        # A presigned URL per file and one for session.json.
+        self.assertEqual(4, backend.requests["presign"])
+
+    def test_evaluation_over_loopback(self):
+        backend = FakeBackend()
+        client = podonos.init(api_key="fake-key", api_url="http://fake", transport=LoopbackTransport(backend.handle))
+        evaluation_id, _ = self._run_evaluation(client, num_files=2)
+        self.assertEqual(2, len(backend.evaluations[evaluation_id]["files"]))
+        self.assertIn(evaluation_id, backend.session_jsons)
+
+    def test_counts_without_retaining(self):
+        backend = FakeBackend(retain=False)
+        client = podonos.init(api_key="fake-key", api_url="http://fake", transport=LoopbackTransport(backend.handle))
+        evaluation_id, _ = self._run_evaluation(client)
+        self.assertEqual(({}, {}, []), (backend.objects, backend.session_jsons, backend.evaluations[evaluation_id]["files"]))
+        self.assertEqual(3, backend.evaluations[evaluation_id]["num_files"])
+        self.assertGreater(backend.session_json_sizes[evaluation_id], 0)
+        self.assertGreater(backend.bytes_uploaded, 3 * backend.session_json_sizes[evaluation_id])
+
+    def test_port_helpers(self):
+        port = free_port()
+        with self.assertRaises(RuntimeError):
+            wait_for_port(port, timeout=0.2)
+        with FakeBackend(port=port) as backend:
+            wait_for_port(port)
+            self.assertEqual(f"http://127.0.0.1:{port}", backend.base_url)
+
+    def test_rejects_unknown_api_keys(self):
+        with FakeBackend(api_keys=["fake-key"]) as backend:
+            client = APIClient("other-key", backend.base_url)
+            self.assertEqual(401, client.get("customers/verify/api-key").status_code)
+            self.assertEqual("true", APIClient("fake-key", backend.base_url).get("customers/verify/api-key").text)
+
+    def test_injected_errors_repeat_with_a_seed(self):
+        def statuses():
+            backend = FakeBackend(FakeBackendProfile(error_rate=0.2, throttle_rate=0.2, seed=1))
+            replies = [backend.handle("PUT", "http://fake/upload/AAAA1234/a.wav", {}, b"data") for _ in range(50)]
+            return [status for status, _, _ in replies], backend
+
+        first, backend = statuses()
+        self.assertEqual(first, statuses()[0])
+        self.assertEqual({200, 429, 503}, set(first))
+        self.assertEqual(sum(status != 200 for status in first), backend.errors_injected)
+        # API requests are spared by default.
+        self.assertEqual(200, backend.handle("GET", "http://fake/version/sdk", {"X-API-KEY": "k"}, None)[0])
+
+    def test_unpacks_bundles(self):
+        with FakeBackend(PROFILES["local"]) as backend:
+            client = podonos.init(api_key="fake-key", api_url=backend.base_url)
+            evaluator = client.create_evaluator(upload_bundle_bytes=1024 * 1024)
+            evaluation_id = evaluator.get_evaluation_id()
+            for _ in range(3):
+                evaluator.add_file(File(path=TESTDATA_SPEECH_TWO_CH1_WAV, model_tag="model1"))
+            evaluator.close()
+
+        session_json = backend.session_jsons[evaluation_id]
+        self.assertEqual(1, len(session_json["bundles"]))
+        for (audio,) in session_json["files"]:
+            self.assertEqual(session_json["bundles"][0]["remote_name"], audio["bundle"]["remote_name"])
+            self.assertIn(audio["remote_name"], backend.objects)
+
+    def test_upload_bandwidth(self):
+        backend = FakeBackend(FakeBackendProfile(upload_bytes_per_sec=1e6))
+        transport = LoopbackTransport(backend.handle)
+        start = time.monotonic()
+        for _ in range(4):
+            transport.put("http://fake/upload/AAAA1234/a.wav", data=b"x" * 50000)
+        self.assertGreaterEqual(time.monotonic() - start, 0.15)
+        self.assertEqual(4, backend.requests["storage"])
+
+    def test_connection_bandwidth_and_congestion(self):
+        def elapsed(profile, num_uploads):
+            transport = LoopbackTransport(FakeBackend(profile).handle)
+            upload = lambda: transport.put("http://fake/upload/AAAA1234/a.wav", data=b"x" * 100000)
+            threads = [threading.Thread(target=upload) for _ in range(num_uploads)]
+            start = time.monotonic()
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            return time.monotonic() - start
+
+        # Each upload is capped, so that concurrent uploads take as long as one.
+        self.assertGreaterEqual(elapsed(FakeBackendProfile(connection_bytes_per_sec=1e6), 4), 0.1)
+        self.assertLess(elapsed(FakeBackendProfile(connection_bytes_per_sec=1e6), 4), 0.3)
+        # Past the knee, the shared link loses bandwidth: 4 uploads over a knee of 1 take about 4 times as long.
+        self.assertGreaterEqual(elapsed(FakeBackendProfile(upload_bytes_per_sec=4e6, congestion_knee=1), 4), 0.3)
+
+    def test_upload_base_urls(self):
+        with FakeBackend(retain=False) as storage, FakeBackend(upload_base_urls=["http://unused", storage.base_url]) as backend:
+            api_client = APIClient("fake-key", backend.base_url)
+            evaluation_id = api_client.post("evaluations", {}).json()["id"]
+            urls = [api_client.put(f"evaluations/{evaluation_id}/uploading-presigned-url", {"processed_uri": f"{i}.wav"}).json() for i in range(3)]
+            self.assertEqual(["http://unused", storage.base_url, "http://unused"], [url.split("/upload/")[0] for url in urls])
+            self.assertEqual(200, api_client.put_file_presigned_url(urls[1], TESTDATA_SPEECH_TWO_CH1_WAV).status_code)
+        # Counted, without the upload kept.
+        self.assertEqual(({}, os.path.getsize(TESTDATA_SPEECH_TWO_CH1_WAV)), (storage.objects, storage.bytes_uploaded))
+
+
+if __name__ == "__main__":
+    unittest.main()
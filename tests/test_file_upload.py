@@ -0,0 +1,155 @@
+import hashlib
+import os
+import socket
+import tempfile
+import threading
+import unittest
+
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import patch
+
+from podonos.core.api import _BODY_CHUNK_SIZE, APIClient, _FileBody
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Content-Length and digest of the bodies by path.
+    received = {}
+    # Number of 429 responses left to send.
+    throttle = 0
+
+    def do_PUT(self):
+        length = int(self.headers["Content-Length"])
+        body = self.rfile.read(length)
+        _Handler.received.setdefault(self.path, []).append((length, hashlib.sha256(body).hexdigest()))
+        status = 200
+        if _Handler.throttle > 0:
+            _Handler.throttle -= 1
+            status = 429
+        self.send_response(status)
+        self.send_header("Retry-After", "0")
+        self.send_header("Content-Length", "2")
+        self.end_headers()
+        self.wfile.write(b"ok")
+
+    def log_message(self, format, *args):
+        pass
+
+
+def _open_fds(path):
+    """Number of file descriptors of this process open on the path."""
+    fds = 0
+    for fd in os.listdir("/proc/self/fd"):
+        try:
+            fds += os.readlink(f"/proc/self/fd/{fd}") == path
+        except OSError:
+            pass
+    return fds
+
+
+class TestFileUpload(unittest.TestCase):
+    def setUp(self):
+        _Handler.received = {}
+        _Handler.throttle = 0
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}"
+        self.client = APIClient("test_api_key", self.url)
+
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.temp_dir.name, "a.wav")
+        # Spans a few chunks and ends in a partial one.
+        self.data = os.urandom(3 * _BODY_CHUNK_SIZE + 123)
+        with open(self.path, "wb") as f:
+            f.write(self.data)
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+        self.temp_dir.cleanup()
+
+    def _assert_received(self, path, count=1):
+        expected = (len(self.data), hashlib.sha256(self.data).hexdigest())
+        self.assertEqual([expected] * count, _Handler.received[path])
+
+    def test_sendfile(self):
+        with patch.object(socket.socket, "sendfile", autospec=True, side_effect=socket.socket.sendfile) as mock_sendfile:
+            response = self.client.put_file_presigned_url(f"{self.url}/a.wav?X-Signature=abc", self.path)
+        self.assertEqual(200, response.status_code)
+        self.assertEqual(b"ok", response.content)
+        self.assertEqual(1, mock_sendfile.call_count)
+        self._assert_received("/a.wav?X-Signature=abc")
+
+    def test_streaming_through_requests(self):
+        self.client._use_sendfile = False
+        with patch("socket.socket.sendfile") as mock_sendfile:
+            response = self.client.put_file_presigned_url(f"{self.url}/a.wav", self.path)
+        self.assertEqual(200, response.status_code)
+        mock_sendfile.assert_not_called()
+        self._assert_received("/a.wav")
+
+    def test_retry_after_429_sends_the_whole_body_again(self):
+        for use_sendfile in [True, False]:
+            _Handler.throttle = 1
+            self.client._use_sendfile = use_sendfile
+            response = self.client.put_file_presigned_url(f"{self.url}/{use_sendfile}", self.path)
+            self.assertEqual(200, response.status_code)
+            self._assert_received(f"/{use_sendfile}", count=2)
+
+    def test_put_data(self):
+        response = self.client.put_data_presigned_url(f"{self.url}/data.flac", self.data, "audio/flac")
+        self.assertEqual(200, response.status_code)
+        self._assert_received("/data.flac")
+
+    @unittest.skipUnless(os.path.isdir("/proc/self/fd"), "needs /proc")
+    def test_closes_the_file(self):
+        path = os.path.realpath(self.path)
+        for use_sendfile in [True, False]:
+            self.client._use_sendfile = use_sendfile
+            self.client.put_file_presigned_url(f"{self.url}/a.wav", self.path)
+            self.assertEqual(0, _open_fds(path))
+
+    def test_empty_file(self):
+        empty_path = os.path.join(self.temp_dir.name, "empty.wav")
+        open(empty_path, "wb").close()
+        for use_sendfile in [True, False]:
+            self.client._use_sendfile = use_sendfile
+            self.assertEqual(200, self.client.put_file_presigned_url(f"{self.url}/empty", empty_path).status_code)
+        self.assertEqual([(0, hashlib.sha256(b"").hexdigest())] * 2, _Handler.received["/empty"])
+
+
+class TestFileBody(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.temp_dir.name, "a.wav")
+        self.data = os.urandom(2 * _BODY_CHUNK_SIZE + 1)
+        with open(self.path, "wb") as f:
+            f.write(self.data)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_chunks(self):
+        with _FileBody(self.path) as body:
+            self.assertEqual(len(self.data), len(body))
+            chunks = [bytes(chunk) for chunk in body]
+            self.assertEqual([_BODY_CHUNK_SIZE, _BODY_CHUNK_SIZE, 1], [len(chunk) for chunk in chunks])
+            self.assertEqual(self.data, b"".join(chunks))
+            # Iterates from the start again.
+            self.assertEqual(self.data, b"".join(bytes(chunk) for chunk in body))
+
+    def test_falls_back_to_reading_if_the_file_cannot_be_mapped(self):
+        with patch("podonos.core.api._map_file", return_value=None), _FileBody(self.path) as body:
+            self.assertEqual(self.data, b"".join(bytes(chunk) for chunk in body))
+
+    def test_closes_with_a_partially_sent_body(self):
+        body = _FileBody(self.path)
+        chunks = iter(body)
+        next(chunks)
+        del chunks
+        body.close()
+        self.assertTrue(body.file.closed)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,61 @@
+import os
+import threading
+import unittest
+
+from unittest.mock import MagicMock
+
+from podonos.core.hedging import HedgingPolicy
+from podonos.core.upload_manager import UploadManager
+from tests.test_audio import TESTDATA_SPEECH_CH1_MP3
+
+
+class TestHedgingPolicy(unittest.TestCase):
+    def test_deadline_by_size_class(self):
+        policy = HedgingPolicy(percentile=0.5, min_samples=3, min_delay_sec=0.0, window=10)
+        self.assertIsNone(policy.deadline(1000))
+        for seconds in [1.0, 2.0, 3.0]:
+            policy.observe(1000, seconds)
+        self.assertEqual(2.0, policy.deadline(1000))
+        self.assertEqual(2.0, policy.deadline(600))
+        # 100 MB is in another size class without any history.
+        self.assertIsNone(policy.deadline(100_000_000))
+
+    def test_min_delay(self):
+        policy = HedgingPolicy(min_samples=1, min_delay_sec=0.5)
+        policy.observe(1000, 0.01)
+        self.assertEqual(0.5, policy.deadline(1000))
+
+
+class TestHedgedUpload(unittest.TestCase):
+    def test_slow_attempt_is_hedged(self):
+        release = threading.Event()
+        calls = []
+
+        def put_file_presigned_url(url, path):
+            calls.append(url)
+            if len(calls) == 1:
+                # The first connection is stuck until the test ends.
+                release.wait(5)
+            return MagicMock()
+
+        api_client = MagicMock()
+        api_client.put.return_value.text = "https://storage/upload"
+        api_client.put_file_presigned_url.side_effect = put_file_presigned_url
+        upload_manager = UploadManager(api_client=api_client, max_workers=1, hedging=True)
+        upload_manager._hedging = HedgingPolicy(min_samples=1, min_delay_sec=0.05)
+        upload_manager._hedging.observe(os.path.getsize(TESTDATA_SPEECH_CH1_MP3), 0.01)
+        upload_manager.add_file_to_queue("AAAA1234", "ABCD1234", TESTDATA_SPEECH_CH1_MP3)
+
+        self.assertTrue(upload_manager.wait_and_close())
+        release.set()
+
+        self.assertEqual(2, len(calls))
+        # The hedged attempt asked for a fresh presigned URL.
+        self.assertEqual(2, api_client.put.call_count)
+        self.assertEqual(1, upload_manager.metrics.snapshot().files_hedged)
+        record = upload_manager.get_upload_records()["ABCD1234"]
+        self.assertEqual((0, 1), (record.retries, record.hedges))
+
+
+if __name__ == "__main__":
+    unittest.main()
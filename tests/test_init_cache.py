@@ -0,0 +1,88 @@
+import os
+import tempfile
+import time
+import unittest
+
+import podonos
+
+from requests import HTTPError
+from unittest import mock
+
+from podonos.common.constant import PODONOS_CACHE_DIR
+from podonos.core.init_cache import InitCache
+from podonos.core.transport import LoopbackTransport
+from podonos.testing import FakeBackend, FakeBackendProfile
+
+
+class TestInitCache(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.cache_dir = os.path.join(self.temp_dir.name, "cache")
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_entries(self):
+        cache = InitCache(60, self.cache_dir)
+        self.assertFalse(cache.get("key1", "http://api", "1.0.0"))
+        cache.put("key1", "http://api", "1.0.0")
+        self.assertTrue(cache.get("key1", "http://api", "1.0.0"))
+        self.assertFalse(cache.get("key2", "http://api", "1.0.0"))
+        self.assertFalse(cache.get("key1", "http://other", "1.0.0"))
+        self.assertFalse(cache.get("key1", "http://api", "1.0.1"))
+        # The API key is never written.
+        for name in os.listdir(self.cache_dir):
+            with open(os.path.join(self.cache_dir, name)) as f:
+                self.assertNotIn("key1", name + f.read())
+
+    def test_expiry_and_corrupt_entries(self):
+        cache = InitCache(0.05, self.cache_dir)
+        cache.put("key1", "http://api", "1.0.0")
+        time.sleep(0.1)
+        self.assertFalse(cache.get("key1", "http://api", "1.0.0"))
+
+        cache = InitCache(60, self.cache_dir)
+        (name,) = os.listdir(self.cache_dir)
+        with open(os.path.join(self.cache_dir, name), "w") as f:
+            f.write("{")
+        self.assertFalse(cache.get("key1", "http://api", "1.0.0"))
+
+    def _init(self, backend, **kwargs):
+        return podonos.init(api_key="fake-key", api_url="http://fake", transport=LoopbackTransport(backend.handle), **kwargs)
+
+    def test_init_skips_cached_checks(self):
+        backend = FakeBackend()
+        with mock.patch.dict(os.environ, {PODONOS_CACHE_DIR: self.cache_dir}):
+            self._init(backend, init_cache_ttl_sec=60)
+            self.assertEqual(2, backend.requests["api"])
+            self._init(backend, init_cache_ttl_sec=60)
+        self.assertEqual(2, backend.requests["api"])
+        self.assertEqual(1, len(os.listdir(self.cache_dir)))
+
+    def test_checks_run_concurrently(self):
+        backend = FakeBackend(FakeBackendProfile(latency_sec=0.3))
+        start = time.monotonic()
+        self._init(backend)
+        self.assertLess(time.monotonic() - start, 0.55)
+        self.assertEqual(2, backend.requests["api"])
+
+    def test_lazy_init(self):
+        backend = FakeBackend()
+        client = self._init(backend, lazy_init=True)
+        self.assertEqual(0, backend.requests["api"])
+        client.get_evaluation_list()
+        client.get_evaluation_list()
+        # The two checks once, then the two requests.
+        self.assertEqual(4, backend.requests["api"])
+
+        backend = FakeBackend(api_keys=["other-key"])
+        client = self._init(backend, lazy_init=True)
+        # The client wraps the errors of the checks. They run again on the next request.
+        for _ in range(2):
+            with self.assertRaises(HTTPError):
+                client.get_evaluation_list()
+        self.assertEqual(4, backend.requests["api"])
+
+
+if __name__ == "__main__":
+    unittest.main()
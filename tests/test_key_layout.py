@@ -0,0 +1,48 @@
+import unittest
+
+from podonos.core.key_layout import (
+    KEY_LAYOUT_FLAT,
+    KEY_LAYOUT_HASH_PREFIX,
+    HashPrefixKeyLayout,
+    get_key_layout,
+    get_key_layouts,
+    original_remote_object_name,
+)
+
+
+class TestKeyLayout(unittest.TestCase):
+    def test_flat(self):
+        self.assertEqual("20240521T061809/123-abc", get_key_layout(KEY_LAYOUT_FLAT).make("20240521T061809", "123-abc"))
+        self.assertEqual("20240521T061809/123-abc", original_remote_object_name(KEY_LAYOUT_FLAT, "20240521T061809/123-abc"))
+
+    def test_hash_prefix_is_deterministic_and_reversible(self):
+        layout = get_key_layout(KEY_LAYOUT_HASH_PREFIX)
+        name = layout.make("20240521T061809", "123-abc")
+        self.assertEqual(name, layout.make("20240521T061809", "123-abc"))
+        shard, _, flat_name = name.partition("/")
+        self.assertEqual("20240521T061809/123-abc", flat_name)
+        self.assertRegex(shard, "^[0-9a-f]{4}$")
+        self.assertEqual(flat_name, layout.original(name))
+
+    def test_hash_prefix_spreads_the_names(self):
+        layout = HashPrefixKeyLayout(shard_length=1)
+        shards = {layout.make("20240521T061809", f"{index}-abc").split("/")[0] for index in range(200)}
+        self.assertEqual(16, len(shards))
+
+    def test_original_rejects_other_names(self):
+        layout = get_key_layout(KEY_LAYOUT_HASH_PREFIX)
+        with self.assertRaises(ValueError):
+            layout.original("20240521T061809/123-abc")
+        name = layout.make("20240521T061809", "123-abc")
+        wrong_shard = "0000" if not name.startswith("0000/") else "ffff"
+        with self.assertRaises(ValueError):
+            layout.original(wrong_shard + name[4:])
+
+    def test_unknown_layout(self):
+        self.assertEqual([KEY_LAYOUT_FLAT, KEY_LAYOUT_HASH_PREFIX], get_key_layouts()[:2])
+        with self.assertRaises(ValueError):
+            get_key_layout("unknown")
+
+
+if __name__ == "__main__":
+    unittest.main()
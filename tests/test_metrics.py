@@ -0,0 +1,97 @@
+import unittest
+import urllib.request
+
+from podonos.core.metrics import LatencyHistogram, UploadMetrics
+from podonos.core.prometheus import PrometheusExporter, render_prometheus
+
+
+class TestLatencyHistogram(unittest.TestCase):
+    def test_observe_and_quantile(self):
+        histogram = LatencyHistogram(buckets=(0.1, 1.0, 10.0))
+        self.assertIsNone(histogram.quantile(0.5))
+        for seconds in [0.05, 0.05, 0.5, 5.0, 50.0]:
+            histogram.observe(seconds)
+
+        self.assertEqual(5, histogram.count)
+        self.assertAlmostEqual(55.6, histogram.sum)
+        self.assertEqual(0.1, histogram.quantile(0.4))
+        self.assertEqual(1.0, histogram.quantile(0.6))
+        self.assertEqual(float("inf"), histogram.quantile(1.0))
+        self.assertEqual({"0.1": 2, "1.0": 3, "10.0": 4, "+Inf": 5}, histogram.to_dict()["buckets"])
+
+
+class TestUploadMetrics(unittest.TestCase):
+    def test_counters_and_gauges(self):
+        metrics = UploadMetrics()
+        metrics.on_queued(100)
+        metrics.on_queued(200)
+        metrics.on_queued(300)
+        metrics.on_started()
+        metrics.on_started()
+        metrics.on_presigned(0.01)
+        metrics.on_uploaded(100, 0.2)
+        metrics.on_failed()
+
+        snapshot = metrics.snapshot()
+        self.assertEqual(3, snapshot.files_queued)
+        self.assertEqual(1, snapshot.files_uploaded)
+        self.assertEqual(1, snapshot.files_failed)
+        self.assertEqual(600, snapshot.bytes_queued)
+        self.assertEqual(100, snapshot.bytes_uploaded)
+        self.assertEqual(1, snapshot.queue_depth)
+        self.assertEqual(0, snapshot.in_flight)
+        self.assertEqual(1, snapshot.presign_latency["count"])
+        self.assertEqual(1, snapshot.upload_latency["count"])
+
+    def test_callback(self):
+        metrics = UploadMetrics()
+        received = []
+        metrics.add_callback(received.append)
+        metrics.on_queued(10)
+        metrics.on_started()
+        metrics.on_uploaded(10, 0.1)
+        self.assertEqual(1, len(received))
+        self.assertEqual(1, received[0].files_uploaded)
+
+        metrics.remove_callback(received.append)
+        metrics.on_failed()
+        self.assertEqual(1, len(received))
+
+    def test_failing_callback_does_not_break_upload(self):
+        metrics = UploadMetrics()
+
+        def _broken(_):
+            raise RuntimeError("broken")
+
+        metrics.add_callback(_broken)
+        metrics.on_uploaded(10, 0.1)
+        self.assertEqual(1, metrics.files_uploaded)
+
+
+class TestPrometheusExporter(unittest.TestCase):
+    def test_render(self):
+        metrics = UploadMetrics()
+        metrics.on_queued(10)
+        metrics.on_started()
+        metrics.on_uploaded(10, 0.2)
+
+        text = render_prometheus([(metrics.snapshot(), {"evaluation_id": "abc"})])
+        self.assertIn('podonos_upload_files_uploaded_total{evaluation_id="abc"} 1', text)
+        self.assertIn('podonos_upload_upload_latency_seconds_bucket{evaluation_id="abc",le="0.25"} 1', text)
+        self.assertIn("# TYPE podonos_upload_queue_depth gauge", text)
+
+    def test_serve(self):
+        metrics = UploadMetrics()
+        exporter = PrometheusExporter()
+        exporter.register(metrics, labels={"evaluation_id": "abc"})
+        port = exporter.start(port=0, addr="127.0.0.1")
+        try:
+            with urllib.request.urlopen(f"http://127.0.0.1:{port}/metrics") as response:
+                body = response.read().decode("utf-8")
+            self.assertIn('podonos_upload_files_queued_total{evaluation_id="abc"} 0', body)
+        finally:
+            exporter.stop()
+
+
+if __name__ == "__main__":
+    unittest.main()
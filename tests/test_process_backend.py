@@ -0,0 +1,54 @@
+import threading
+import unittest
+
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from podonos.common.exception import HTTPError
+from podonos.core.api import APIClient
+from podonos.core.process_backend import ProcessUploadBackend
+from tests.test_audio import TESTDATA_SPEECH_CH1_MP3
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    received = {}
+
+    def do_PUT(self):
+        body = self.rfile.read(int(self.headers["Content-Length"]))
+        _Handler.received[self.path] = len(body)
+        status = 500 if self.path == "/fail" else 200
+        self.send_response(status)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def log_message(self, format, *args):
+        pass
+
+
+class TestProcessUploadBackend(unittest.TestCase):
+    def setUp(self):
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}"
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def test_put_file_in_process(self):
+        backend = ProcessUploadBackend(APIClient("test_api_key", self.url), num_processes=2, num_threads=2)
+        try:
+            futures = [backend.submit(f"{self.url}/upload/{index}", TESTDATA_SPEECH_CH1_MP3) for index in range(4)]
+            shards = {future.result(timeout=60).shard for future in futures}
+            self.assertEqual({0, 1}, shards)
+            self.assertEqual(4, len([path for path in _Handler.received if path.startswith("/upload/")]))
+
+            with self.assertRaises(HTTPError) as context:
+                backend.put_file(f"{self.url}/fail", TESTDATA_SPEECH_CH1_MP3)
+            self.assertEqual(500, context.exception.status_code)
+        finally:
+            backend.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
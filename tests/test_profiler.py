@@ -0,0 +1,53 @@
+import json
+import os
+import tempfile
+import time
+import unittest
+
+from podonos.core import profiler as profiler_module
+from podonos.core.profiler import Profiler, disable_profiling, enable_profiling, get_profiler, profile_phase, profiled
+
+
+class TestProfiler(unittest.TestCase):
+    def tearDown(self):
+        disable_profiling()
+
+    def test_disabled_by_default(self):
+        self.assertIsNone(get_profiler())
+        self.assertIs(profiler_module._NULL_PHASE, profile_phase("anything"))
+
+    def test_phase_breakdown(self):
+        with tempfile.TemporaryDirectory() as output_dir:
+            profiler = Profiler(output_dir)
+            with profiler.phase("busy"):
+                sum(range(100000))
+            with profiler.phase("busy"):
+                time.sleep(0.01)
+
+            phases = profiler.get_phases()
+            self.assertEqual(2, phases["busy"]["count"])
+            self.assertGreaterEqual(phases["busy"]["wall_sec"], 0.01)
+            self.assertGreater(phases["busy"]["cpu_sec"], 0.0)
+
+    def test_enable_and_dump(self):
+        @profiled("decorated")
+        def work():
+            time.sleep(0.05)
+
+        with tempfile.TemporaryDirectory() as output_dir:
+            profiler = enable_profiling(output_dir, sample_interval=0.001)
+            self.assertIs(profiler, get_profiler())
+            work()
+            report_path, stacks_path = profiler.dump("eval-1")
+
+            with open(report_path) as f:
+                report = json.load(f)
+            self.assertEqual(1, report["phases"]["decorated"]["count"])
+            self.assertGreater(report["sampling"]["num_samples"], 0)
+            self.assertTrue(os.path.isfile(stacks_path))
+            with open(stacks_path) as f:
+                self.assertIn("work", f.read())
+
+
+if __name__ == "__main__":
+    unittest.main()
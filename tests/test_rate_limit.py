@@ -0,0 +1,134 @@
+import os
+import tempfile
+import time
+import unittest
+
+from unittest.mock import MagicMock, patch
+
+from podonos.core.api import APIClient, retries_of
+from podonos.core.rate_limit import (
+    ENDPOINT_CLASS_PRESIGN,
+    ENDPOINT_CLASS_STORAGE,
+    RateLimiter,
+    RateLimits,
+    TokenBucket,
+    parse_retry_after,
+)
+from podonos.core.transport import LoopbackTransport
+from podonos.core.upload_manager import UploadManager
+from podonos.testing import FakeBackend
+from tests.test_audio import TESTDATA_SPEECH_TWO_CH1_WAV
+
+
+def _response(status_code, headers=None):
+    response = MagicMock()
+    response.status_code = status_code
+    response.headers = headers or {}
+    return response
+
+
+class TestTokenBucket(unittest.TestCase):
+    def test_unlimited_never_waits(self):
+        bucket = TokenBucket()
+        for _ in range(1000):
+            self.assertEqual(0.0, bucket.acquire())
+
+    def test_rate(self):
+        bucket = TokenBucket(rate=100.0, burst_sec=0.1)
+        start = time.monotonic()
+        for _ in range(30):
+            bucket.acquire()
+        # 10 tokens of burst, then 20 tokens at 100/s.
+        self.assertGreaterEqual(time.monotonic() - start, 0.18)
+
+    def test_throttled_halves_rate_and_recovers(self):
+        bucket = TokenBucket(rate=100.0)
+        bucket.on_throttled(retry_after=0.0)
+        self.assertEqual(50.0, bucket.rate)
+        for _ in range(20):
+            bucket.on_success()
+        self.assertEqual(100.0, bucket.rate)
+
+    def test_throttled_pauses(self):
+        bucket = TokenBucket()
+        bucket.on_throttled(retry_after=0.1)
+        self.assertGreater(bucket.acquire(), 0.05)
+
+
+class TestRateLimiter(unittest.TestCase):
+    def test_limits_by_endpoint_class(self):
+        limiter = RateLimiter(RateLimits(presign_requests_per_sec=10.0))
+        self.assertIsNone(limiter.byte_bucket)
+        limiter.on_response(ENDPOINT_CLASS_PRESIGN, 429, retry_after=0.0)
+        self.assertEqual(5.0, limiter._request_buckets[ENDPOINT_CLASS_PRESIGN].rate)
+        self.assertIsNone(limiter._request_buckets[ENDPOINT_CLASS_STORAGE].rate)
+
+    def test_parse_retry_after(self):
+        self.assertEqual(3.0, parse_retry_after("3"))
+        self.assertIsNone(parse_retry_after(None))
+        self.assertIsNone(parse_retry_after("soon"))
+        self.assertEqual(0.0, parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT"))
+
+
+class TestAPIClientRateLimit(unittest.TestCase):
+    @patch("requests.put")
+    def test_retries_after_429(self, mock_put):
+        mock_put.side_effect = [_response(429, {"Retry-After": "0"}), _response(200)]
+        client = APIClient("test_api_key", "http://testapi.com", rate_limiter=RateLimiter())
+        response = client.put("evaluations/1234/uploading-presigned-url", {"key": "value"})
+        self.assertEqual(200, response.status_code)
+        self.assertEqual(2, mock_put.call_count)
+        self.assertEqual(1, retries_of(response))
+
+    @patch("requests.put")
+    def test_gives_up_after_max_retries(self, mock_put):
+        mock_put.return_value = _response(429, {"Retry-After": "0"})
+        client = APIClient("test_api_key", "http://testapi.com", rate_limiter=RateLimiter(RateLimits(max_retries_on_429=2)))
+        response = client.put("evaluations", {"key": "value"})
+        self.assertEqual(429, response.status_code)
+        self.assertEqual(3, mock_put.call_count)
+
+    @patch("requests.put")
+    def test_file_upload_is_rewound_and_throttled(self, mock_put):
+        bodies = []
+
+        def put(url, data, headers, timeout):
+            bodies.append(b"".join(bytes(chunk) for chunk in data))
+            return _response(429 if len(bodies) == 1 else 200, {"Retry-After": "0"})
+
+        mock_put.side_effect = put
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, "a.wav")
+            with open(path, "wb") as f:
+                f.write(b"x" * 5000)
+
+            client = APIClient("test_api_key", "http://testapi.com", rate_limiter=RateLimiter(RateLimits(upload_bytes_per_sec=20000.0)))
+            start = time.monotonic()
+            client.put_file_presigned_url("http://storage/a.wav", path)
+
+        self.assertEqual([b"x" * 5000, b"x" * 5000], bodies)
+        # 2000 bytes of burst, then 8000 bytes at 20 KB/s.
+        self.assertGreaterEqual(time.monotonic() - start, 0.3)
+
+    def test_upload_records_retries(self):
+        backend = FakeBackend()
+        throttled = []
+
+        def handle(method, url, headers, body):
+            # The first PUT of each file to the object store is throttled.
+            if method == "PUT" and "/upload/" in url and url not in throttled:
+                throttled.append(url)
+                return 429, {"Retry-After": "0"}, b""
+            return backend.handle(method, url, headers, body)
+
+        client = APIClient("test_api_key", "http://fake", transport=LoopbackTransport(handle), rate_limiter=RateLimiter())
+        evaluation_id = client.post("evaluations", {"title": "retries"}).json()["id"]
+        upload_manager = UploadManager(api_client=client, max_workers=1)
+        upload_manager.add_file_to_queue(evaluation_id, "AAAA1234/a.wav", TESTDATA_SPEECH_TWO_CH1_WAV)
+        self.assertTrue(upload_manager.wait_and_close())
+        self.assertEqual({}, upload_manager.get_upload_errors())
+        self.assertEqual(1, upload_manager.get_upload_records()["AAAA1234/a.wav"].retries)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,40 @@
+import unittest
+
+from podonos.core.report import UploadRecord, build_upload_report, percentile, upload_wall_time
+from tests.test_audio import TESTDATA_SPEECH_CH1_MP3, TESTDATA_SPEECH_TWO_CH1_WAV
+
+
+class TestReport(unittest.TestCase):
+    def test_percentile(self):
+        self.assertIsNone(percentile([], 0.5))
+        self.assertEqual(1.0, percentile([1.0], 0.99))
+        self.assertEqual(2.5, percentile([1.0, 2.0, 3.0, 4.0], 0.5))
+        self.assertAlmostEqual(99.01, percentile([float(i) for i in range(1, 101)], 0.99))
+
+    def test_build_upload_report(self):
+        records = {
+            "a": UploadRecord(size=100, presign_sec=0.1, upload_sec=1.0, started_at=10.0, finished_at=11.1),
+            "b": UploadRecord(size=100, presign_sec=0.1, upload_sec=3.0, started_at=10.0, finished_at=13.1, retries=2, hedges=1),
+            "c": UploadRecord(size=50, presign_sec=0.2, upload_sec=2.0, started_at=11.0, finished_at=14.0),
+        }
+        files = [
+            ("a.mp3", "a", TESTDATA_SPEECH_CH1_MP3),
+            ("b.mp3", "b", TESTDATA_SPEECH_CH1_MP3),
+            ("c.wav", "c", TESTDATA_SPEECH_TWO_CH1_WAV),
+        ]
+        self.assertAlmostEqual(4.0, upload_wall_time(records))
+        report = build_upload_report("eval", files, records, upload_wall_sec=4.0, close_phases_sec={"total": 5.0}, slowest_n=2)
+
+        self.assertEqual(3, report.num_files)
+        self.assertEqual(250, report.total_bytes)
+        self.assertEqual(150, report.unique_bytes)
+        self.assertEqual(1, report.duplicate_files)
+        self.assertEqual((2, 1), (report.retries, report.hedges))
+        self.assertAlmostEqual(0.75, report.files_per_sec)
+        self.assertEqual(2.0, report.latency_p50_sec)
+        self.assertEqual(["b", "c"], [timing.remote_name for timing in report.slowest_files])
+        self.assertEqual({"total": 5.0}, report.to_dict()["close_phases_sec"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,67 @@
+import unittest
+
+from podonos.core.scheduling import (
+    SCHEDULING_FIFO,
+    SCHEDULING_GROUP_ATOMIC,
+    SCHEDULING_LARGEST_FIRST,
+    UploadQueue,
+    create_upload_queue,
+    get_scheduling_policies,
+    register_scheduling_policy,
+)
+from podonos.core.upload_manager import UploadItem
+
+
+def _item(name, size, group=None, group_size=1):
+    return UploadItem("AAAA1234", name, f"/tmp/{name}.wav", size, group=group, group_size=group_size)
+
+
+def _drain(upload_queue):
+    names = []
+    while not upload_queue.empty():
+        names.append(upload_queue.get_nowait().remote_object_name)
+        upload_queue.task_done()
+    return names
+
+
+class TestScheduling(unittest.TestCase):
+    def test_fifo(self):
+        upload_queue = create_upload_queue(SCHEDULING_FIFO)
+        for name, size in [("a", 1), ("b", 3), ("c", 2)]:
+            upload_queue.put(_item(name, size))
+        self.assertEqual(["a", "b", "c"], _drain(upload_queue))
+
+    def test_largest_first(self):
+        upload_queue = create_upload_queue(SCHEDULING_LARGEST_FIRST)
+        for name, size in [("a", 1), ("b", 3), ("c", 2), ("d", 3)]:
+            upload_queue.put(_item(name, size))
+        self.assertEqual(["b", "d", "c", "a"], _drain(upload_queue))
+
+    def test_group_atomic(self):
+        upload_queue = create_upload_queue(SCHEDULING_GROUP_ATOMIC)
+        upload_queue.put(_item("g1-0", 1, "g1", 2))
+        upload_queue.put(_item("single", 1))
+        upload_queue.put(_item("g2-0", 5, "g2", 2))
+        # Incomplete groups are held back.
+        self.assertEqual(1, upload_queue.qsize())
+        upload_queue.put(_item("g1-1", 2, "g1", 2))
+        upload_queue.put(_item("g2-1", 5, "g2", 2))
+        self.assertEqual(["g2-0", "g2-1", "g1-1", "g1-0", "single"], _drain(upload_queue))
+
+    def test_group_atomic_flush(self):
+        upload_queue = create_upload_queue(SCHEDULING_GROUP_ATOMIC)
+        upload_queue.put(_item("g1-0", 1, "g1", 2))
+        self.assertTrue(upload_queue.empty())
+        upload_queue.flush()
+        self.assertEqual(["g1-0"], _drain(upload_queue))
+        upload_queue.join()
+
+    def test_register(self):
+        register_scheduling_policy("test_fifo", UploadQueue)
+        self.assertIn("test_fifo", get_scheduling_policies())
+        with self.assertRaises(ValueError):
+            create_upload_queue("unknown")
+
+
+if __name__ == "__main__":
+    unittest.main()
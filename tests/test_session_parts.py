@@ -0,0 +1,69 @@
+import json
+import os
+import unittest
+
+import podonos
+
+from podonos import File
+from podonos.core.session_parts import assemble_session_json, split_session_json
+from podonos.core.transport import LoopbackTransport
+from podonos.testing import FakeBackend
+from tests.test_audio import TESTDATA_SPEECH_TWO_CH1_WAV
+
+
+class TestSessionParts(unittest.TestCase):
+    def test_split_and_assemble(self):
+        session_json = {"eval_id": "e1", "query": None, "files": [[{"remote_name": f"a/{i}.wav"}] for i in range(10)]}
+        index, parts = split_session_json(session_json, 3)
+        self.assertNotIn("files", index)
+        self.assertEqual(["session.part-00000.json", "session.part-00001.json", "session.part-00002.json"], [name for name, _ in parts])
+        self.assertEqual([3, 3, 4], [part["num_files"] for part in index["parts"]])
+        bodies = dict(parts)
+        self.assertEqual(session_json, assemble_session_json(index, bodies.__getitem__))
+
+        # Never more parts than file groups, and one even without files.
+        self.assertEqual(2, len(split_session_json({"files": [[], []]}, 8)[1]))
+        index, parts = split_session_json({"files": []}, 8)
+        self.assertEqual({"files": []}, assemble_session_json(index, dict(parts).__getitem__))
+
+    def test_assemble_rejects_bad_parts(self):
+        session_json = {"files": [[{"remote_name": f"a/{i}.wav"}] for i in range(4)]}
+        index, parts = split_session_json(session_json, 2)
+        with self.assertRaises(ValueError):
+            assemble_session_json(index, dict(parts[:1]).__getitem__)
+        corrupt = dict(parts)
+        corrupt["session.part-00001.json"] = json.dumps({"part": 1, "files": []}).encode("utf-8")
+        with self.assertRaises(ValueError):
+            assemble_session_json(index, corrupt.__getitem__)
+
+    def test_upload_in_parts(self):
+        backend = FakeBackend()
+        client = podonos.init(api_key="fake-key", api_url="http://fake", transport=LoopbackTransport(backend.handle))
+        evaluator = client.create_evaluator(session_json_parts=3, upload_bundle_bytes=1024 * 1024)
+        evaluation_id = evaluator.get_evaluation_id()
+        for _ in range(5):
+            evaluator.add_file(File(path=TESTDATA_SPEECH_TWO_CH1_WAV, model_tag="model1"))
+        report = evaluator.close()
+        self.assertIn("upload_session_parts", report["close_phases_sec"])
+        self.assertEqual(3, report["session_json_parts"]["num_parts"])
+        # Uploaded on the upload workers, but not counted as files.
+        self.assertEqual(5, evaluator.get_upload_metrics()["files_uploaded"])
+        self.assertEqual(5 * os.path.getsize(TESTDATA_SPEECH_TWO_CH1_WAV), evaluator.get_upload_metrics()["bytes_uploaded"])
+        self.assertEqual(5, report["num_files"])
+
+        # The backend reassembled the usual session.json.
+        session_json = backend.session_jsons[evaluation_id]
+        self.assertNotIn("parts", session_json)
+        self.assertEqual(5, len(session_json["files"]))
+        self.assertEqual(1, len(session_json["bundles"]))
+        files = backend.evaluations[evaluation_id]["files"]
+        self.assertEqual(sorted(file["processed_uri"] for file in files), sorted(audio["remote_name"] for (audio,) in session_json["files"]))
+        self.assertEqual(3, len(backend.session_parts[evaluation_id]))
+        self.assertEqual(3, len(json.loads(backend.objects["session.json"])["parts"]))
+
+        with self.assertRaises(ValueError):
+            client.create_evaluator(session_json_parts=0)
+
+
+if __name__ == "__main__":
+    unittest.main()
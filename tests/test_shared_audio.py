@@ -0,0 +1,127 @@
+import io
+import multiprocessing
+import os
+import subprocess
+import sys
+import unittest
+
+from multiprocessing import shared_memory
+from unittest.mock import MagicMock
+
+import soundfile as sf
+
+from podonos.core.file import File
+from podonos.core.shared_audio import SharedAudio, share_audio
+from podonos.core.upload_manager import UploadManager
+from tests.test_audio import TESTDATA_SPEECH_TWO_CH1_WAV
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+def _share_file(path):
+    with open(path, "rb") as f:
+        return share_audio(f.read())
+
+
+def _share_tone(samplerate):
+    t = np.arange(samplerate) / samplerate
+    return share_audio(((0.5 * np.sin(2 * np.pi * 440 * t)).astype(np.float32), samplerate))
+
+
+# Shares from a fork pool in a fresh interpreter, where the parent has no resource tracker yet when the pool forks.
+_FORK_POOL_SCRIPT = """
+import multiprocessing
+from podonos.core.shared_audio import share_audio
+
+def share(path):
+    with open(path, "rb") as f:
+        return share_audio(f.read())
+
+if __name__ == "__main__":
+    with multiprocessing.get_context("fork").Pool(2) as pool:
+        shared = pool.apply(share, (%r,))
+    pool.join()
+    buffer = shared.attach()
+    print(buffer.size == shared.size)
+    buffer.release()
+"""
+
+
+def _segment_exists(name):
+    try:
+        shm = shared_memory.SharedMemory(name=name)
+    except FileNotFoundError:
+        return False
+    shm.close()
+    return True
+
+
+@unittest.skipIf(os.name == "nt", "Shared audio is POSIX only")
+class TestSharedAudio(unittest.TestCase):
+    def setUp(self):
+        self.pool = multiprocessing.get_context("spawn").Pool(2)
+        self.addCleanup(self.pool.terminate)
+
+    def _upload(self, file):
+        api_client = MagicMock()
+        api_client.put.return_value.text = '"http://storage/a"'
+        uploaded = []
+
+        def put_data(url, data, content_type):
+            uploaded.append((bytes(data), content_type))
+            return MagicMock()
+
+        api_client.put_data_presigned_url.side_effect = put_data
+        upload_manager = UploadManager(api_client=api_client, max_workers=1)
+        upload_manager.add_file_to_queue("AAAA1234", "ABCD1234", file.path, buffer=file.buffer)
+        self.assertTrue(upload_manager.wait_and_close())
+        self.assertEqual({}, upload_manager.get_upload_errors())
+        return uploaded
+
+    def test_upload_from_a_worker(self):
+        shared = self.pool.apply(_share_file, (TESTDATA_SPEECH_TWO_CH1_WAV,))
+        self.assertIsInstance(shared, SharedAudio)
+        self.assertEqual("audio/wav", shared.content_type)
+        self.assertTrue(_segment_exists(shared.segment))
+
+        file = File(path=shared, model_tag="model1", name="utt001")
+        self.assertEqual("utt001", file.path)
+        self.assertEqual(shared.size, file.buffer.size)
+
+        uploaded = self._upload(file)
+        with open(TESTDATA_SPEECH_TWO_CH1_WAV, "rb") as f:
+            self.assertEqual([(f.read(), "audio/wav")], uploaded)
+        # Freed once uploaded.
+        self.assertFalse(_segment_exists(shared.segment))
+
+    @unittest.skipIf(np is None, "numpy is not installed")
+    def test_array_from_a_worker(self):
+        shared = self.pool.apply(_share_tone, (16000,))
+        self.assertEqual((1, 16000, 1000), (shared.nchannels, shared.framerate, shared.duration_in_ms))
+
+        (data, _), = self._upload(File(path=shared, model_tag="model1"))
+        samples, samplerate = sf.read(io.BytesIO(data), dtype="float32")
+        self.assertEqual((16000, 16000), (samplerate, len(samples)))
+        self.assertFalse(_segment_exists(shared.segment))
+
+    @unittest.skipUnless("fork" in multiprocessing.get_all_start_methods(), "No fork start method")
+    def test_segment_outlives_a_fork_pool(self):
+        completed = subprocess.run(
+            [sys.executable, "-c", _FORK_POOL_SCRIPT % TESTDATA_SPEECH_TWO_CH1_WAV],
+            cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=True,
+            timeout=60,
+        )
+        self.assertEqual(0, completed.returncode, completed.stderr)
+        self.assertEqual("True", completed.stdout.strip())
+        # Neither tracker of the workers freed it, nor the tracker of the parent found it leaked.
+        self.assertNotIn("leaked", completed.stderr)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,124 @@
+import unittest
+from unittest.mock import MagicMock, patch
+
+from podonos.core.api import APIClient
+from podonos.core.tracing import TraceHook, Tracer, trace_context
+from podonos.core.upload_manager import UploadManager
+from tests.test_audio import TESTDATA_SPEECH_CH1_MP3
+
+
+class RecordingTraceHook(TraceHook):
+    def __init__(self):
+        self.started = []
+        self.ended = []
+
+    def on_span_start(self, span):
+        self.started.append(span)
+
+    def on_span_end(self, span):
+        self.ended.append(span)
+
+
+class TestTracer(unittest.TestCase):
+    def test_noop_tracer(self):
+        tracer = Tracer()
+        self.assertFalse(tracer.enabled)
+        with tracer.span("noop") as span:
+            span.set_attribute("key", "value")
+            span.add_phase("phase", 1.0)
+
+    def test_nested_spans_share_trace_id(self):
+        hook = RecordingTraceHook()
+        tracer = Tracer(hook)
+        with trace_context("0" * 31 + "1"):
+            with tracer.span("parent") as parent:
+                with tracer.span("child", key="value") as child:
+                    child.add_phase("phase", 0.5)
+                    child.add_phase("phase", 0.25)
+
+        self.assertEqual(["parent", "child"], [span.name for span in hook.started])
+        self.assertEqual(["child", "parent"], [span.name for span in hook.ended])
+        self.assertEqual("0" * 31 + "1", parent.trace_id)
+        self.assertEqual(parent.trace_id, child.trace_id)
+        self.assertEqual(parent.span_id, child.parent_id)
+        self.assertEqual({"phase": 0.75}, child.phases)
+        self.assertEqual("value", child.attributes["key"])
+        self.assertIsNotNone(child.duration)
+
+    def test_span_records_error(self):
+        hook = RecordingTraceHook()
+        tracer = Tracer(hook)
+        with self.assertRaises(ValueError):
+            with tracer.span("failing"):
+                raise ValueError("boom")
+        self.assertIn("boom", hook.ended[0].error)
+
+
+class TestAPIClientTracing(unittest.TestCase):
+    @patch("requests.put")
+    def test_put_emits_span(self, mock_put):
+        mock_response = MagicMock()
+        mock_response.status_code = 200
+        mock_response.content = b"presigned"
+        mock_response.request.body = b'{"key": "value"}'
+        mock_response.elapsed.total_seconds.return_value = 0.0
+        mock_put.return_value = mock_response
+
+        hook = RecordingTraceHook()
+        client = APIClient("test_api_key", "http://testapi.com", trace_hook=hook)
+        client.put("evaluations/1234/uploading-presigned-url", {"key": "value"})
+
+        span = hook.ended[0]
+        self.assertEqual("evaluations/{id}/uploading-presigned-url", span.attributes["http.route"])
+        self.assertEqual(200, span.attributes["http.status_code"])
+        self.assertEqual(16, span.attributes["http.request_bytes"])
+        self.assertEqual(9, span.attributes["http.response_bytes"])
+        self.assertEqual(0, span.attributes["retry_count"])
+        self.assertEqual({"send_and_wait", "read_response", "total"}, set(span.phases))
+
+    def test_upload_spans_share_session_trace_id(self):
+        hook = RecordingTraceHook()
+        api_client = MagicMock()
+        api_client.tracer = Tracer(hook)
+        upload_manager = UploadManager(api_client=api_client, max_workers=1)
+        upload_manager.add_file_to_queue("AAAA1234", "ABCD1234", TESTDATA_SPEECH_CH1_MP3, trace_id="f" * 32)
+        self.assertTrue(upload_manager.wait_and_close())
+
+        self.assertEqual(1, len(hook.ended))
+        self.assertEqual("upload.file", hook.ended[0].name)
+        self.assertEqual("f" * 32, hook.ended[0].trace_id)
+
+
+class TestOpenTelemetryTraceHook(unittest.TestCase):
+    def test_forward_spans(self):
+        try:
+            from opentelemetry.sdk.trace import TracerProvider
+            from opentelemetry.sdk.trace.export import SimpleSpanProcessor
+            from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
+            from podonos.core.otel import OpenTelemetryTraceHook
+        except ImportError:
+            self.skipTest("opentelemetry-sdk is not installed")
+
+        exporter = InMemorySpanExporter()
+        provider = TracerProvider()
+        provider.add_span_processor(SimpleSpanProcessor(exporter))
+        tracer = Tracer(OpenTelemetryTraceHook(tracer_provider=provider))
+        with trace_context("a" * 32):
+            with tracer.span("parent"):
+                with tracer.span("child", route="evaluations") as child:
+                    child.add_phase("total", 0.5)
+            with tracer.span("other_root"):
+                pass
+
+        spans = {span.name: span for span in exporter.get_finished_spans()}
+        self.assertEqual(int("a" * 32, 16), spans["parent"].context.trace_id)
+        self.assertEqual(spans["parent"].context.span_id, spans["child"].parent.span_id)
+        # The root spans share the remote parent of the session, which is none of the exported spans.
+        self.assertTrue(spans["parent"].parent.is_remote)
+        self.assertEqual(spans["parent"].parent.span_id, spans["other_root"].parent.span_id)
+        self.assertNotIn(spans["parent"].parent.span_id, [span.context.span_id for span in spans.values()])
+        self.assertEqual(500.0, spans["child"].attributes["podonos.phase.total_ms"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,101 @@
+import io
+import os
+import tempfile
+import unittest
+
+from unittest.mock import MagicMock
+
+import soundfile as sf
+
+from podonos.core.transform import FLAC_CONTENT_TYPE, UploadTransform, resample, transform_audio
+from podonos.core.upload_manager import UploadManager
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+@unittest.skipIf(np is None, "numpy is not installed")
+class TestTransform(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def _write(self, name, samples, rate, subtype):
+        path = os.path.join(self.temp_dir.name, name)
+        sf.write(path, samples, rate, subtype=subtype)
+        return path
+
+    def _tone(self, rate, seconds=1.0, frequency=440.0):
+        t = np.arange(int(rate * seconds)) / rate
+        tone = 0.5 * np.sin(2 * np.pi * frequency * t)
+        return np.stack([tone, 0.8 * tone], axis=1)
+
+    def test_flac_is_lossless_for_pcm(self):
+        samples = np.random.default_rng(0).integers(-(2**15), 2**15, size=(48000, 2), dtype=np.int16)
+        path = self._write("pcm16.wav", samples, 48000, "PCM_16")
+
+        transformed = transform_audio(path, UploadTransform())
+        decoded, rate = sf.read(io.BytesIO(transformed.data), dtype="int16", always_2d=True)
+        self.assertEqual(48000, rate)
+        np.testing.assert_array_equal(samples, decoded)
+        self.assertEqual("PCM_16", transformed.subtype)
+        self.assertEqual(os.path.getsize(path), transformed.original_size)
+
+    def test_transform_of_encoded_bytes(self):
+        with open(self._write("stereo.wav", self._tone(16000), 16000, "PCM_16"), "rb") as f:
+            data = f.read()
+        transformed = transform_audio(data, UploadTransform(mono=True))
+        self.assertEqual((1, 16000), (transformed.nchannels, transformed.framerate))
+        self.assertEqual(len(data), transformed.original_size)
+
+    def test_downmix_and_resample(self):
+        path = self._write("float.wav", self._tone(48000).astype(np.float32), 48000, "FLOAT")
+
+        transformed = transform_audio(path, UploadTransform(mono=True, sample_rate=16000))
+        self.assertEqual(1, transformed.nchannels)
+        self.assertEqual(16000, transformed.framerate)
+        self.assertEqual(1000, transformed.duration_in_ms)
+        self.assertEqual("PCM_24", transformed.subtype)
+        self.assertLess(transformed.size, transformed.original_size / 10)
+
+        decoded, _ = sf.read(io.BytesIO(transformed.data), always_2d=True)
+        expected = self._tone(16000).mean(axis=1, keepdims=True)
+        np.testing.assert_allclose(expected, decoded, atol=1e-4)
+        self.assertEqual(
+            {"format": "FLAC", "subtype": "PCM_24", "nchannels": 1, "framerate": 16000, "duration_in_ms": 1000, "bytes": transformed.size},
+            transformed.to_dict(),
+        )
+
+    def test_resample_keeps_the_band(self):
+        upsampled = resample(self._tone(8000), 8000, 24000)
+        self.assertEqual((24000, 2), upsampled.shape)
+        np.testing.assert_allclose(self._tone(24000), upsampled, atol=1e-9)
+
+    def test_upload_manager_uploads_the_transformed_audio(self):
+        path = self._write("stereo.wav", self._tone(48000), 48000, "PCM_16")
+        api_client = MagicMock()
+        api_client.put.return_value.text = '"http://storage/a"'
+        upload_manager = UploadManager(api_client=api_client, max_workers=1)
+        upload_manager.add_file_to_queue("AAAA1234", "ABCD1234", path, transform=UploadTransform(mono=True))
+        self.assertTrue(upload_manager.wait_and_close())
+
+        self.assertEqual({}, upload_manager.get_upload_errors())
+        api_client.put_file_presigned_url.assert_not_called()
+        url, data, content_type = api_client.put_data_presigned_url.call_args[0]
+        self.assertEqual(("http://storage/a", FLAC_CONTENT_TYPE), (url, content_type))
+        self.assertEqual((48000, 1), sf.read(io.BytesIO(data), always_2d=True)[0].shape)
+
+        transmitted = upload_manager.get_transmitted()["ABCD1234"]
+        self.assertEqual(1, transmitted["nchannels"])
+        self.assertEqual(len(data), transmitted["bytes"])
+        self.assertEqual(len(data), upload_manager.get_upload_records()["ABCD1234"].size)
+        # The metrics count the bytes sent, not those of the file.
+        self.assertEqual(len(data), upload_manager.metrics.snapshot().bytes_uploaded)
+
+
+if __name__ == "__main__":
+    unittest.main()
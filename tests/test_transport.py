@@ -0,0 +1,131 @@
+import json
+import os
+import pickle
+import tempfile
+import threading
+import unittest
+
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+
+from podonos.common.exception import HTTPError
+from podonos.core.api import APIClient
+from podonos.core.transport import LoopbackTransport, PooledTransport, RequestsTransport
+from podonos.core.upload_manager import UploadManager
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # (method, path, headers, body) of every request, and the client ports of the connections.
+    received = []
+    ports = set()
+
+    def _handle(self):
+        length = int(self.headers.get("Content-Length", 0))
+        body = self.rfile.read(length)
+        _Handler.received.append((self.command, self.path, dict(self.headers), body))
+        _Handler.ports.add(self.client_address[1])
+        reply = json.dumps({"method": self.command, "path": self.path}).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(reply)))
+        self.end_headers()
+        self.wfile.write(reply)
+
+    do_GET = do_POST = do_PUT = _handle
+
+    def log_message(self, format, *args):
+        pass
+
+
+def _reply_with_size(method, url, headers, body):
+    return 200, {}, str(len(body or b"")).encode("utf-8")
+
+
+class TestPooledTransport(unittest.TestCase):
+    def setUp(self):
+        _Handler.received = []
+        _Handler.ports = set()
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}"
+        self.client = APIClient("test_api_key", self.url, transport=PooledTransport(pool_size=2))
+
+    def tearDown(self):
+        self.client.transport.close()
+        self.server.shutdown()
+        self.server.server_close()
+
+    def test_requests(self):
+        response = self.client.get("evaluations", params={"a": "1"})
+        self.assertEqual({"method": "GET", "path": "/evaluations?a=1"}, response.json())
+        self.client.post("evaluations", {"key": "value"})
+        self.client.put("evaluations/1234", {"key": "value"})
+
+        (_, _, get_headers, _), (_, _, post_headers, post_body), _ = _Handler.received
+        self.assertEqual("test_api_key", get_headers["X-API-KEY"])
+        self.assertEqual("application/json", post_headers["Content-Type"])
+        self.assertEqual({"key": "value"}, json.loads(post_body))
+        # Kept alive.
+        self.assertEqual(1, len(_Handler.ports))
+
+    def test_file_upload(self):
+        self.client._use_sendfile = False
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, "a.wav")
+            data = os.urandom(3 * 1024 * 1024 + 123)
+            with open(path, "wb") as f:
+                f.write(data)
+            response = self.client.put_file_presigned_url(f"{self.url}/a.wav?X-Signature=abc", path)
+        self.assertEqual(200, response.status_code)
+        _, request_path, headers, body = _Handler.received[0]
+        self.assertEqual(("/a.wav?X-Signature=abc", "audio/wav", str(len(data))), (request_path, headers["Content-Type"], headers["Content-Length"]))
+        self.assertEqual(data, body)
+
+    def test_failures_are_requests_exceptions(self):
+        self.server.shutdown()
+        self.server.server_close()
+        with self.assertRaises(requests.exceptions.ConnectionError):
+            self.client.get("evaluations")
+        with self.assertRaises(HTTPError):
+            self.client.put_data_presigned_url(f"{self.url}/a.wav", b"data", "audio/wav")
+
+    def test_pooled_grows_the_pool(self):
+        transport = self.client.transport
+        self.client.enable_connection_pool(8)
+        self.assertIs(transport, self.client.transport)
+        self.assertEqual(8, transport.pool_size)
+
+
+class TestLoopbackTransport(unittest.TestCase):
+    def test_upload_pipeline(self):
+        transport = LoopbackTransport()
+        api_client = APIClient("test_api_key", "http://loopback", transport=transport)
+        with tempfile.TemporaryDirectory() as temp_dir:
+            upload_manager = UploadManager(api_client=api_client, max_workers=4)
+            for index in range(10):
+                path = os.path.join(temp_dir, f"{index}.wav")
+                with open(path, "wb") as f:
+                    f.write(b"x" * 1000)
+                upload_manager.add_file_to_queue("AAAA1234", f"AAAA1234/{index}.wav", path)
+            self.assertTrue(upload_manager.wait_and_close())
+        self.assertEqual({}, upload_manager.get_upload_errors())
+        # A presign and a PUT per file.
+        self.assertEqual(20, transport.requests_received)
+        self.assertEqual(10, upload_manager.metrics.snapshot().files_uploaded)
+
+    def test_handler_gets_the_bodies(self):
+        api_client = APIClient("test_api_key", "http://loopback", transport=LoopbackTransport(_reply_with_size))
+        self.assertEqual(b"4", api_client.put_data_presigned_url("http://loopback/upload/a", b"data", "audio/wav").content)
+        self.assertEqual(b"16", api_client.put("evaluations", {"key": "value"}).content)
+
+    def test_pickled_by_configuration(self):
+        self.assertIsInstance(pickle.loads(pickle.dumps(RequestsTransport().pooled(4))), RequestsTransport)
+        self.assertEqual(4, pickle.loads(pickle.dumps(PooledTransport(4))).pool_size)
+        transport = pickle.loads(pickle.dumps(LoopbackTransport(_reply_with_size)))
+        self.assertEqual(b"0", transport.get("http://loopback/").content)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,64 @@
+import threading
+import time
+import unittest
+
+from unittest.mock import MagicMock
+
+from podonos.core.upload_engine import UploadEngine
+from podonos.core.upload_manager import UploadManager
+from tests.test_audio import TESTDATA_SPEECH_CH1_MP3
+
+
+class TestUploadEngine(unittest.TestCase):
+    def setUp(self):
+        self.order = []
+        self.lock = threading.Lock()
+
+        def put_file_presigned_url(url, path):
+            time.sleep(0.01)
+            return MagicMock()
+
+        def put(endpoint, data):
+            with self.lock:
+                self.order.append(data["processed_uri"])
+            response = MagicMock()
+            response.text = "https://storage/upload"
+            return response
+
+        self.api_client = MagicMock()
+        self.api_client.put.side_effect = put
+        self.api_client.put_file_presigned_url.side_effect = put_file_presigned_url
+
+    def test_sessions_share_workers_fairly(self):
+        engine = UploadEngine(self.api_client, max_workers=1)
+        large = UploadManager(api_client=self.api_client, max_workers=1, engine=engine)
+        small = UploadManager(api_client=self.api_client, max_workers=1, engine=engine)
+        for index in range(10):
+            large.add_file_to_queue("AAAA1234", f"large-{index}", TESTDATA_SPEECH_CH1_MP3)
+        for index in range(2):
+            small.add_file_to_queue("BBBB1234", f"small-{index}", TESTDATA_SPEECH_CH1_MP3)
+
+        # The small session completes without waiting for the large one.
+        self.assertTrue(small.wait_and_close())
+        self.assertEqual(2, small.metrics.files_uploaded)
+        self.assertLess(large.metrics.files_done, 10)
+        self.assertEqual(1, engine.num_sessions)
+
+        self.assertTrue(large.wait_and_close())
+        self.assertEqual(10, large.metrics.files_uploaded)
+        self.assertLess(self.order.index("small-1"), self.order.index("large-5"))
+
+        engine.close()
+        self.api_client.enable_connection_pool.assert_called_once_with(2)
+
+    def test_private_engine(self):
+        upload_manager = UploadManager(api_client=self.api_client, max_workers=2)
+        upload_manager.add_file_to_queue("AAAA1234", "ABCD1234", TESTDATA_SPEECH_CH1_MP3)
+        self.assertTrue(upload_manager.wait_and_close())
+        self.assertEqual(1, upload_manager.metrics.files_uploaded)
+        with self.assertRaises(ValueError):
+            UploadManager(api_client=self.api_client, max_workers=1, engine=upload_manager._engine)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,3 +1,4 @@
+import os
 import unittest
 
 from datetime import datetime
@@ -32,6 +33,22 @@ class TestUploadManager(unittest.TestCase):
 
         self.assertTrue(upload_manager.wait_and_close())
 
+        snapshot = upload_manager.metrics.snapshot()
+        self.assertEqual(1, snapshot.files_uploaded)
+        self.assertEqual(0, snapshot.queue_depth)
+        self.assertEqual(0, snapshot.in_flight)
+        self.assertEqual(os.path.getsize(path), snapshot.bytes_uploaded)
+
+    def test_upload_failure_does_not_block_close(self):
+        api_client = MagicMock()
+        api_client.put_file_presigned_url.side_effect = RuntimeError("connection reset")
+        upload_manager = UploadManager(api_client=api_client, max_workers=2)
+        upload_manager.add_file_to_queue("AAAA1234", "ABCD1234", TESTDATA_SPEECH_CH1_MP3)
+
+        self.assertTrue(upload_manager.wait_and_close())
+        self.assertIn("ABCD1234", upload_manager.get_upload_errors())
+        self.assertEqual(1, upload_manager.metrics.files_failed)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -2,9 +2,11 @@
 Runs an upload test with multiple file uploads between the SDK and the backend APIs.
 
 Keep in mind that depending on the configuration, you may produce a direct impact on the dev or prod servers.
+Without an API key, it runs against a local fake backend with the given profile instead. See podonos.testing.
 
 Example:
     python upload_manager_load_test.py --api_key=<MY_API_KEY>
+    python -m tests.upload_manager_load_test --profile=broadband
 
 """
 
@@ -12,6 +14,7 @@ import argparse
 import podonos
 from podonos import *
 from podonos.core.base import *
+from podonos.testing import PROFILES, FakeBackend
 import sys
 import time
 
@@ -20,11 +23,20 @@ _PODONOS_API_BASE_URL = "https://dev.podonosapi.com"
 
 def main():
     parser = argparse.ArgumentParser(description="Run an integration test for SDK and backend APIs.")
-    parser.add_argument("--api_key", required=True, help="API key string.")
+    parser.add_argument("--api_key", required=False, help="API key string. If not set, runs against a fake backend.")
     parser.add_argument("--base_url", required=False, default=_PODONOS_API_BASE_URL,
                         help="Base URL for the backend APIs.")
+    parser.add_argument("--profile", required=False, default="local", choices=list(PROFILES),
+                        help="Latency, bandwidth and errors of the fake backend.")
     args = parser.parse_args()
 
+    backend = None
+    if not args.api_key:
+        backend = FakeBackend(PROFILES[args.profile])
+        args.api_key = "fake-api-key"
+        args.base_url = backend.start()
+        log.info(f"Fake backend with the {args.profile} profile: {args.base_url}")
+
     log.info(f"Python version: {sys.version}")
     log.info(f"Podonos package version: {podonos.__version__}")
     log.debug(f"API Key: {args.api_key}")
@@ -43,6 +55,9 @@ def main():
     etor.close()
     end_upload = time.time()
     log.info(f"Time elapsed with {max_upload_workers} workers: {end_upload - start_upload:.2f} seconds")
+    if backend is not None:
+        log.info(f"Requests: {backend.requests}, injected errors: {backend.errors_injected}")
+        backend.stop()
 
 
 if __name__ == "__main__":